@@ -1,88 +1,81 @@
+import base64
+import csv
+import functools
+import hashlib
+import hmac
+import io
 import json
 import os
 import re
+import signal
+import sys
+import threading
+import time
 from collections import OrderedDict
+from datetime import datetime
 from pathlib import Path
 from statistics import mean
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
+import numpy as np
 import pymysql
-import requests
 from dotenv import load_dotenv
-from flask import Flask, jsonify, send_from_directory
+from flask import (
+    Flask,
+    Response,
+    g,
+    has_request_context,
+    jsonify,
+    request,
+    send_from_directory,
+    stream_with_context,
+)
 from flask_cors import CORS
 
+import student_records
+from change_feed import ChangeFeed
+from cohort_stats import CohortStatsCache, compute_semester_stats
+from compression import ResponseCompressor
+from db_pool import ConnectionPool, PooledConnection
+from gemini_client import CircuitBreaker, GeminiClient
+from json_provider import FastJSONProvider
+from metrics import QUERY_COUNT_BUCKETS, MetricsRegistry, server_timing_header
+from plan_jobs import PlanJobQueue, QueueFullError
+from plan_store import PlanStore
+from prn_index import PrnIndex
+from rank_index import RankIndex
+from schema_catalog import SchemaCatalog
+from snapshot import SnapshotStore, StudentSnapshot
+from student_records import (
+    FLOOR_GRADE,
+    GRADE_BANDS,
+    SEMESTER_SUBJECTS,
+    SKILL_SEPARATOR,
+    TWELFTH_COLUMNS,
+    build_semester_entry,
+    db_name,
+    format_subject_name,
+    normalize_prn,
+    safe_float,
+    split_student_bundle,
+)
+from student_summary import SUMMARY_TABLE, refresh_summary, sgpa_history
+from ttl_cache import TTLCache
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ml_models.predictor import Predictor  # noqa: E402
+
 load_dotenv()
 
 app = Flask(__name__)
-CORS(app)
-FRONTEND_DIR = Path(__file__).resolve().parent.parent / "frontend"
+app.json = FastJSONProvider(app, backend=os.getenv("JSON_PROVIDER", "auto").strip().lower())
+CORS(app, expose_headers=["X-DB-Queries", "ETag", "Server-Timing", "X-Export-As-Of"])
+FRONTEND_DIR = PROJECT_ROOT / "frontend"
 STUDENT_DIR = FRONTEND_DIR / "student"
-
-SEMESTER_SUBJECTS: "OrderedDict[str, List[str]]" = OrderedDict(
-    [
-        (
-            "sem1",
-            [
-                "systems_mechanical_engineering",
-                "basic_electrical_engineering",
-                "engineering_mathematics_1",
-                "engineering_chemistry",
-                "programming_problem_solving",
-            ],
-        ),
-        (
-            "sem2",
-            [
-                "engineering_mechanics",
-                "engineering_graphics",
-                "basic_electronics_engineering",
-                "engineering_physics",
-                "engineering_mathematics_2",
-            ],
-        ),
-        (
-            "sem3",
-            [
-                "discrete_mathematics",
-                "data_structures",
-                "object_oriented_programming",
-                "computer_graphics",
-                "operating_systems",
-            ],
-        ),
-        (
-            "sem4",
-            [
-                "data_structures_algorithms",
-                "software_engineering",
-                "statistics",
-                "internet_of_things",
-                "management_information_system",
-            ],
-        ),
-        (
-            "sem5",
-            [
-                "artificial_intelligence",
-                "database_management_systems",
-                "web_technology",
-                "pattern_recognition",
-                "computer_networks",
-            ],
-        ),
-        (
-            "sem6",
-            [
-                "cyber_security",
-                "data_science",
-                "artificial_neural_networks",
-                "cloud_computing",
-            ],
-        ),
-    ]
-)
-
+CACHE_DIR = Path(__file__).resolve().parent / ".cache"
 
 class StudentNotFoundError(Exception):
     def __init__(self, prn: str, suggestions: Optional[List[Dict[str, str]]] = None):
@@ -91,77 +84,125 @@ class StudentNotFoundError(Exception):
         self.suggestions = suggestions or []
 
 
-def db_name() -> str:
-    return os.getenv("DB_NAME", "eduvision_ai")
+
+
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").strip().lower() == "true"
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").strip().lower() == "true"
+# Spans are only timed when something reads them; otherwise every hook below
+# costs a single flag check.
+INSTRUMENTED = METRICS_ENABLED or SERVER_TIMING_ENABLED
+
+_metrics = MetricsRegistry()
+_request_seconds = _metrics.histogram(
+    "request_duration_seconds", "Time to build each response.", ["endpoint", "method"]
+)
+_requests_total = _metrics.counter(
+    "requests_total", "Responses by endpoint and status.", ["endpoint", "method", "status"]
+)
+_request_db_seconds = _metrics.histogram(
+    "request_db_seconds", "Time spent in MySQL queries per request.", ["endpoint"]
+)
+_request_db_queries = _metrics.histogram(
+    "request_db_queries", "MySQL queries issued per request.", ["endpoint"], QUERY_COUNT_BUCKETS
+)
+_request_serialize_seconds = _metrics.histogram(
+    "request_serialize_seconds", "Time spent encoding JSON per request.", ["endpoint"]
+)
+_gemini_seconds = _metrics.histogram(
+    "gemini_request_seconds", "Gemini generateContent latency, retries included.", ["outcome"]
+)
+_gemini_requests = _metrics.counter(
+    "gemini_requests_total",
+    "Improvement plan lookups: cached, success, error or not_configured.",
+    ["outcome"],
+)
+_improvement_responses = _metrics.counter(
+    "improvement_responses_total", "Improvement plans served by ai_status.", ["ai_status"]
+)
+
+
+def add_span(name: str, seconds: float) -> None:
+    if INSTRUMENTED and has_request_context():
+        spans = g.setdefault("spans", {})
+        spans[name] = spans.get(name, 0.0) + seconds
+
+
+if INSTRUMENTED:
+    app.json.timer = lambda seconds: add_span("serialize", seconds)
+
+
+class QueryCountingMixin:
+    def execute(self, query: str, args: Any = None) -> int:
+        if not has_request_context():
+            return super().execute(query, args)  # type: ignore[misc]
+        g.db_queries = g.get("db_queries", 0) + 1
+        if not INSTRUMENTED:
+            return super().execute(query, args)  # type: ignore[misc]
+        started = time.perf_counter()
+        try:
+            return super().execute(query, args)  # type: ignore[misc]
+        finally:
+            add_span("db", time.perf_counter() - started)
+
+
+class CountingCursor(QueryCountingMixin, pymysql.cursors.DictCursor):
+    pass
+
+
+class CountingTupleCursor(QueryCountingMixin, pymysql.cursors.Cursor):
+    pass
+
+
+class CountingStreamingCursor(QueryCountingMixin, pymysql.cursors.SSDictCursor):
+    pass
 
 
 def db_config() -> Dict[str, Any]:
-    return {
-        "host": os.getenv("DB_HOST", "127.0.0.1"),
-        "port": int(os.getenv("DB_PORT", "3306")),
-        "user": os.getenv("DB_USER", "root"),
-        "password": os.getenv("DB_PASSWORD", ""),
-        "database": db_name(),
-        "charset": "utf8mb4",
-        "connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", "10")),
-        "read_timeout": int(os.getenv("DB_READ_TIMEOUT", "20")),
-        "write_timeout": int(os.getenv("DB_WRITE_TIMEOUT", "20")),
-        "cursorclass": pymysql.cursors.DictCursor,
-        "autocommit": True,
-    }
+    return student_records.db_config(CountingCursor)
 
 
-def get_connection() -> pymysql.connections.Connection:
-    cfg = db_config()
-    ssl_ca = os.getenv("DB_SSL_CA")
-    if ssl_ca:
-        cfg["ssl"] = {"ca": ssl_ca}
-    return pymysql.connect(**cfg)
+def open_connection() -> pymysql.connections.Connection:
+    return student_records.open_connection(CountingCursor)
 
 
-def normalize_prn(prn: str) -> str:
-    return prn.strip().upper()
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
 
 
-def format_subject_name(raw: str) -> str:
-    return raw.replace("_", " ").title()
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    open_connection,
+                    min_size=int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+                    max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                    timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),
+                    idle_recycle=float(os.getenv("DB_POOL_RECYCLE", "300")),
+                    ping_on_checkout=os.getenv("DB_POOL_PING", "true").lower() == "true",
+                )
+    return _pool
 
 
-def score_to_grade(score: Optional[float]) -> str:
-    if score is None:
-        return "-"
-    if score >= 90:
-        return "A+"
-    if score >= 85:
-        return "A"
-    if score >= 80:
-        return "B+"
-    if score >= 75:
-        return "B"
-    if score >= 70:
-        return "C+"
-    if score >= 60:
-        return "C"
-    return "D"
+def get_connection() -> PooledConnection:
+    return get_pool().connection()
 
 
-def safe_float(value: Any) -> Optional[float]:
-    if value is None:
-        return None
-    return float(value)
+_schema_catalog = SchemaCatalog(ttl=float(os.getenv("SCHEMA_CACHE_TTL", "0")))
+
+
+def schema_catalog(cursor: pymysql.cursors.Cursor) -> SchemaCatalog:
+    return _schema_catalog.ensure(cursor, db_name())
 
 
 def table_exists(cursor: pymysql.cursors.Cursor, table_name: str) -> bool:
-    cursor.execute(
-        """
-        SELECT COUNT(*) AS cnt
-        FROM information_schema.tables
-        WHERE table_schema = %s AND table_name = %s
-        """,
-        (db_name(), table_name),
-    )
-    row = cursor.fetchone()
-    return bool(row and row["cnt"])
+    return schema_catalog(cursor).has_table(table_name)
+
+
+def column_exists(cursor: pymysql.cursors.Cursor, table_name: str, column_name: str) -> bool:
+    return schema_catalog(cursor).has_column(table_name, column_name)
 
 
 def fetch_student_base(cursor: pymysql.cursors.Cursor, prn: str) -> Optional[Dict[str, Any]]:
@@ -185,35 +226,18 @@ def fetch_student_base(cursor: pymysql.cursors.Cursor, prn: str) -> Optional[Dic
     return cursor.fetchone()
 
 
+_prn_index = PrnIndex(ttl=float(os.getenv("PRN_INDEX_TTL", "300")))
+
+
+def fetch_student_names(cursor: pymysql.cursors.Cursor) -> List[Tuple[str, str]]:
+    cursor.execute("SELECT prn, name FROM students")
+    return [(row["prn"], row["name"]) for row in cursor.fetchall()]
+
+
 def fetch_prn_suggestions(
     cursor: pymysql.cursors.Cursor, prn: str, limit: int = 5
 ) -> List[Dict[str, str]]:
-    prefix = prn[: max(3, len(prn) - 1)]
-    cursor.execute(
-        """
-        SELECT prn, name
-        FROM students
-        WHERE prn LIKE %s
-        ORDER BY prn
-        LIMIT %s
-        """,
-        (f"{prefix}%", limit),
-    )
-    rows = cursor.fetchall()
-    if rows:
-        return [{"prn": row["prn"], "name": row["name"]} for row in rows]
-
-    cursor.execute(
-        """
-        SELECT prn, name
-        FROM students
-        ORDER BY prn
-        LIMIT %s
-        """,
-        (limit,),
-    )
-    rows = cursor.fetchall()
-    return [{"prn": row["prn"], "name": row["name"]} for row in rows]
+    return _prn_index.suggest(prn, lambda: fetch_student_names(cursor), limit)
 
 
 def fetch_skills(cursor: pymysql.cursors.Cursor, prn: str) -> List[str]:
@@ -236,42 +260,105 @@ def fetch_semester_data(cursor: pymysql.cursors.Cursor, prn: str) -> List[Dict[s
         if not row:
             continue
 
-        subjects = []
-        for column in subject_columns:
-            if column in row and row[column] is not None:
-                score = int(row[column])
-                subjects.append(
-                    {
-                        "key": column,
-                        "subject": format_subject_name(column),
-                        "score": score,
-                        "grade": score_to_grade(score),
-                    }
-                )
-
-        semester_rows.append(
-            {
-                "table": sem_table,
-                "semester": sem_table.replace("sem", "Semester "),
-                "sgpa": safe_float(row.get("sgpa")),
-                "subjects": subjects,
-            }
-        )
+        semester_rows.append(build_semester_entry(sem_table, subject_columns, row))
 
     return semester_rows
 
 
+def student_bundle_query(cursor: pymysql.cursors.Cursor) -> str:
+    return bundle_select_sql(schema_catalog(cursor))
+
+
+def bundle_select_sql(catalog: SchemaCatalog) -> str:
+    return student_records.bundle_select_sql(catalog, SUMMARY_FIELDS if summary_enabled() else ())
+
+
+def fetch_student_bundle_row(cursor: pymysql.cursors.Cursor, prn: str) -> Optional[Dict[str, Any]]:
+    cursor.execute(student_bundle_query(cursor) + "\nWHERE s.prn = %s", (prn,))
+    return cursor.fetchone()
+
+
+def fetch_student_bundle(
+    cursor: pymysql.cursors.Cursor, prn: str
+) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]], List[str]]]:
+    row = fetch_student_bundle_row(cursor, prn)
+    return split_student_bundle(row) if row else None
+
+
+SUMMARY_FIELDS = [
+    "class_rank",
+    "class_size",
+    "class_percentile",
+    "sgpa_change",
+    "overall_cgpa",
+    "sgpa_history",
+]
+_summary_lock = threading.Lock()
+_summary_usage = {"hits": 0, "stale": 0}
+
+
+def summary_enabled() -> bool:
+    return os.getenv("SUMMARY_TABLE_ENABLED", "false").strip().lower() == "true"
+
+
+def bundle_summary(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # The summary row is only trusted while the SGPA history it was built from
+    # still matches the semester rows joined next to it; otherwise the request
+    # falls back to computing ranks and aggregates itself. Ranks of students
+    # whose own marks did not change are as fresh as the last refresh.
+    if "summary__sgpa_history" not in row:
+        return None
+    history = sgpa_history(
+        (sem_table, row.get(f"{sem_table}__sgpa"))
+        for sem_table in SEMESTER_SUBJECTS
+        if row.get(f"{sem_table}__prn") is not None
+    )
+    fresh = row["summary__sgpa_history"] == history
+    with _summary_lock:
+        _summary_usage["hits" if fresh else "stale"] += 1
+    if not fresh:
+        return None
+    return {
+        "class_rank": row["summary__class_rank"],
+        "class_size": row["summary__class_size"],
+        "class_percentile": safe_float(row["summary__class_percentile"]),
+        "sgpa_change": safe_float(row["summary__sgpa_change"]),
+        "overall_cgpa": safe_float(row["summary__overall_cgpa"]),
+    }
+
+
+def fetch_student_bundles(
+    cursor: pymysql.cursors.Cursor, prns: List[str]
+) -> Dict[str, Tuple[Dict[str, Any], List[Dict[str, Any]], List[str]]]:
+    if not prns:
+        return {}
+    placeholders = ", ".join(["%s"] * len(prns))
+    cursor.execute(student_bundle_query(cursor) + f"\nWHERE s.prn IN ({placeholders})", prns)
+    return {row["prn"]: split_student_bundle(row) for row in cursor.fetchall()}
+
+
+_rank_index = RankIndex(ttl=float(os.getenv("RANK_INDEX_TTL", "300")))
+
+
+def fetch_semester_sgpas(
+    cursor: pymysql.cursors.Cursor, sem_table: str
+) -> List[Tuple[str, Optional[float]]]:
+    cursor.execute(f"SELECT prn, sgpa FROM {sem_table}")
+    return [(row["prn"], safe_float(row["sgpa"])) for row in cursor.fetchall()]
+
+
 def rank_for_semester(
-    cursor: pymysql.cursors.Cursor, sem_table: Optional[str], sgpa: Optional[float]
-) -> Tuple[Optional[int], Optional[int]]:
+    cursor: pymysql.cursors.Cursor,
+    sem_table: Optional[str],
+    sgpa: Optional[float],
+    prn: Optional[str] = None,
+) -> Tuple[Optional[int], Optional[int], Optional[float]]:
     if sem_table is None or sgpa is None or not table_exists(cursor, sem_table):
-        return None, None
+        return None, None, None
 
-    cursor.execute(f"SELECT COUNT(*) AS cnt FROM {sem_table} WHERE sgpa > %s", (sgpa,))
-    higher = cursor.fetchone()["cnt"]
-    cursor.execute(f"SELECT COUNT(*) AS cnt FROM {sem_table}")
-    total = cursor.fetchone()["cnt"]
-    return int(higher) + 1, int(total)
+    if prn is not None:
+        _rank_index.observe(sem_table, prn, sgpa)
+    return _rank_index.lookup(sem_table, sgpa, lambda: fetch_semester_sgpas(cursor, sem_table))
 
 
 def compute_subject_average(subjects: List[Dict[str, Any]]) -> Optional[float]:
@@ -412,24 +499,18 @@ def extract_json_block(text: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def fetch_gemini_recommendations(
+def gemini_model() -> str:
+    return os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+
+
+def build_gemini_prompt(
     student_name: str,
     prn: str,
     twelfth_percentage: Optional[float],
     semesters: List[Dict[str, Any]],
     skills: List[str],
     focus_areas: List[Dict[str, Any]],
-) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
-    api_key = os.getenv("GEMINI_API_KEY", "").strip()
-    if not api_key:
-        return None, "GEMINI_API_KEY is not configured."
-
-    model_name = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
-    endpoint = (
-        f"https://generativelanguage.googleapis.com/v1beta/models/"
-        f"{model_name}:generateContent?key={api_key}"
-    )
-
+) -> str:
     semester_snapshot = [
         {
             "semester": item["semester"],
@@ -484,67 +565,336 @@ Respond strictly in JSON with this schema:
   ]
 }}
 """
+    return prompt
+
+
+def plan_cache_key(prompt: str, model_name: str) -> str:
+    return hashlib.sha256(f"{model_name}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+def plan_request(inputs: Dict[str, Any]) -> Tuple[str, str, str]:
+    # Prompt, model and plan cache key for improvement_inputs(). The endpoint,
+    # plan jobs, the async server and precompute_plans all derive keys here,
+    # so a precomputed plan is the one the endpoint looks up.
+    prompt = build_gemini_prompt(**inputs)
+    model_name = gemini_model()
+    return prompt, model_name, plan_cache_key(prompt, model_name)
+
+
+_plan_store = PlanStore(
+    path=os.getenv("PLAN_CACHE_PATH") or str(CACHE_DIR / "improvement_plans.sqlite3"),
+    max_entries=int(os.getenv("PLAN_CACHE_MAX_ENTRIES", "5000")),
+    ttl=float(os.getenv("PLAN_CACHE_TTL", str(30 * 24 * 3600))),
+)
+
+
+_gemini_client: Optional[GeminiClient] = None
+_gemini_client_lock = threading.Lock()
+
+
+def get_gemini_client() -> GeminiClient:
+    global _gemini_client
+    if _gemini_client is None:
+        with _gemini_client_lock:
+            if _gemini_client is None:
+                _gemini_client = GeminiClient(
+                    api_base=os.getenv(
+                        "GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta"
+                    ),
+                    connect_timeout=float(os.getenv("GEMINI_CONNECT_TIMEOUT", "5")),
+                    read_timeout=float(os.getenv("GEMINI_READ_TIMEOUT", "25")),
+                    max_retries=int(os.getenv("GEMINI_MAX_RETRIES", "2")),
+                    backoff_base=float(os.getenv("GEMINI_BACKOFF_BASE", "0.5")),
+                    backoff_max=float(os.getenv("GEMINI_BACKOFF_MAX", "8")),
+                    pool_size=int(os.getenv("GEMINI_POOL_SIZE", "10")),
+                    breaker=CircuitBreaker(
+                        failure_threshold=int(os.getenv("GEMINI_BREAKER_THRESHOLD", "5")),
+                        reset_timeout=float(os.getenv("GEMINI_BREAKER_RESET", "30")),
+                    ),
+                )
+    return _gemini_client
+
+
+def get_plan_store() -> PlanStore:
+    return _plan_store
+
+
+def gemini_request_body(prompt: str) -> Dict[str, Any]:
+    return {
+        "contents": [{"parts": [{"text": prompt}]}],
+        "generationConfig": {
+            "temperature": 0.3,
+            "maxOutputTokens": 1200,
+            "responseMimeType": "application/json",
+        },
+    }
+
+
+def parse_gemini_plan(payload: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    text = (
+        payload.get("candidates", [{}])[0]
+        .get("content", {})
+        .get("parts", [{}])[0]
+        .get("text", "")
+    )
+    parsed = extract_json_block(text)
+    if not parsed:
+        return None, "Gemini response could not be parsed as JSON."
+    parsed["source"] = "gemini"
+    return parsed, None
+
+
+def request_gemini_plan(prompt: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    api_key = os.getenv("GEMINI_API_KEY", "").strip()
+    if not api_key:
+        return None, "GEMINI_API_KEY is not configured."
 
     try:
-        response = requests.post(
-            endpoint,
-            json={
-                "contents": [{"parts": [{"text": prompt}]}],
-                "generationConfig": {
-                    "temperature": 0.3,
-                    "maxOutputTokens": 1200,
-                    "responseMimeType": "application/json",
-                },
-            },
-            timeout=25,
-        )
-        response.raise_for_status()
-        payload = response.json()
-        text = (
-            payload.get("candidates", [{}])[0]
-            .get("content", {})
-            .get("parts", [{}])[0]
-            .get("text", "")
+        payload = get_gemini_client().generate_content(
+            gemini_model(), api_key, gemini_request_body(prompt)
         )
-        parsed = extract_json_block(text)
-        if not parsed:
-            return None, "Gemini response could not be parsed as JSON."
-        parsed["source"] = "gemini"
-        return parsed, None
+        return parse_gemini_plan(payload)
     except Exception as exc:
         return None, str(exc)
 
 
+def fetch_gemini_recommendations(
+    inputs: Dict[str, Any], refresh: bool = False
+) -> Tuple[Optional[Dict[str, Any]], Optional[str], bool]:
+    prompt, model_name, cache_key = plan_request(inputs)
+
+    if not refresh:
+        cached = _plan_store.get(cache_key)
+        if cached is not None:
+            if METRICS_ENABLED:
+                _gemini_requests.inc("cached")
+            return cached, None, True
+
+    started = time.perf_counter()
+    payload, error = request_gemini_plan(prompt)
+    elapsed = time.perf_counter() - started
+    add_span("gemini", elapsed)
+    if METRICS_ENABLED:
+        if payload is not None:
+            outcome = "success"
+        elif os.getenv("GEMINI_API_KEY", "").strip():
+            outcome = "error"
+        else:
+            outcome = "not_configured"
+        _gemini_requests.inc(outcome)
+        if outcome != "not_configured":
+            _gemini_seconds.observe(elapsed, outcome)
+    if payload is not None:
+        _plan_store.put(cache_key, payload, model_name)
+    return payload, error, False
+
+
+_context_cache = TTLCache(
+    max_size=int(os.getenv("CONTEXT_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("CONTEXT_CACHE_TTL", "60")),
+)
+
+
+_missing_students = TTLCache(
+    max_size=int(os.getenv("NEGATIVE_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("NEGATIVE_CACHE_TTL", "30")),
+)
+
+
 def load_student_context(prn: str) -> Dict[str, Any]:
     normalized_prn = normalize_prn(prn)
+    if snapshot_mode():
+        # The snapshot already answers from memory; caching on top of it would
+        # only serve stale contexts after a swap.
+        return snapshot_student_context(normalized_prn)
+    suggestions = _missing_students.get(normalized_prn)
+    if suggestions is not None:
+        raise StudentNotFoundError(prn=normalized_prn, suggestions=suggestions)
+    try:
+        return _context_cache.get_or_load(
+            normalized_prn, lambda: fetch_student_context(normalized_prn)
+        )
+    except StudentNotFoundError as exc:
+        _missing_students.set(normalized_prn, exc.suggestions)
+        raise
+
+
+def invalidate_student(prn: str) -> bool:
+    normalized_prn = normalize_prn(prn)
+    missing = _missing_students.invalidate(normalized_prn)
+    return _context_cache.invalidate(normalized_prn) or missing
+
+
+def fetch_student_context(normalized_prn: str) -> Dict[str, Any]:
     with get_connection() as connection:
         with connection.cursor() as cursor:
-            student = fetch_student_base(cursor, normalized_prn)
-            if not student:
+            row = fetch_student_bundle_row(cursor, normalized_prn)
+            if not row:
                 raise StudentNotFoundError(
                     prn=normalized_prn,
                     suggestions=fetch_prn_suggestions(cursor, normalized_prn),
                 )
-
-            semesters = fetch_semester_data(cursor, normalized_prn)
-            skills = fetch_skills(cursor, normalized_prn)
-            latest = semesters[-1] if semesters else None
-            previous = semesters[-2] if len(semesters) > 1 else None
-            rank, class_size = rank_for_semester(
-                cursor,
-                latest["table"] if latest else None,
-                latest["sgpa"] if latest else None,
+            summary = bundle_summary(row)
+            if summary is not None:
+                return assemble_context(
+                    split_student_bundle(row), summary_rank_lookup(summary), summary
+                )
+            return assemble_context(
+                split_student_bundle(row),
+                lambda sem_table, sgpa: rank_for_semester(
+                    cursor, sem_table, sgpa, prn=normalized_prn
+                ),
             )
 
-            return {
-                "student": student,
-                "semesters": semesters,
-                "skills": skills,
-                "latest": latest,
-                "previous": previous,
-                "rank": rank,
-                "class_size": class_size,
-            }
+
+def summary_rank_lookup(
+    summary: Dict[str, Any]
+) -> Callable[[Optional[str], Optional[float]], Tuple[Any, Any, Any]]:
+    return lambda sem_table, sgpa: (
+        summary["class_rank"],
+        summary["class_size"],
+        summary["class_percentile"],
+    )
+
+
+def assemble_context(
+    bundle: Tuple[Dict[str, Any], List[Dict[str, Any]], List[str]],
+    rank_lookup: Callable[
+        [Optional[str], Optional[float]], Tuple[Optional[int], Optional[int], Optional[float]]
+    ],
+    summary: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    student, semesters, skills = bundle
+    latest = semesters[-1] if semesters else None
+    previous = semesters[-2] if len(semesters) > 1 else None
+    rank, class_size, percentile = rank_lookup(
+        latest["table"] if latest else None,
+        latest["sgpa"] if latest else None,
+    )
+
+    context = {
+        "student": student,
+        "semesters": semesters,
+        "skills": skills,
+        "latest": latest,
+        "previous": previous,
+        "rank": rank,
+        "class_size": class_size,
+        "percentile": percentile,
+        "summary": summary,
+    }
+    context["version"] = context_version(context)
+    return context
+
+
+def load_snapshot_tables() -> Tuple[Dict[str, List[str]], Dict[str, List[Tuple[Any, ...]]]]:
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            catalog = schema_catalog(cursor)
+        columns = {
+            "students": ["prn", "name"],
+            "marks_12th": ["prn", *TWELFTH_COLUMNS, "percentage"],
+        }
+        for sem_table, subject_columns in SEMESTER_SUBJECTS.items():
+            if catalog.has_table(sem_table):
+                present = [c for c in subject_columns if catalog.has_column(sem_table, c)]
+                columns[sem_table] = ["prn", *present, "sgpa"]
+        if catalog.has_table("student_skills"):
+            columns["student_skills"] = ["prn", "skill_name"]
+
+        # One consistent read view across all tables, so a concurrent ingest
+        # never leaves a student half-updated in the snapshot.
+        tables: Dict[str, List[Tuple[Any, ...]]] = {}
+        with connection.cursor(CountingTupleCursor) as cursor:
+            cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY")
+            try:
+                for table, table_columns in columns.items():
+                    cursor.execute(f"SELECT {', '.join(table_columns)} FROM {table}")
+                    tables[table] = list(cursor.fetchall())
+            finally:
+                connection.commit()
+    return columns, tables
+
+
+def build_snapshot() -> StudentSnapshot:
+    columns, tables = load_snapshot_tables()
+    subject_columns = {
+        sem_table: columns[sem_table][1:-1]
+        for sem_table in SEMESTER_SUBJECTS
+        if sem_table in columns
+    }
+    return StudentSnapshot(tables, subject_columns, TWELFTH_COLUMNS, SKILL_SEPARATOR)
+
+
+def refresh_prn_index(snapshot: StudentSnapshot) -> None:
+    _prn_index.rebuild(snapshot.name_rows)
+
+
+SERVING_MODE = os.getenv("SERVING_MODE", "live").strip().lower()
+_snapshots = SnapshotStore(
+    build_snapshot,
+    refresh_interval=float(os.getenv("SNAPSHOT_REFRESH_INTERVAL", "0")),
+    on_swap=refresh_prn_index,
+    min_reload_interval=float(os.getenv("SNAPSHOT_MIN_RELOAD_INTERVAL", "10")),
+)
+
+
+def snapshot_mode() -> bool:
+    return SERVING_MODE == "snapshot"
+
+
+def snapshot_student_context(normalized_prn: str) -> Dict[str, Any]:
+    snapshot = _snapshots.current()
+    row = snapshot.bundle_row(normalized_prn)
+    if row is None:
+        raise StudentNotFoundError(
+            prn=normalized_prn,
+            suggestions=_prn_index.suggest(normalized_prn, snapshot.name_rows),
+        )
+    return assemble_context(split_student_bundle(row), snapshot.rank)
+
+
+def reload_snapshot() -> None:
+    try:
+        snapshot = _snapshots.reload()
+        app.logger.info("Loaded student snapshot: %s", snapshot.stats())
+    except Exception as exc:
+        app.logger.warning("Snapshot reload failed, keeping the previous one: %s", exc)
+
+
+def reload_snapshot_in_background(*_: Any) -> None:
+    # Signal handlers must return quickly; the load itself runs on a thread.
+    threading.Thread(target=reload_snapshot, name="snapshot-reload", daemon=True).start()
+
+
+def context_version(context: Dict[str, Any]) -> str:
+    data = json.dumps(
+        [
+            context["student"],
+            context["semesters"],
+            context["skills"],
+            context["rank"],
+            context["class_size"],
+            context["percentile"],
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def conditional_json(
+    context: Dict[str, Any], section: str, build: Callable[[], Dict[str, Any]]
+) -> Any:
+    tag = f"{section}-{context['version']}"
+    if request.if_none_match.contains_weak(tag):
+        response = Response(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(tag, weak=True)
+    max_age = int(os.getenv("STUDENT_CACHE_MAX_AGE", "0"))
+    response.headers["Cache-Control"] = f"private, max-age={max_age}, must-revalidate"
+    return response
 
 
 @app.get("/api/health")
@@ -567,118 +917,739 @@ def health() -> Any:
         status["ok"] = False
         status["database"] = "error"
         status["details"] = str(exc)
+        status["db_pool"] = get_pool().stats()
         return jsonify(status), 503
 
+    status["db_pool"] = get_pool().stats()
+    status["warm_up"] = warm_up_status()
+    status["schema_catalog"] = _schema_catalog.stats()
+    status["rank_index"] = _rank_index.stats()
+    status["context_cache"] = _context_cache.stats()
+    status["missing_students"] = _missing_students.stats()
+    status["prn_index"] = _prn_index.stats()
+    status["plan_cache"] = _plan_store.stats()
+    status["plan_jobs"] = _plan_jobs.stats()
+    status["gemini_breaker"] = get_gemini_client().breaker.snapshot()
+    status["cohort_stats"] = _cohort_stats.stats()
+    status["json_provider"] = app.json.backend
+    status["compression"] = _compressor.stats()
+    status["predictor"] = get_predictor().stats()
+    status["student_summary"] = {"enabled": summary_enabled(), **_summary_usage}
+    status["change_feed"] = _change_feed.stats() if change_feed_enabled() else {"enabled": False}
+    status["serving_mode"] = SERVING_MODE
+    status["snapshot"] = (
+        {**_snapshots.stats(), "sighup_reload": _sighup_installed}
+        if snapshot_mode()
+        else {"enabled": False}
+    )
+    status["metrics"] = {"enabled": METRICS_ENABLED, "server_timing": SERVER_TIMING_ENABLED}
     return jsonify(status)
 
 
+LOOPBACK_ADDRESSES = frozenset({"127.0.0.1", "::1"})
+
+
+def admin_only(view: Callable[..., Any]) -> Callable[..., Any]:
+    # Operational endpoints that change server state. With ADMIN_TOKEN set the
+    # caller must send it as X-Admin-Token; without it only loopback callers
+    # are allowed (behind a reverse proxy every caller looks local, so set a
+    # token there).
+    @functools.wraps(view)
+    def guarded(*args: Any, **kwargs: Any) -> Any:
+        token = os.getenv("ADMIN_TOKEN", "").strip()
+        if token:
+            allowed = hmac.compare_digest(request.headers.get("X-Admin-Token", ""), token)
+        else:
+            allowed = request.remote_addr in LOOPBACK_ADDRESSES
+        if not allowed:
+            return jsonify({"error": "Admin access required"}), 403
+        return view(*args, **kwargs)
+
+    return guarded
+
+
+@app.post("/api/schema/refresh")
+@admin_only
+def schema_refresh() -> Any:
+    try:
+        with get_connection() as connection:
+            with connection.cursor() as cursor:
+                _schema_catalog.refresh(cursor, db_name())
+        return jsonify({"schema_catalog": _schema_catalog.stats()})
+    except Exception as exc:
+        return jsonify({"error": "Unable to refresh schema catalog", "details": str(exc)}), 500
+
+
+@app.post("/api/snapshot/reload")
+@admin_only
+def snapshot_reload() -> Any:
+    if not snapshot_mode():
+        return jsonify({"error": "Snapshot serving is disabled (SERVING_MODE=live)"}), 409
+    try:
+        _snapshots.reload()
+        return jsonify({"snapshot": _snapshots.stats()})
+    except Exception as exc:
+        return jsonify({"error": "Unable to reload snapshot", "details": str(exc)}), 500
+
+
+def cache_counters() -> List[Tuple[str, Dict[str, Any]]]:
+    cohort = _cohort_stats.stats()
+    return [
+        ("context", _context_cache.stats()),
+        ("missing_students", _missing_students.stats()),
+        ("plan", _plan_store.stats()),
+        ("cohort_stats", {"hits": cohort["hits"], "misses": cohort["recomputes"]}),
+        ("student_summary", {"hits": _summary_usage["hits"], "misses": _summary_usage["stale"]}),
+    ]
+
+
+def cache_samples(field: str) -> Any:
+    def collect() -> List[Tuple[Dict[str, str], Optional[float]]]:
+        samples = []
+        for name, stats in cache_counters():
+            if field == "hit_ratio" and field not in stats:
+                lookups = stats.get("hits", 0) + stats.get("misses", 0)
+                value = stats["hits"] / lookups if lookups else None
+            else:
+                value = stats.get(field)
+            samples.append(({"cache": name}, value))
+        return samples
+
+    return collect
+
+
+_metrics.collector("cache_hits_total", "counter", "Cache hits.", cache_samples("hits"))
+_metrics.collector("cache_misses_total", "counter", "Cache misses.", cache_samples("misses"))
+_metrics.collector(
+    "cache_hit_ratio", "gauge", "Hits over hits plus misses.", cache_samples("hit_ratio")
+)
+_metrics.collector(
+    "db_pool_connections",
+    "gauge",
+    "Pooled MySQL connections by state.",
+    lambda: [({"state": state}, get_pool().stats()[state]) for state in ("in_use", "idle")],
+)
+_metrics.collector(
+    "gemini_breaker_open",
+    "gauge",
+    "1 while the Gemini circuit breaker rejects calls.",
+    lambda: [({}, float(get_gemini_client().breaker.snapshot()["state"] == "open"))],
+)
+
+
+@app.get("/api/metrics")
+def prometheus_metrics() -> Any:
+    if not METRICS_ENABLED:
+        return jsonify({"error": "Metrics are disabled (METRICS_ENABLED=false)"}), 404
+    return Response(_metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.delete("/api/student/<prn>/cache")
+@admin_only
+def student_cache_invalidate(prn: str) -> Any:
+    return jsonify({"prn": normalize_prn(prn), "invalidated": invalidate_student(prn)})
+
+
+def encode_page_cursor(prn: str) -> str:
+    token = base64.urlsafe_b64encode(json.dumps({"after": prn}).encode("utf-8"))
+    return token.decode("ascii").rstrip("=")
+
+
+def decode_page_cursor(token: str) -> str:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        prn = data["after"]
+    except (ValueError, TypeError, KeyError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(prn, str):
+        raise ValueError("Invalid cursor")
+    return prn
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def student_search_filter(query: str) -> Tuple[str, List[Any]]:
+    if not query:
+        return "", []
+    pattern = escape_like(query)
+    if any(char.isdigit() for char in query):
+        return "prn LIKE %s", [f"{pattern.upper()}%"]
+    # Match the start of any word in the name: "rao" finds "Ishika Rao".
+    return "(name LIKE %s OR name LIKE %s)", [f"{pattern}%", f"% {pattern}%"]
+
+
 @app.get("/api/students")
 def students_list() -> Any:
+    default_limit = int(os.getenv("STUDENT_LIST_LIMIT", "50"))
+    max_limit = int(os.getenv("STUDENT_LIST_MAX_LIMIT", "500"))
+    try:
+        limit = min(max(int(request.args.get("limit", default_limit)), 1), max_limit)
+    except ValueError:
+        return jsonify({"error": "Query parameter 'limit' must be an integer"}), 400
+    try:
+        after = decode_page_cursor(request.args["cursor"]) if request.args.get("cursor") else None
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    include_total = request.args.get("include_total", "false").strip().lower() == "true"
+
+    search_clause, search_params = student_search_filter(request.args.get("q", "").strip())
+    filters = [search_clause] if search_clause else []
+    params = list(search_params)
+    if after is not None:
+        filters.append("prn > %s")
+        params.append(after)
+    where = f"WHERE {' AND '.join(filters)}" if filters else ""
+
     try:
-        limit = int(os.getenv("STUDENT_LIST_LIMIT", "50"))
         with get_connection() as connection:
             with connection.cursor() as cursor:
                 cursor.execute(
-                    """
+                    f"""
                     SELECT prn, name
                     FROM students
+                    {where}
                     ORDER BY prn
                     LIMIT %s
                     """,
-                    (limit,),
+                    (*params, limit + 1),
                 )
                 rows = cursor.fetchall()
-        return jsonify({"students": rows, "count": len(rows)})
+                total = None
+                if include_total:
+                    count_where = f"WHERE {search_clause}" if search_clause else ""
+                    cursor.execute(
+                        f"SELECT COUNT(*) AS total FROM students {count_where}", search_params
+                    )
+                    total = cursor.fetchone()["total"]
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        payload: Dict[str, Any] = {
+            "students": rows,
+            "count": len(rows),
+            "limit": limit,
+            "next_cursor": encode_page_cursor(rows[-1]["prn"]) if has_more else None,
+        }
+        if include_total:
+            payload["total"] = total
+        return jsonify(payload)
     except Exception as exc:
         return jsonify({"error": "Unable to load student list", "details": str(exc)}), 500
 
 
-@app.get("/")
-def frontend_home() -> Any:
-    return send_from_directory(FRONTEND_DIR, "index.html")
-
-
-@app.get("/index.html")
-def frontend_index() -> Any:
-    return send_from_directory(FRONTEND_DIR, "index.html")
+@app.get("/api/students/suggest")
+def students_suggest() -> Any:
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "Query parameter 'q' is required"}), 400
+    try:
+        limit = min(max(int(request.args.get("limit", "5")), 1), 20)
+    except ValueError:
+        return jsonify({"error": "Query parameter 'limit' must be an integer"}), 400
+    try:
+        if snapshot_mode():
+            suggestions = _prn_index.suggest(query, _snapshots.current().name_rows, limit)
+        else:
+            with get_connection() as connection:
+                with connection.cursor() as cursor:
+                    suggestions = fetch_prn_suggestions(cursor, query, limit)
+        return jsonify({"query": query, "suggestions": suggestions})
+    except Exception as exc:
+        return jsonify({"error": "Unable to load suggestions", "details": str(exc)}), 500
 
 
-@app.get("/student/<path:filename>")
-def frontend_student(filename: str) -> Any:
-    return send_from_directory(STUDENT_DIR, filename)
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_CHUNK_BYTES = 64 * 1024
 
 
-@app.get("/api/student/<prn>/dashboard")
-def student_dashboard(prn: str) -> Any:
+def export_record(row: Dict[str, Any]) -> Dict[str, Any]:
+    student, semesters, skills = split_student_bundle(row)
+    return {
+        "prn": student["prn"],
+        "name": student["name"],
+        "marks_12th": {
+            **{column: student.get(column) for column in TWELFTH_COLUMNS},
+            "percentage": safe_float(student.get("twelfth_percentage")),
+        },
+        "semesters": [
+            {
+                "table": item["table"],
+                "sgpa": item["sgpa"],
+                "scores": {subject["key"]: subject["score"] for subject in item["subjects"]},
+            }
+            for item in semesters
+        ],
+        "skills": skills,
+    }
+
+
+def export_csv_header(cursor: pymysql.cursors.Cursor) -> List[str]:
+    catalog = schema_catalog(cursor)
+    header = ["prn", "name", *TWELFTH_COLUMNS, "twelfth_percentage"]
+    for sem_table, subject_columns in SEMESTER_SUBJECTS.items():
+        if catalog.has_table(sem_table):
+            header.extend(
+                f"{sem_table}_{column}"
+                for column in [*subject_columns, "sgpa"]
+                if catalog.has_column(sem_table, column)
+            )
+    header.append("skills")
+    return header
+
+
+def export_csv_line(record: Dict[str, Any], header: List[str]) -> str:
+    flat: Dict[str, Any] = {
+        "prn": record["prn"],
+        "name": record["name"],
+        **{column: record["marks_12th"].get(column) for column in TWELFTH_COLUMNS},
+        "twelfth_percentage": record["marks_12th"]["percentage"],
+        "skills": ", ".join(record["skills"]),
+    }
+    for item in record["semesters"]:
+        flat[f"{item['table']}_sgpa"] = item["sgpa"]
+        for key, score in item["scores"].items():
+            flat[f"{item['table']}_{key}"] = score
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(
+        ["" if flat.get(column) is None else flat[column] for column in header]
+    )
+    return buffer.getvalue()
+
+
+def export_as_of(cursor: pymysql.cursors.Cursor) -> Optional[datetime]:
+    # Database clock read before the export query: the `since` for the next
+    # incremental pull. None without change capture, where `since` is refused.
+    if not table_exists(cursor, CHANGE_LOG_TABLE):
+        return None
+    cursor.execute("SELECT CURRENT_TIMESTAMP(3) AS now")
+    return cursor.fetchone()["now"]
+
+
+def stream_student_export(
+    connection: PooledConnection,
+    sql: str,
+    params: List[Any],
+    export_format: str,
+    header: List[str],
+) -> Iterator[str]:
+    finished = False
+    cursor = connection.cursor(CountingStreamingCursor)
     try:
-        context = load_student_context(prn)
-        student = context["student"]
-        latest = context["latest"]
-        previous = context["previous"]
-        semesters = context["semesters"]
-        skills = context["skills"]
-
-        latest_subjects = latest["subjects"] if latest else []
-        average_subject_score = compute_subject_average(latest_subjects)
-        current_sgpa = latest["sgpa"] if latest else None
-        previous_sgpa = previous["sgpa"] if previous else None
-        sgpa_change = (
-            round(current_sgpa - previous_sgpa, 2)
-            if current_sgpa is not None and previous_sgpa is not None
-            else None
+        cursor.execute(sql, params)
+        chunk: List[str] = []
+        size = 0
+        if export_format == "csv":
+            chunk.append(",".join(header) + "\r\n")
+        for row in cursor.fetchall_unbuffered():
+            record = export_record(row)
+            if export_format == "csv":
+                line = export_csv_line(record, header)
+            else:
+                line = json.dumps(record, separators=(",", ":")) + "\n"
+            chunk.append(line)
+            size += len(line)
+            if size >= EXPORT_CHUNK_BYTES:
+                yield "".join(chunk)
+                chunk, size = [], 0
+        if chunk:
+            yield "".join(chunk)
+        finished = True
+    finally:
+        if finished:
+            cursor.close()
+        else:
+            # Unread rows are still on the wire; drop the connection rather
+            # than draining a possibly huge result set back into the pool.
+            connection.invalidate()
+        connection.close()
+
+
+@app.get("/api/export/students")
+def export_students() -> Any:
+    export_format = request.args.get("format", "ndjson").lower()
+    if export_format not in EXPORT_FORMATS:
+        allowed = list(EXPORT_FORMATS)
+        return jsonify({"error": "Unsupported export format", "allowed": allowed}), 400
+
+    since_raw = request.args.get("since", "").strip()
+    since: Optional[datetime] = None
+    if since_raw:
+        try:
+            since = datetime.fromisoformat(since_raw)
+        except ValueError:
+            pass
+        if since is None or since.tzinfo is not None:
+            return (
+                jsonify(
+                    {
+                        "error": "since must be an ISO 8601 timestamp without a UTC offset, "
+                        "in the database time zone",
+                        "example": "2026-01-31T18:30:00",
+                    }
+                ),
+                400,
+            )
+
+    filters = []
+    params: List[Any] = []
+    for arg, clause in (
+        ("after", "s.prn > %s"),
+        ("prn_from", "s.prn >= %s"),
+        ("prn_to", "s.prn <= %s"),
+    ):
+        value = request.args.get(arg, "").strip()
+        if value:
+            filters.append(clause)
+            params.append(normalize_prn(value))
+
+    try:
+        connection = get_connection()
+        try:
+            with connection.cursor() as cursor:
+                sql = student_bundle_query(cursor)
+                header = export_csv_header(cursor)
+                as_of = export_as_of(cursor)
+        except Exception:
+            connection.close()
+            raise
+        if since is not None:
+            if as_of is None:
+                connection.close()
+                return (
+                    jsonify({"error": "since needs the change_log triggers from db.sql"}),
+                    409,
+                )
+            # Students with any logged insert/update since then; the entries
+            # come from the triggers on every student table.
+            filters.append(
+                f"s.prn IN (SELECT prn FROM {CHANGE_LOG_TABLE} WHERE changed_at >= %s)"
+            )
+            params.append(since)
+        if filters:
+            sql += "\nWHERE " + " AND ".join(filters)
+        sql += "\nORDER BY s.prn"
+
+        response = Response(
+            stream_with_context(
+                stream_student_export(connection, sql, params, export_format, header)
+            ),
+            mimetype=EXPORT_FORMATS[export_format],
+        )
+        response.headers["Content-Disposition"] = (
+            f"attachment; filename=students.{export_format}"
         )
+        if as_of is not None:
+            response.headers["X-Export-As-Of"] = as_of.isoformat()
+        # If the client goes away before the body is iterated, the generator's
+        # cleanup never runs; make sure the connection still leaves the pool.
+        response.call_on_close(lambda: (connection.invalidate(), connection.close()))
+        return response
+    except Exception as exc:
+        return jsonify({"error": "Unable to export students", "details": str(exc)}), 500
+
+
+@app.get("/")
+def frontend_home() -> Any:
+    return send_from_directory(FRONTEND_DIR, "index.html")
+
+
+@app.get("/index.html")
+def frontend_index() -> Any:
+    return send_from_directory(FRONTEND_DIR, "index.html")
+
+
+@app.get("/student/<path:filename>")
+def frontend_student(filename: str) -> Any:
+    return send_from_directory(STUDENT_DIR, filename)
+
+
+def student_not_found_payload(exc: StudentNotFoundError) -> Dict[str, Any]:
+    return {
+        "error": "Student not found",
+        "prn": exc.prn,
+        "hint": "Use exact PRN from students table.",
+        "suggestions": exc.suggestions,
+    }
+
+
+def student_not_found_response(exc: StudentNotFoundError) -> Any:
+    return jsonify(student_not_found_payload(exc)), 404
+
+
+def build_dashboard_payload(context: Dict[str, Any]) -> Dict[str, Any]:
+    student = context["student"]
+    latest = context["latest"]
+    previous = context["previous"]
+    semesters = context["semesters"]
+    skills = context["skills"]
+
+    latest_subjects = latest["subjects"] if latest else []
+    average_subject_score = compute_subject_average(latest_subjects)
+    current_sgpa = latest["sgpa"] if latest else None
+    previous_sgpa = previous["sgpa"] if previous else None
+    summary = context.get("summary")
+    if summary is not None:
+        sgpa_change = summary["sgpa_change"]
+    elif current_sgpa is not None and previous_sgpa is not None:
+        sgpa_change = round(current_sgpa - previous_sgpa, 2)
+    else:
+        sgpa_change = None
+
+    recent_grades = sorted(
+        latest_subjects,
+        key=lambda item: item["score"],
+        reverse=True,
+    )
+
+    insights = []
+    if sgpa_change is not None:
+        if sgpa_change > 0:
+            insights.append("SGPA trend is improving compared to previous semester.")
+        elif sgpa_change < 0:
+            insights.append("SGPA dipped from previous semester; focus on weak subjects.")
+        else:
+            insights.append("SGPA is stable across the last two semesters.")
+    if average_subject_score is not None:
+        insights.append(f"Current semester subject average is {average_subject_score}%.")
+    if skills:
+        insights.append(f"Recorded technical skills: {', '.join(skills[:6])}.")
+
+    return {
+        "student": {"prn": student["prn"], "name": student["name"]},
+        "metrics": {
+            "current_sgpa": current_sgpa,
+            "sgpa_change": sgpa_change,
+            "twelfth_percentage": safe_float(student.get("twelfth_percentage")),
+            "average_subject_score": average_subject_score,
+            "class_rank": context["rank"],
+            "class_size": context["class_size"],
+            "class_percentile": context["percentile"],
+            "skills_count": len(skills),
+        },
+        "progress": [
+            {"semester": row["semester"], "sgpa": row["sgpa"]} for row in semesters
+        ],
+        "recent_grades": recent_grades,
+        "skills": skills,
+        "insights": insights,
+    }
+
+
+def build_progress_payload(context: Dict[str, Any]) -> Dict[str, Any]:
+    student = context["student"]
+    latest = context["latest"]
+    semesters = context["semesters"]
+    skills = context["skills"]
 
-        recent_grades = sorted(
-            latest_subjects,
-            key=lambda item: item["score"],
-            reverse=True,
+    subjects = []
+    for item in (latest["subjects"] if latest else []):
+        score = item["score"]
+        status = "strong" if score >= 85 else "stable" if score >= 70 else "needs_focus"
+        target = min(score + 5, 95)
+        subjects.append(
+            {
+                **item,
+                "status": status,
+                "target_score": target,
+                "delta_to_target": target - score,
+            }
         )
 
-        insights = []
-        if sgpa_change is not None:
-            if sgpa_change > 0:
-                insights.append("SGPA trend is improving compared to previous semester.")
-            elif sgpa_change < 0:
-                insights.append("SGPA dipped from previous semester; focus on weak subjects.")
-            else:
-                insights.append("SGPA is stable across the last two semesters.")
-        if average_subject_score is not None:
-            insights.append(f"Current semester subject average is {average_subject_score}%.")
-        if skills:
-            insights.append(f"Recorded technical skills: {', '.join(skills[:6])}.")
+    twelfth_pairs = [
+        ("Physics", student.get("physics")),
+        ("Chemistry", student.get("chemistry")),
+        ("Mathematics", student.get("mathematics")),
+        ("English", student.get("english")),
+        ("Computer Science", student.get("computer_science")),
+    ]
+    filtered_pairs = [(label, int(score)) for label, score in twelfth_pairs if score is not None]
 
-        return jsonify(
+    goals = []
+    for item in sorted(subjects, key=lambda x: x["score"])[:3]:
+        status = "on_track" if item["score"] >= 80 else "needs_focus"
+        goals.append(
             {
-                "student": {"prn": student["prn"], "name": student["name"]},
-                "metrics": {
-                    "current_sgpa": current_sgpa,
-                    "sgpa_change": sgpa_change,
-                    "twelfth_percentage": safe_float(student.get("twelfth_percentage")),
-                    "average_subject_score": average_subject_score,
-                    "class_rank": context["rank"],
-                    "class_size": context["class_size"],
-                    "skills_count": len(skills),
-                },
-                "progress": [
-                    {"semester": row["semester"], "sgpa": row["sgpa"]} for row in semesters
-                ],
-                "recent_grades": recent_grades,
-                "skills": skills,
-                "insights": insights,
+                "title": f"Improve {item['subject']}",
+                "current_score": item["score"],
+                "target_score": item["target_score"],
+                "status": status,
             }
         )
-    except StudentNotFoundError as exc:
+
+    return {
+        "student": {"prn": student["prn"], "name": student["name"]},
+        "current_semester": latest["semester"] if latest else None,
+        "subjects": subjects,
+        "sgpa_trend": [
+            {"semester": row["semester"], "sgpa": row["sgpa"]} for row in semesters
+        ],
+        "twelfth_radar": {
+            "labels": [item[0] for item in filtered_pairs],
+            "scores": [item[1] for item in filtered_pairs],
+        },
+        "skills": skills,
+        "goals": goals,
+    }
+
+
+def build_reports_payload(context: Dict[str, Any]) -> Dict[str, Any]:
+    student = context["student"]
+    semesters = context["semesters"]
+    latest = context["latest"]
+    summary = context.get("summary")
+    if summary is not None:
+        overall_cgpa = summary["overall_cgpa"]
+    else:
+        sgpa_values = [item["sgpa"] for item in semesters if item.get("sgpa") is not None]
+        overall_cgpa = round(mean(sgpa_values), 2) if sgpa_values else None
+
+    reports = [
+        {
+            "semester": item["semester"],
+            "sgpa": item["sgpa"],
+            "subjects": item["subjects"],
+        }
+        for item in semesters
+    ]
+
+    return {
+        "student": {"prn": student["prn"], "name": student["name"]},
+        "summary": {
+            "twelfth_percentage": safe_float(student.get("twelfth_percentage")),
+            "current_sgpa": latest["sgpa"] if latest else None,
+            "class_rank": context["rank"],
+            "class_size": context["class_size"],
+            "class_percentile": context["percentile"],
+            "semesters_completed": len(semesters),
+            "overall_cgpa": overall_cgpa,
+        },
+        "reports": reports,
+    }
+
+
+def improvement_inputs(context: Dict[str, Any]) -> Dict[str, Any]:
+    student = context["student"]
+    latest = context["latest"]
+    latest_subjects = latest["subjects"] if latest else []
+    return {
+        "student_name": student["name"],
+        "prn": student["prn"],
+        "twelfth_percentage": safe_float(student.get("twelfth_percentage")),
+        "semesters": context["semesters"],
+        "skills": context["skills"],
+        "focus_areas": derive_focus_areas(latest_subjects),
+    }
+
+
+def finish_improvement_payload(
+    context: Dict[str, Any],
+    payload: Dict[str, Any],
+    ai_status: str,
+    ai_error: Optional[str],
+) -> Dict[str, Any]:
+    student = context["student"]
+    semesters = context["semesters"]
+    skills = context["skills"]
+
+    payload["student"] = {"prn": student["prn"], "name": student["name"]}
+    payload["ai_status"] = ai_status
+    payload["gemini_configured"] = bool(os.getenv("GEMINI_API_KEY", "").strip())
+    if ai_error:
+        payload["ai_error"] = ai_error
+    payload["sgpa_trend"] = [
+        {"semester": item["semester"], "sgpa": item["sgpa"]} for item in semesters
+    ]
+    payload["recommendations_started"] = len(payload.get("recommendations", []))
+    payload["skills_count"] = len(skills)
+    # Background plan jobs run outside a request and are not responses.
+    if METRICS_ENABLED and has_request_context():
+        _improvement_responses.inc(ai_status)
+    return payload
+
+
+def build_improvement_payload(
+    context: Dict[str, Any], refresh: bool = False
+) -> Tuple[Dict[str, Any], int]:
+    inputs = improvement_inputs(context)
+    gemini_payload, gemini_error, from_cache = fetch_gemini_recommendations(
+        inputs, refresh=refresh
+    )
+    return complete_improvement_payload(context, inputs, gemini_payload, gemini_error, from_cache)
+
+
+def complete_improvement_payload(
+    context: Dict[str, Any],
+    inputs: Dict[str, Any],
+    gemini_payload: Optional[Dict[str, Any]],
+    gemini_error: Optional[str],
+    from_cache: bool,
+) -> Tuple[Dict[str, Any], int]:
+    gemini_required = os.getenv("GEMINI_REQUIRED", "false").lower() == "true"
+    if gemini_required and not gemini_payload:
         return (
-            jsonify(
-                {
-                    "error": "Student not found",
-                    "prn": exc.prn,
-                    "hint": "Use exact PRN from students table.",
-                    "suggestions": exc.suggestions,
-                }
-            ),
-            404,
+            {
+                "error": "Gemini response is required but generation failed.",
+                "details": gemini_error or "Unknown Gemini error",
+            },
+            502,
         )
+
+    if not gemini_payload:
+        ai_status = "gemini_fallback"
+    else:
+        ai_status = "gemini_cached" if from_cache else "gemini_success"
+    payload = gemini_payload or fallback_improvement_payload(
+        student_name=inputs["student_name"],
+        focus_areas=inputs["focus_areas"],
+        skills=inputs["skills"],
+    )
+    return finish_improvement_payload(context, payload, ai_status, gemini_error), 200
+
+
+_plan_jobs = PlanJobQueue(
+    workers=int(os.getenv("PLAN_JOB_WORKERS", "2")),
+    max_queue=int(os.getenv("PLAN_JOB_QUEUE_SIZE", "100")),
+    retention=float(os.getenv("PLAN_JOB_RETENTION", "600")),
+)
+
+
+def build_improvement_payload_async(
+    context: Dict[str, Any], refresh: bool = False
+) -> Tuple[Dict[str, Any], int]:
+    inputs = improvement_inputs(context)
+    _, _, cache_key = plan_request(inputs)
+    gemini_configured = bool(os.getenv("GEMINI_API_KEY", "").strip())
+    if not gemini_configured or (not refresh and _plan_store.contains(cache_key)):
+        return build_improvement_payload(context, refresh=refresh)
+
+    fallback = fallback_improvement_payload(
+        student_name=inputs["student_name"],
+        focus_areas=inputs["focus_areas"],
+        skills=inputs["skills"],
+    )
+    try:
+        job = _plan_jobs.submit(
+            cache_key, lambda: build_improvement_payload(context, refresh=refresh)
+        )
+    except QueueFullError as exc:
+        return finish_improvement_payload(context, fallback, "gemini_fallback", str(exc)), 200
+
+    payload = finish_improvement_payload(context, fallback, "gemini_pending", None)
+    payload["job_id"] = job["job_id"]
+    payload["job_status"] = job["status"]
+    return payload, 202
+
+
+@app.get("/api/student/<prn>/dashboard")
+def student_dashboard(prn: str) -> Any:
+    try:
+        context = load_student_context(prn)
+        return conditional_json(context, "dashboard", lambda: build_dashboard_payload(context))
+    except StudentNotFoundError as exc:
+        return student_not_found_response(exc)
     except Exception as exc:
         return jsonify({"error": "Unable to load dashboard", "details": str(exc)}), 500
 
@@ -687,74 +1658,9 @@ def student_dashboard(prn: str) -> Any:
 def student_progress(prn: str) -> Any:
     try:
         context = load_student_context(prn)
-        student = context["student"]
-        latest = context["latest"]
-        semesters = context["semesters"]
-        skills = context["skills"]
-
-        subjects = []
-        for item in (latest["subjects"] if latest else []):
-            score = item["score"]
-            status = "strong" if score >= 85 else "stable" if score >= 70 else "needs_focus"
-            target = min(score + 5, 95)
-            subjects.append(
-                {
-                    **item,
-                    "status": status,
-                    "target_score": target,
-                    "delta_to_target": target - score,
-                }
-            )
-
-        twelfth_pairs = [
-            ("Physics", student.get("physics")),
-            ("Chemistry", student.get("chemistry")),
-            ("Mathematics", student.get("mathematics")),
-            ("English", student.get("english")),
-            ("Computer Science", student.get("computer_science")),
-        ]
-        filtered_pairs = [(label, int(score)) for label, score in twelfth_pairs if score is not None]
-
-        goals = []
-        for item in sorted(subjects, key=lambda x: x["score"])[:3]:
-            status = "on_track" if item["score"] >= 80 else "needs_focus"
-            goals.append(
-                {
-                    "title": f"Improve {item['subject']}",
-                    "current_score": item["score"],
-                    "target_score": item["target_score"],
-                    "status": status,
-                }
-            )
-
-        return jsonify(
-            {
-                "student": {"prn": student["prn"], "name": student["name"]},
-                "current_semester": latest["semester"] if latest else None,
-                "subjects": subjects,
-                "sgpa_trend": [
-                    {"semester": row["semester"], "sgpa": row["sgpa"]} for row in semesters
-                ],
-                "twelfth_radar": {
-                    "labels": [item[0] for item in filtered_pairs],
-                    "scores": [item[1] for item in filtered_pairs],
-                },
-                "skills": skills,
-                "goals": goals,
-            }
-        )
+        return conditional_json(context, "progress", lambda: build_progress_payload(context))
     except StudentNotFoundError as exc:
-        return (
-            jsonify(
-                {
-                    "error": "Student not found",
-                    "prn": exc.prn,
-                    "hint": "Use exact PRN from students table.",
-                    "suggestions": exc.suggestions,
-                }
-            ),
-            404,
-        )
+        return student_not_found_response(exc)
     except Exception as exc:
         return jsonify({"error": "Unable to load progress", "details": str(exc)}), 500
 
@@ -763,118 +1669,512 @@ def student_progress(prn: str) -> Any:
 def student_reports(prn: str) -> Any:
     try:
         context = load_student_context(prn)
-        student = context["student"]
-        semesters = context["semesters"]
-        latest = context["latest"]
-        sgpa_values = [item["sgpa"] for item in semesters if item.get("sgpa") is not None]
+        return conditional_json(context, "reports", lambda: build_reports_payload(context))
+    except StudentNotFoundError as exc:
+        return student_not_found_response(exc)
+    except Exception as exc:
+        return jsonify({"error": "Unable to load reports", "details": str(exc)}), 500
 
-        reports = [
-            {
-                "semester": item["semester"],
-                "sgpa": item["sgpa"],
-                "subjects": item["subjects"],
-            }
-            for item in semesters
-        ]
 
-        return jsonify(
-            {
-                "student": {"prn": student["prn"], "name": student["name"]},
-                "summary": {
-                    "twelfth_percentage": safe_float(student.get("twelfth_percentage")),
-                    "current_sgpa": latest["sgpa"] if latest else None,
-                    "class_rank": context["rank"],
-                    "class_size": context["class_size"],
-                    "semesters_completed": len(semesters),
-                    "overall_cgpa": round(mean(sgpa_values), 2) if sgpa_values else None,
-                },
-                "reports": reports,
-            }
-        )
+@app.get("/api/student/<prn>/improvement")
+def student_improvement(prn: str) -> Any:
+    try:
+        context = load_student_context(prn)
+        refresh = request.args.get("refresh", "false").lower() in ("1", "true", "yes")
+        mode = request.args.get("mode") or os.getenv("IMPROVEMENT_MODE", "sync")
+        if mode.lower() == "async":
+            payload, status_code = build_improvement_payload_async(context, refresh=refresh)
+        else:
+            payload, status_code = build_improvement_payload(context, refresh=refresh)
+        return jsonify(payload), status_code
     except StudentNotFoundError as exc:
+        return student_not_found_response(exc)
+    except Exception as exc:
+        return jsonify({"error": "Unable to load improvement plan", "details": str(exc)}), 500
+
+
+_cohort_stats = CohortStatsCache(
+    check_interval=float(os.getenv("COHORT_STATS_CHECK_INTERVAL", "30"))
+)
+
+
+def resolve_semester_table(semester: str) -> Optional[str]:
+    digits = re.sub(r"\D", "", semester)
+    sem_table = f"sem{digits}" if digits else semester.strip().lower()
+    return sem_table if sem_table in SEMESTER_SUBJECTS else None
+
+
+def semester_table_checksum(cursor: pymysql.cursors.Cursor, sem_table: str) -> Any:
+    cursor.execute(f"CHECKSUM TABLE {sem_table}")
+    row = cursor.fetchone()
+    return row["Checksum"] if row else None
+
+
+def load_semester_columns(
+    connection: PooledConnection, sem_table: str, subject_columns: List[str]
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    with connection.cursor(CountingTupleCursor) as cursor:
+        cursor.execute(f"SELECT {', '.join([*subject_columns, 'sgpa'])} FROM {sem_table}")
+        rows = cursor.fetchall()
+    matrix = np.array(rows, dtype=float).reshape(len(rows), len(subject_columns) + 1)
+    columns = {column: matrix[:, index] for index, column in enumerate(subject_columns)}
+    return columns, matrix[:, -1]
+
+
+def build_cohort_stats(connection: PooledConnection, sem_table: str) -> Dict[str, Any]:
+    with connection.cursor() as cursor:
+        catalog = schema_catalog(cursor)
+    subject_columns = [
+        column for column in SEMESTER_SUBJECTS[sem_table] if catalog.has_column(sem_table, column)
+    ]
+    columns, sgpa = load_semester_columns(connection, sem_table, subject_columns)
+    stats = compute_semester_stats(columns, sgpa, GRADE_BANDS, FLOOR_GRADE)
+    stats["subjects"] = [
+        {"key": key, "subject": format_subject_name(key), **values}
+        for key, values in stats["subjects"].items()
+    ]
+    return {
+        "table": sem_table,
+        "semester": sem_table.replace("sem", "Semester "),
+        **stats,
+        "computed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+@app.get("/api/cohort/<semester>/stats")
+def cohort_semester_stats(semester: str) -> Any:
+    sem_table = resolve_semester_table(semester)
+    if sem_table is None:
         return (
-            jsonify(
-                {
-                    "error": "Student not found",
-                    "prn": exc.prn,
-                    "hint": "Use exact PRN from students table.",
-                    "suggestions": exc.suggestions,
-                }
-            ),
+            jsonify({"error": "Unknown semester", "allowed": list(SEMESTER_SUBJECTS)}),
             404,
         )
+
+    try:
+        with get_connection() as connection:
+            with connection.cursor() as cursor:
+                if not table_exists(cursor, sem_table):
+                    return jsonify({"error": "Semester table not found", "table": sem_table}), 404
+                stats = _cohort_stats.get(
+                    sem_table,
+                    lambda: semester_table_checksum(cursor, sem_table),
+                    lambda: build_cohort_stats(connection, sem_table),
+                )
+        return jsonify(stats)
     except Exception as exc:
-        return jsonify({"error": "Unable to load reports", "details": str(exc)}), 500
+        return jsonify({"error": "Unable to load cohort statistics", "details": str(exc)}), 500
+
+
+@app.get("/api/improvement/jobs/<job_id>")
+def improvement_job_status(job_id: str) -> Any:
+    job = _plan_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found", "job_id": job_id}), 404
+
+    body: Dict[str, Any] = {"job_id": job["job_id"], "status": job["status"]}
+    if job["status"] == "done":
+        body["plan"] = job["result"]
+    elif job["status"] == "failed":
+        body["error"] = job["error"]
+    return jsonify(body)
+
+
+_predictor: Optional[Predictor] = None
+_predictor_lock = threading.Lock()
+
+
+def get_predictor() -> Predictor:
+    global _predictor
+    if _predictor is None:
+        with _predictor_lock:
+            if _predictor is None:
+                _predictor = Predictor(
+                    path=os.getenv("PREDICTOR_MODEL_PATH")
+                    or str(PROJECT_ROOT / "ml_models" / "models" / "performance_predictor.pkl"),
+                    semester_subjects=SEMESTER_SUBJECTS,
+                    risk_threshold=float(os.getenv("PREDICTION_RISK_THRESHOLD", "60")),
+                    reload_interval=float(os.getenv("PREDICTOR_RELOAD_INTERVAL", "30")),
+                )
+    return _predictor
 
 
-@app.get("/api/student/<prn>/improvement")
-def student_improvement(prn: str) -> Any:
+def prediction_history(
+    student: Dict[str, Any], semesters: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    return {"twelfth_percentage": student["twelfth_percentage"], "semesters": semesters}
+
+
+def prediction_payload(student: Dict[str, Any], prediction: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "student": {"prn": student["prn"], "name": student["name"]},
+        **prediction,
+        "next_semester_label": (
+            prediction["next_semester"].replace("sem", "Semester ")
+            if prediction["next_semester"]
+            else None
+        ),
+        "at_risk_subjects": [
+            {**subject, "subject": format_subject_name(subject["key"])}
+            for subject in prediction["at_risk_subjects"]
+        ],
+    }
+
+
+@app.post("/api/predictor/reload")
+@admin_only
+def predictor_reload() -> Any:
+    # model_info()["load_error"] names a failed load without the raw exception.
+    predictor = get_predictor()
+    swapped = predictor.reload()
+    return jsonify({"reloaded": swapped, "model": predictor.model_info()}), 200 if swapped else 500
+
+
+@app.get("/api/student/<prn>/prediction")
+def student_prediction(prn: str) -> Any:
     try:
         context = load_student_context(prn)
-        student = context["student"]
-        latest = context["latest"]
-        semesters = context["semesters"]
-        skills = context["skills"]
-
-        latest_subjects = latest["subjects"] if latest else []
-        focus_areas = derive_focus_areas(latest_subjects)
-
-        gemini_payload, gemini_error = fetch_gemini_recommendations(
-            student_name=student["name"],
-            prn=student["prn"],
-            twelfth_percentage=safe_float(student.get("twelfth_percentage")),
-            semesters=semesters,
-            skills=skills,
-            focus_areas=focus_areas,
-        )
+        predictor = get_predictor()
+        model = predictor.model_info()
 
-        gemini_required = os.getenv("GEMINI_REQUIRED", "false").lower() == "true"
-        if gemini_required and not gemini_payload:
-            return (
-                jsonify(
-                    {
-                        "error": "Gemini response is required but generation failed.",
-                        "details": gemini_error or "Unknown Gemini error",
-                    }
-                ),
-                502,
+        def build() -> Dict[str, Any]:
+            prediction = predictor.predict(
+                prediction_history(context["student"], context["semesters"])
             )
+            return {**prediction_payload(context["student"], prediction), "model": model}
 
-        payload = gemini_payload or fallback_improvement_payload(
-            student_name=student["name"],
-            focus_areas=focus_areas,
-            skills=skills,
+        return conditional_json(context, f"prediction-{model['version']}", build)
+    except StudentNotFoundError as exc:
+        return student_not_found_response(exc)
+    except Exception as exc:
+        return jsonify({"error": "Unable to predict performance", "details": str(exc)}), 500
+
+
+@app.post("/api/predictions")
+def batch_predictions() -> Any:
+    body = request.get_json(silent=True) or {}
+    prns = body.get("prns")
+    limit = int(os.getenv("PREDICTION_BATCH_LIMIT", "1000"))
+    if not isinstance(prns, list) or not all(isinstance(prn, str) for prn in prns):
+        return jsonify({"error": "Body must be a JSON object with a 'prns' list of strings"}), 400
+    if len(prns) > limit:
+        return jsonify({"error": f"At most {limit} PRNs per request"}), 400
+
+    requested = list(OrderedDict.fromkeys(normalize_prn(prn) for prn in prns))
+    try:
+        with get_connection() as connection:
+            with connection.cursor() as cursor:
+                bundles = fetch_student_bundles(cursor, requested)
+        found = [prn for prn in requested if prn in bundles]
+        predictor = get_predictor()
+        predictions = predictor.predict_many(
+            [prediction_history(*bundles[prn][:2]) for prn in found]
+        )
+        return jsonify(
+            {
+                "predictions": [
+                    prediction_payload(bundles[prn][0], prediction)
+                    for prn, prediction in zip(found, predictions)
+                ],
+                "missing": [prn for prn in requested if prn not in bundles],
+                "model": predictor.model_info(),
+            }
         )
+    except Exception as exc:
+        return jsonify({"error": "Unable to predict performance", "details": str(exc)}), 500
 
-        payload["student"] = {"prn": student["prn"], "name": student["name"]}
-        payload["ai_status"] = "gemini_success" if gemini_payload else "gemini_fallback"
-        payload["gemini_configured"] = bool(os.getenv("GEMINI_API_KEY", "").strip())
-        if gemini_error:
-            payload["ai_error"] = gemini_error
-        payload["sgpa_trend"] = [
-            {"semester": item["semester"], "sgpa": item["sgpa"]} for item in semesters
-        ]
-        payload["recommendations_started"] = len(payload.get("recommendations", []))
-        payload["skills_count"] = len(skills)
 
-        return jsonify(payload)
+OVERVIEW_SECTIONS = OrderedDict(
+    [
+        ("dashboard", build_dashboard_payload),
+        ("progress", build_progress_payload),
+        ("reports", build_reports_payload),
+        ("improvement", lambda context: build_improvement_payload(context)[0]),
+    ]
+)
+DEFAULT_OVERVIEW_FIELDS = ["dashboard", "progress", "reports"]
+
+
+def overview_fields(raw: str) -> Tuple[List[str], List[str]]:
+    requested = [field.strip().lower() for field in raw.split(",") if field.strip()]
+    requested = requested or DEFAULT_OVERVIEW_FIELDS
+    unknown = [field for field in requested if field not in OVERVIEW_SECTIONS]
+    return [field for field in OVERVIEW_SECTIONS if field in requested], unknown
+
+
+def unknown_overview_fields_payload(unknown: List[str]) -> Dict[str, Any]:
+    return {
+        "error": "Unknown overview fields",
+        "unknown": unknown,
+        "allowed": list(OVERVIEW_SECTIONS),
+    }
+
+
+@app.get("/api/student/<prn>/overview")
+def student_overview(prn: str) -> Any:
+    fields, unknown = overview_fields(request.args.get("fields", ""))
+    if unknown:
+        return jsonify(unknown_overview_fields_payload(unknown)), 400
+
+    try:
+        context = load_student_context(prn)
+        student = context["student"]
+
+        def build() -> Dict[str, Any]:
+            payload: Dict[str, Any] = {
+                "student": {"prn": student["prn"], "name": student["name"]},
+                "fields": fields,
+            }
+            for field in fields:
+                payload[field] = OVERVIEW_SECTIONS[field](context)
+            return payload
+
+        if "improvement" in fields:
+            # Gemini output is not determined by the context version alone.
+            return jsonify(build())
+        return conditional_json(context, "overview-" + ".".join(fields), build)
     except StudentNotFoundError as exc:
-        return (
-            jsonify(
-                {
-                    "error": "Student not found",
-                    "prn": exc.prn,
-                    "hint": "Use exact PRN from students table.",
-                    "suggestions": exc.suggestions,
-                }
-            ),
-            404,
-        )
+        return student_not_found_response(exc)
     except Exception as exc:
-        return jsonify({"error": "Unable to load improvement plan", "details": str(exc)}), 500
+        return jsonify({"error": "Unable to load overview", "details": str(exc)}), 500
+
+
+@app.before_request
+def start_request_timer() -> None:
+    if INSTRUMENTED:
+        g.request_started = time.perf_counter()
+
+
+# Registered before the other after_request hooks so it runs last and the
+# total includes compression. Streamed responses are timed up to the first
+# byte.
+@app.after_request
+def record_request_metrics(response: Any) -> Any:
+    if not INSTRUMENTED or "request_started" not in g:
+        return response
+    total = time.perf_counter() - g.request_started
+    spans = g.get("spans", {})
+    queries = g.get("db_queries", 0)
+    if SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = server_timing_header(spans, total, queries)
+    if METRICS_ENABLED:
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        _request_seconds.observe(total, endpoint, request.method)
+        _requests_total.inc(endpoint, request.method, str(response.status_code))
+        _request_db_queries.observe(queries, endpoint)
+        _request_db_seconds.observe(spans.get("db", 0.0), endpoint)
+        _request_serialize_seconds.observe(spans.get("serialize", 0.0), endpoint)
+    return response
+
+
+@app.after_request
+def report_query_count(response: Any) -> Any:
+    if "db_queries" in g:
+        response.headers["X-DB-Queries"] = str(g.db_queries)
+    return response
+
+
+_compressor = ResponseCompressor(
+    min_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+    gzip_level=int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+    brotli_quality=int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4")),
+)
+
+
+@app.after_request
+def compress_response(response: Any) -> Any:
+    if os.getenv("COMPRESSION_ENABLED", "true").strip().lower() != "true":
+        return response
+    return _compressor.apply(response, request.accept_encodings)
+
+
+CHANGE_LOG_TABLE = "change_log"
+_change_feed = ChangeFeed(
+    interval=float(os.getenv("CHANGE_FEED_INTERVAL", "2")),
+    batch_size=int(os.getenv("CHANGE_FEED_BATCH_SIZE", "1000")),
+    prune_interval=float(os.getenv("CHANGE_LOG_PRUNE_INTERVAL", "3600")),
+)
+
+
+def change_feed_enabled() -> bool:
+    return os.getenv("CHANGE_FEED_ENABLED", "false").strip().lower() == "true"
+
+
+def change_log_high_water() -> int:
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COALESCE(MAX(id), 0) AS high_water FROM {CHANGE_LOG_TABLE}")
+            return int(cursor.fetchone()["high_water"])
+
+
+def fetch_changes(after_id: int, skipped_ids: List[int], limit: int) -> List[Dict[str, Any]]:
+    sql = f"SELECT id, table_name, prn FROM {CHANGE_LOG_TABLE} WHERE id > %s"
+    args: List[Any] = [after_id]
+    if skipped_ids:
+        sql += f" OR id IN ({', '.join(['%s'] * len(skipped_ids))})"
+        args.extend(skipped_ids)
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(sql + " ORDER BY id LIMIT %s", [*args, limit])
+            return cursor.fetchall()
+
+
+def prune_change_log() -> int:
+    retention = int(os.getenv("CHANGE_LOG_RETENTION", "86400"))
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {CHANGE_LOG_TABLE} "
+                "WHERE changed_at < NOW(3) - INTERVAL %s SECOND LIMIT 50000",
+                (retention,),
+            )
+            return cursor.rowcount
+
+
+def fetch_rows_for_prns(
+    cursor: pymysql.cursors.Cursor, table: str, column: str, prns: List[str]
+) -> Dict[str, Any]:
+    placeholders = ", ".join(["%s"] * len(prns))
+    cursor.execute(f"SELECT prn, {column} FROM {table} WHERE prn IN ({placeholders})", prns)
+    return {row["prn"]: row[column] for row in cursor.fetchall()}
+
+
+def apply_changes(changes: Dict[str, Set[str]]) -> None:
+    # The rank and PRN indexes are patched in place from the changed rows, and
+    # every cached view of a changed student is dropped. The snapshot cannot be
+    # patched, so it is only marked for a reload.
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            if "students" in changes:
+                prns = sorted(changes["students"])
+                names = fetch_rows_for_prns(cursor, "students", "name", prns)
+                for prn in prns:
+                    _prn_index.observe(prn, names.get(prn))
+
+            changed_semesters = [table for table in SEMESTER_SUBJECTS if table in changes]
+            for sem_table in changed_semesters:
+                prns = sorted(changes[sem_table])
+                sgpas = fetch_rows_for_prns(cursor, sem_table, "sgpa", prns)
+                for prn in prns:
+                    _rank_index.observe(sem_table, prn, safe_float(sgpas.get(prn)))
+                _cohort_stats.invalidate(sem_table)
+
+            refresh = os.getenv("CHANGE_FEED_REFRESH_SUMMARY", "false").strip().lower() == "true"
+            if changed_semesters and refresh and table_exists(cursor, SUMMARY_TABLE):
+                refresh_summary(
+                    cursor,
+                    [table for table in SEMESTER_SUBJECTS if table_exists(cursor, table)],
+                    set().union(*(changes[sem_table] for sem_table in changed_semesters)),
+                )
+
+    for prn in set().union(*changes.values()):
+        invalidate_student(prn)
+    if snapshot_mode():
+        # Debounced by SNAPSHOT_MIN_RELOAD_INTERVAL, so steady writes do not
+        # re-read every table on each poll.
+        _snapshots.request_reload()
+
+
+def warm_up() -> None:
+    get_pool().prefill()
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            _schema_catalog.refresh(cursor, db_name())
+            if change_feed_enabled() and table_exists(cursor, CHANGE_LOG_TABLE):
+                # Taken before the caches load so nothing in between is missed.
+                _change_feed.start_from(change_log_high_water())
+            _prn_index.rebuild(lambda: fetch_student_names(cursor))
+            for sem_table in SEMESTER_SUBJECTS:
+                if table_exists(cursor, sem_table):
+                    _rank_index.rebuild(sem_table, lambda: fetch_semester_sgpas(cursor, sem_table))
+    if snapshot_mode():
+        snapshot = _snapshots.reload()
+        app.logger.info("Loaded student snapshot: %s", snapshot.stats())
+
+
+WARM_UP_RETRY_MAX = float(os.getenv("WARM_UP_RETRY_MAX", "60"))
+_warm_up_done = threading.Event()
+_warm_up_stats: Dict[str, Any] = {"attempts": 0, "last_error": None}
+
+
+def run_warm_up() -> None:
+    # Retries with capped exponential backoff: a database that is down at
+    # startup is picked up when it comes back instead of leaving the process
+    # on empty indexes until a restart. The timer and the feed start only
+    # once the first load has succeeded.
+    delay = 1.0
+    while True:
+        _warm_up_stats["attempts"] += 1
+        try:
+            warm_up()
+            break
+        except Exception as exc:
+            _warm_up_stats["last_error"] = str(exc)
+            app.logger.warning("Warm-up failed, retrying in %.0fs: %s", delay, exc)
+        time.sleep(delay)
+        delay = min(delay * 2, WARM_UP_RETRY_MAX)
+    _warm_up_stats["last_error"] = None
+    if snapshot_mode():
+        _snapshots.start_timer()
+    if change_feed_enabled():
+        _change_feed.start(fetch_changes, apply_changes, change_log_high_water, prune_change_log)
+    _warm_up_done.set()
+
+
+def warm_up_status() -> Dict[str, Any]:
+    return {"ready": _warm_up_done.is_set(), **_warm_up_stats}
+
+
+def wait_for_warm_up(timeout: Optional[float] = None) -> bool:
+    return _warm_up_done.wait(timeout)
+
+
+_background_started = False
+_background_lock = threading.Lock()
+
+
+def start_background_work() -> None:
+    # Once per process, from whichever entry point gets here first: launch of
+    # python backend/app.py, the async server, or the first request under a
+    # WSGI server (gunicorn --preload imports the app before forking, so
+    # nothing starts at import time). The warm-up runs on its own thread, so
+    # no request waits for it.
+    global _background_started
+    if _background_started:
+        return
+    with _background_lock:
+        if not _background_started:
+            install_signal_handlers()
+            threading.Thread(target=run_warm_up, name="warm-up", daemon=True).start()
+            _background_started = True
+
+
+@app.before_request
+def ensure_background_work() -> None:
+    start_background_work()
+
+
+_sighup_installed = False
+
+
+def install_signal_handlers() -> None:
+    # `kill -HUP <pid>` rebuilds the snapshot without restarting the server.
+    # Only the main thread may install handlers, so this runs both at import
+    # (a worker's main thread under gunicorn or flask run) and from
+    # start_background_work() (the main thread of a sync gunicorn worker,
+    # which resets signals after a --preload fork).
+    global _sighup_installed
+    if not snapshot_mode() or not hasattr(signal, "SIGHUP"):
+        return
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGHUP, reload_snapshot_in_background)
+        _sighup_installed = True
+
+
+install_signal_handlers()
 
 
 if __name__ == "__main__":
+    start_background_work()
     app.run(
         host=os.getenv("FLASK_HOST", "0.0.0.0"),
         port=int(os.getenv("FLASK_PORT", "5000")),
@@ -0,0 +1,447 @@
+import asyncio
+import os
+import ssl
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiomysql
+from quart import Quart, Response, g, has_request_context, jsonify, request
+
+import app as api
+from db_pool import PoolTimeoutError
+from gemini_client import AsyncGeminiClient
+from json_provider import FastJSONProvider
+from schema_catalog import COLUMNS_SQL, SchemaCatalog
+
+# Async route layer for the per-student endpoints. Payload building, caches
+# and indexes are shared with app.py; only the I/O differs. Background work
+# (warm-up, snapshot reloads, the change feed) keeps running on app.py's
+# threads and its synchronous pool.
+async_app = Quart(__name__)
+async_app.json = FastJSONProvider(
+    async_app, backend=os.getenv("JSON_PROVIDER", "auto").strip().lower()
+)
+
+_pool: Optional[aiomysql.Pool] = None
+_pool_lock = asyncio.Lock()
+_gemini_client: Optional[AsyncGeminiClient] = None
+# One refresh per stale index at a time; other requests wait for it.
+_refresh_locks: Dict[str, asyncio.Lock] = {}
+
+
+def pool_config() -> Dict[str, Any]:
+    config = api.db_config()
+    pool_config: Dict[str, Any] = {
+        "host": config["host"],
+        "port": config["port"],
+        "user": config["user"],
+        "password": config["password"],
+        "db": config["database"],
+        "charset": config["charset"],
+        "connect_timeout": config["connect_timeout"],
+        "autocommit": config["autocommit"],
+        "init_command": config["init_command"],
+        "minsize": int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+        "maxsize": int(os.getenv("ASYNC_DB_POOL_MAX_SIZE", "20")),
+        "pool_recycle": int(float(os.getenv("DB_POOL_RECYCLE", "300"))),
+    }
+    ssl_ca = os.getenv("DB_SSL_CA")
+    if ssl_ca:
+        pool_config["ssl"] = ssl.create_default_context(cafile=ssl_ca)
+    return pool_config
+
+
+async def get_pool() -> aiomysql.Pool:
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                _pool = await aiomysql.create_pool(**pool_config())
+    return _pool
+
+
+@asynccontextmanager
+async def pooled_connection() -> AsyncIterator[aiomysql.Connection]:
+    pool = await get_pool()
+    timeout = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+    try:
+        connection = await asyncio.wait_for(pool.acquire(), timeout)
+    except asyncio.TimeoutError:
+        raise PoolTimeoutError(timeout) from None
+    try:
+        yield connection
+    finally:
+        pool.release(connection)
+
+
+async def fetch_all(query: str, args: Any = None) -> List[Dict[str, Any]]:
+    if has_request_context():
+        g.db_queries = g.get("db_queries", 0) + 1
+    async with pooled_connection() as connection:
+        async with connection.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(query, args)
+            return list(await cursor.fetchall())
+
+
+def get_gemini_client() -> AsyncGeminiClient:
+    global _gemini_client
+    if _gemini_client is None:
+        _gemini_client = AsyncGeminiClient(
+            api_base=os.getenv(
+                "GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta"
+            ),
+            connect_timeout=float(os.getenv("GEMINI_CONNECT_TIMEOUT", "5")),
+            read_timeout=float(os.getenv("GEMINI_READ_TIMEOUT", "25")),
+            max_retries=int(os.getenv("GEMINI_MAX_RETRIES", "2")),
+            backoff_base=float(os.getenv("GEMINI_BACKOFF_BASE", "0.5")),
+            backoff_max=float(os.getenv("GEMINI_BACKOFF_MAX", "8")),
+            pool_size=int(os.getenv("ASYNC_GEMINI_POOL_SIZE", "100")),
+            # Shared with the sync client so both see the same outages.
+            breaker=api.get_gemini_client().breaker,
+        )
+    return _gemini_client
+
+
+async def refresh_if_stale(
+    key: str, is_stale: Callable[[], bool], refresh: Callable[[], Awaitable[None]]
+) -> None:
+    if not is_stale():
+        return
+    lock = _refresh_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        if is_stale():
+            await refresh()
+
+
+async def ensure_catalog() -> SchemaCatalog:
+    catalog = api._schema_catalog
+
+    async def refresh() -> None:
+        catalog.load_rows(await fetch_all(COLUMNS_SQL, (api.db_name(),)))
+
+    await refresh_if_stale("schema", catalog.is_stale, refresh)
+    return catalog
+
+
+async def ensure_rank_table(sem_table: str) -> None:
+    async def refresh() -> None:
+        rows = await fetch_all(f"SELECT prn, sgpa FROM {sem_table}")
+        api._rank_index.rebuild(
+            sem_table, lambda: [(row["prn"], api.safe_float(row["sgpa"])) for row in rows]
+        )
+
+    await refresh_if_stale(
+        f"rank:{sem_table}", lambda: api._rank_index.is_stale(sem_table), refresh
+    )
+
+
+async def fetch_prn_suggestions(prn: str, limit: int = 5) -> List[Dict[str, str]]:
+    async def refresh() -> None:
+        rows = await fetch_all("SELECT prn, name FROM students")
+        api._prn_index.rebuild(lambda: [(row["prn"], row["name"]) for row in rows])
+
+    await refresh_if_stale("prn_index", api._prn_index.is_stale, refresh)
+    return api._prn_index.suggest_loaded(prn, limit)
+
+
+def cached_rank(
+    catalog: SchemaCatalog, prn: str, sem_table: Optional[str], sgpa: Optional[float]
+) -> Tuple[Optional[int], Optional[int], Optional[float]]:
+    # Same answers as app.rank_for_semester once ensure_rank_table() ran.
+    if sem_table is None or sgpa is None or not catalog.has_table(sem_table):
+        return None, None, None
+    api._rank_index.observe(sem_table, prn, sgpa)
+    return api._rank_index.peek(sem_table, sgpa) or (None, None, None)
+
+
+async def fetch_student_context(normalized_prn: str) -> Dict[str, Any]:
+    catalog = await ensure_catalog()
+    bundle_rows = fetch_all(
+        api.bundle_select_sql(catalog) + "\nWHERE s.prn = %s", (normalized_prn,)
+    )
+    # The newest semester is almost every student's latest one. When its rank
+    # index is cold, load it next to the student's row instead of after it.
+    tables = [sem_table for sem_table in api.SEMESTER_SUBJECTS if catalog.has_table(sem_table)]
+    newest = tables[-1] if tables else None
+    uses_summary = api.summary_enabled() and catalog.has_table(api.SUMMARY_TABLE)
+    if newest is not None and not uses_summary and api._rank_index.is_stale(newest):
+        rows, _ = await asyncio.gather(bundle_rows, ensure_rank_table(newest))
+    else:
+        rows = await bundle_rows
+    if not rows:
+        raise api.StudentNotFoundError(
+            prn=normalized_prn, suggestions=await fetch_prn_suggestions(normalized_prn)
+        )
+
+    row = rows[0]
+    bundle = api.split_student_bundle(row)
+    summary = api.bundle_summary(row)
+    if summary is not None:
+        return api.assemble_context(bundle, api.summary_rank_lookup(summary), summary)
+    latest = bundle[1][-1] if bundle[1] else None
+    if latest and latest["sgpa"] is not None and catalog.has_table(latest["table"]):
+        await ensure_rank_table(latest["table"])
+    return api.assemble_context(
+        bundle, lambda sem_table, sgpa: cached_rank(catalog, normalized_prn, sem_table, sgpa)
+    )
+
+
+async def load_student_context(prn: str) -> Dict[str, Any]:
+    normalized_prn = api.normalize_prn(prn)
+    if api.snapshot_mode():
+        return api.snapshot_student_context(normalized_prn)
+    suggestions = api._missing_students.get(normalized_prn)
+    if suggestions is not None:
+        raise api.StudentNotFoundError(prn=normalized_prn, suggestions=suggestions)
+    try:
+        return await api._context_cache.get_or_load_async(
+            normalized_prn, lambda: fetch_student_context(normalized_prn)
+        )
+    except api.StudentNotFoundError as exc:
+        api._missing_students.set(normalized_prn, exc.suggestions)
+        raise
+
+
+async def request_gemini_plan(prompt: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    api_key = os.getenv("GEMINI_API_KEY", "").strip()
+    if not api_key:
+        return None, "GEMINI_API_KEY is not configured."
+    try:
+        payload = await get_gemini_client().generate_content(
+            api.gemini_model(), api_key, api.gemini_request_body(prompt)
+        )
+        return api.parse_gemini_plan(payload)
+    except Exception as exc:
+        return None, str(exc)
+
+
+async def fetch_gemini_recommendations(
+    inputs: Dict[str, Any], refresh: bool = False
+) -> Tuple[Optional[Dict[str, Any]], Optional[str], bool]:
+    prompt, model_name, cache_key = api.plan_request(inputs)
+    plan_store = api.get_plan_store()
+
+    if not refresh:
+        # SQLite lookups are short but still disk I/O, so they leave the loop.
+        cached = await asyncio.to_thread(plan_store.get, cache_key)
+        if cached is not None:
+            return cached, None, True
+
+    payload, error = await request_gemini_plan(prompt)
+    if payload is not None:
+        await asyncio.to_thread(plan_store.put, cache_key, payload, model_name)
+    return payload, error, False
+
+
+async def build_improvement_payload(
+    context: Dict[str, Any], refresh: bool = False
+) -> Tuple[Dict[str, Any], int]:
+    inputs = api.improvement_inputs(context)
+    gemini_payload, gemini_error, from_cache = await fetch_gemini_recommendations(
+        inputs, refresh=refresh
+    )
+    return api.complete_improvement_payload(
+        context, inputs, gemini_payload, gemini_error, from_cache
+    )
+
+
+def conditional_json(
+    context: Dict[str, Any], section: str, build: Callable[[], Dict[str, Any]]
+) -> Response:
+    tag = f"{section}-{context['version']}"
+    if request.if_none_match.contains_weak(tag):
+        response = Response("", status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(tag, weak=True)
+    max_age = int(os.getenv("STUDENT_CACHE_MAX_AGE", "0"))
+    response.headers["Cache-Control"] = f"private, max-age={max_age}, must-revalidate"
+    return response
+
+
+def student_not_found_response(exc: api.StudentNotFoundError) -> Any:
+    return jsonify(api.student_not_found_payload(exc)), 404
+
+
+async def student_section(
+    prn: str, section: str, build: Callable[[Dict[str, Any]], Dict[str, Any]], label: str
+) -> Any:
+    try:
+        context = await load_student_context(prn)
+        return conditional_json(context, section, lambda: build(context))
+    except api.StudentNotFoundError as exc:
+        return student_not_found_response(exc)
+    except Exception as exc:
+        return jsonify({"error": f"Unable to load {label}", "details": str(exc)}), 500
+
+
+@async_app.get("/api/health")
+async def health() -> Any:
+    status: Dict[str, Any] = {
+        "ok": True,
+        "service": "eduvision-student-api-async",
+        "database": "disconnected",
+        "db_name": api.db_name(),
+        "gemini_configured": bool(os.getenv("GEMINI_API_KEY", "").strip()),
+        "serving_mode": api.SERVING_MODE,
+    }
+    try:
+        rows = await fetch_all("SELECT 1 AS ok")
+        status["database"] = "connected" if rows and rows[0].get("ok") == 1 else "unknown"
+    except Exception as exc:
+        status["ok"] = False
+        status["database"] = "error"
+        status["details"] = str(exc)
+        return jsonify(status), 503
+
+    pool = await get_pool()
+    status["db_pool"] = {
+        "size": pool.size,
+        "idle": pool.freesize,
+        "in_use": pool.size - pool.freesize,
+        "min_size": pool.minsize,
+        "max_size": pool.maxsize,
+    }
+    status["context_cache"] = api._context_cache.stats()
+    status["missing_students"] = api._missing_students.stats()
+    status["rank_index"] = api._rank_index.stats()
+    status["prn_index"] = api._prn_index.stats()
+    status["plan_cache"] = api.get_plan_store().stats()
+    status["gemini_breaker"] = get_gemini_client().breaker.snapshot()
+    return jsonify(status)
+
+
+@async_app.get("/api/students/suggest")
+async def students_suggest() -> Any:
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "Query parameter 'q' is required"}), 400
+    try:
+        limit = min(max(int(request.args.get("limit", "5")), 1), 20)
+    except ValueError:
+        return jsonify({"error": "Query parameter 'limit' must be an integer"}), 400
+    try:
+        if api.snapshot_mode():
+            snapshot = api._snapshots.current()
+            suggestions = api._prn_index.suggest(query, snapshot.name_rows, limit)
+        else:
+            suggestions = await fetch_prn_suggestions(query, limit)
+        return jsonify({"query": query, "suggestions": suggestions})
+    except Exception as exc:
+        return jsonify({"error": "Unable to load suggestions", "details": str(exc)}), 500
+
+
+@async_app.get("/api/student/<prn>/dashboard")
+async def student_dashboard(prn: str) -> Any:
+    return await student_section(prn, "dashboard", api.build_dashboard_payload, "dashboard")
+
+
+@async_app.get("/api/student/<prn>/progress")
+async def student_progress(prn: str) -> Any:
+    return await student_section(prn, "progress", api.build_progress_payload, "progress")
+
+
+@async_app.get("/api/student/<prn>/reports")
+async def student_reports(prn: str) -> Any:
+    return await student_section(prn, "reports", api.build_reports_payload, "reports")
+
+
+@async_app.get("/api/student/<prn>/improvement")
+async def student_improvement(prn: str) -> Any:
+    # Always answers with the finished plan: waiting on Gemini no longer ties
+    # up a thread, so the mode=async job queue is not needed here.
+    try:
+        context = await load_student_context(prn)
+        refresh = request.args.get("refresh", "false").lower() in ("1", "true", "yes")
+        payload, status_code = await build_improvement_payload(context, refresh=refresh)
+        return jsonify(payload), status_code
+    except api.StudentNotFoundError as exc:
+        return student_not_found_response(exc)
+    except Exception as exc:
+        return jsonify({"error": "Unable to load improvement plan", "details": str(exc)}), 500
+
+
+@async_app.get("/api/student/<prn>/prediction")
+async def student_prediction(prn: str) -> Any:
+    try:
+        context = await load_student_context(prn)
+        predictor = api.get_predictor()
+        model = predictor.model_info()
+
+        def build() -> Dict[str, Any]:
+            prediction = predictor.predict(
+                api.prediction_history(context["student"], context["semesters"])
+            )
+            return {**api.prediction_payload(context["student"], prediction), "model": model}
+
+        return conditional_json(context, f"prediction-{model['version']}", build)
+    except api.StudentNotFoundError as exc:
+        return student_not_found_response(exc)
+    except Exception as exc:
+        return jsonify({"error": "Unable to predict performance", "details": str(exc)}), 500
+
+
+@async_app.get("/api/student/<prn>/overview")
+async def student_overview(prn: str) -> Any:
+    fields, unknown = api.overview_fields(request.args.get("fields", ""))
+    if unknown:
+        return jsonify(api.unknown_overview_fields_payload(unknown)), 400
+
+    try:
+        context = await load_student_context(prn)
+        student = context["student"]
+        improvement = None
+        if "improvement" in fields:
+            improvement = (await build_improvement_payload(context))[0]
+
+        def build() -> Dict[str, Any]:
+            payload: Dict[str, Any] = {
+                "student": {"prn": student["prn"], "name": student["name"]},
+                "fields": fields,
+            }
+            for field in fields:
+                if field == "improvement":
+                    payload[field] = improvement
+                else:
+                    payload[field] = api.OVERVIEW_SECTIONS[field](context)
+            return payload
+
+        if improvement is not None:
+            return jsonify(build())
+        return conditional_json(context, "overview-" + ".".join(fields), build)
+    except api.StudentNotFoundError as exc:
+        return student_not_found_response(exc)
+    except Exception as exc:
+        return jsonify({"error": "Unable to load overview", "details": str(exc)}), 500
+
+
+@async_app.after_request
+async def report_query_count(response: Response) -> Response:
+    if "db_queries" in g:
+        response.headers["X-DB-Queries"] = str(g.db_queries)
+    # Mirrors flask-cors' defaults in app.py for these GET endpoints.
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    response.headers["Access-Control-Expose-Headers"] = "X-DB-Queries, ETag"
+    return response
+
+
+@async_app.before_serving
+async def start_background_work() -> None:
+    api.start_background_work()
+
+
+@async_app.after_serving
+async def close_clients() -> None:
+    if _gemini_client is not None:
+        await _gemini_client.close()
+    if _pool is not None:
+        _pool.close()
+        await _pool.wait_closed()
+
+
+if __name__ == "__main__":
+    async_app.run(
+        host=os.getenv("FLASK_HOST", "0.0.0.0"),
+        port=int(os.getenv("ASYNC_PORT", "5001")),
+        debug=os.getenv("FLASK_DEBUG", "false").lower() == "true",
+    )
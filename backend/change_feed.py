@@ -0,0 +1,136 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+# (after_id, skipped_ids, limit) -> rows with id, table_name and prn, ordered by id.
+ChangeLoader = Callable[[int, List[int], int], List[Dict[str, Any]]]
+ChangeHandler = Callable[[Dict[str, Set[str]]], None]
+MAX_TRACKED_GAPS = 10_000
+
+
+class ChangeFeed:
+    def __init__(
+        self,
+        interval: float = 2.0,
+        batch_size: int = 1000,
+        gap_grace: float = 30.0,
+        prune_interval: float = 3600.0,
+    ):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.gap_grace = gap_grace
+        self.prune_interval = prune_interval
+        self.high_water: Optional[int] = None
+        # Ids below the high-water mark that were not visible yet: a
+        # transaction that took its AUTO_INCREMENT id earlier can commit after
+        # a later one. They are asked for again until gap_grace runs out
+        # (rolled-back inserts leave permanent gaps).
+        self._gaps: Dict[int, float] = {}
+        self._pruned_at = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Any] = {
+            "polls": 0,
+            "entries": 0,
+            "batches_applied": 0,
+            "prns_invalidated": 0,
+            "late_entries": 0,
+            "failed_polls": 0,
+            "last_error": None,
+            "last_change_at": None,
+        }
+
+    def poll(self, loader: ChangeLoader, handler: ChangeHandler) -> int:
+        if self.high_water is None:
+            raise RuntimeError("ChangeFeed.start_from() must be called before polling")
+        rows = loader(self.high_water, sorted(self._gaps), self.batch_size)
+        now = time.monotonic()
+        high_water = self.high_water
+        gaps = dict(self._gaps)
+        changes: Dict[str, Set[str]] = {}
+        late = 0
+        for row in rows:
+            entry_id = int(row["id"])
+            changes.setdefault(row["table_name"], set()).add(row["prn"])
+            if gaps.pop(entry_id, None) is not None:
+                late += 1
+            elif entry_id > high_water:
+                for missing in range(high_water + 1, min(entry_id, high_water + MAX_TRACKED_GAPS)):
+                    gaps[missing] = now
+                high_water = entry_id
+        gaps = {entry_id: seen for entry_id, seen in gaps.items() if now - seen < self.gap_grace}
+
+        # Advance only after the handler succeeded so a failed batch is retried.
+        if changes:
+            handler(changes)
+        self.high_water = high_water
+        self._gaps = gaps
+        with self._lock:
+            self._stats["polls"] += 1
+            self._stats["entries"] += len(rows)
+            self._stats["late_entries"] += late
+            if changes:
+                self._stats["batches_applied"] += 1
+                self._stats["prns_invalidated"] += len(set().union(*changes.values()))
+                self._stats["last_change_at"] = time.time()
+        return len(rows)
+
+    def start_from(self, high_water: int) -> None:
+        self.high_water = high_water
+        self._gaps = {}
+
+    def start(
+        self,
+        loader: ChangeLoader,
+        handler: ChangeHandler,
+        initial_high_water: Callable[[], int],
+        pruner: Optional[Callable[[], int]] = None,
+    ) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(loader, handler, initial_high_water, pruner),
+            name="change-feed",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run(
+        self,
+        loader: ChangeLoader,
+        handler: ChangeHandler,
+        initial_high_water: Callable[[], int],
+        pruner: Optional[Callable[[], int]],
+    ) -> None:
+        while True:
+            try:
+                if self.high_water is None:
+                    # Start at the current end of the log: caches are filled
+                    # after this point, so older entries are already reflected.
+                    self.start_from(initial_high_water())
+                # Keep reading while full batches come back, then wait.
+                while self.poll(loader, handler) >= self.batch_size:
+                    pass
+                now = time.monotonic()
+                if pruner is not None and now - self._pruned_at >= self.prune_interval:
+                    self._pruned_at = now
+                    pruner()
+                with self._lock:
+                    self._stats["last_error"] = None
+            except Exception as exc:
+                with self._lock:
+                    self._stats["failed_polls"] += 1
+                    self._stats["last_error"] = str(exc)
+            time.sleep(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": True,
+                "running": self._thread is not None,
+                "interval_seconds": self.interval,
+                "high_water": self.high_water,
+                "pending_gaps": len(self._gaps),
+                **self._stats,
+            }
@@ -0,0 +1,136 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+PERCENTILES = (10, 25, 50, 75, 90)
+SGPA_BIN_EDGES = np.round(np.arange(0.0, 10.01, 0.5), 2)
+
+
+def describe(values: np.ndarray) -> Dict[str, Any]:
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return {"count": 0, "mean": None, "median": None, "std": None, "min": None, "max": None}
+    quantiles = np.percentile(values, PERCENTILES)
+    return {
+        "count": int(values.size),
+        "mean": round(float(values.mean()), 2),
+        "median": round(float(quantiles[2]), 2),
+        "std": round(float(values.std()), 2),
+        "min": round(float(values.min()), 2),
+        "max": round(float(values.max()), 2),
+        "percentiles": {f"p{p}": round(float(q), 2) for p, q in zip(PERCENTILES, quantiles)},
+    }
+
+
+def grade_distribution(
+    values: np.ndarray, grade_bands: Sequence[Tuple[float, str]], floor_grade: str
+) -> Dict[str, int]:
+    values = values[~np.isnan(values)]
+    ascending = sorted(grade_bands)
+    thresholds = np.array([threshold for threshold, _ in ascending])
+    labels = [floor_grade, *[label for _, label in ascending]]
+    counts = np.bincount(np.searchsorted(thresholds, values, side="right"), minlength=len(labels))
+    return {label: int(counts[index]) for index, label in reversed(list(enumerate(labels)))}
+
+
+def sgpa_histogram(values: np.ndarray) -> Dict[str, List[float]]:
+    values = values[~np.isnan(values)]
+    counts, edges = np.histogram(values, bins=SGPA_BIN_EDGES)
+    return {"edges": [float(edge) for edge in edges], "counts": [int(count) for count in counts]}
+
+
+def compute_semester_stats(
+    columns: Dict[str, np.ndarray],
+    sgpa: np.ndarray,
+    grade_bands: Sequence[Tuple[float, str]],
+    floor_grade: str,
+) -> Dict[str, Any]:
+    return {
+        "students": int(sgpa.size),
+        "sgpa": {**describe(sgpa), "histogram": sgpa_histogram(sgpa)},
+        "subjects": {
+            key: {
+                **describe(values),
+                "grades": grade_distribution(values, grade_bands, floor_grade),
+            }
+            for key, values in columns.items()
+        },
+    }
+
+
+class CohortStatsCache:
+    def __init__(self, check_interval: float = 30.0):
+        self.check_interval = check_interval
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # One refresh per table at a time; the dictionary lock is only held
+        # for lookups and stores, never across the checksum or the compute.
+        self._refresh_locks: Dict[str, threading.Lock] = {}
+        self._invalidations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "recomputes": 0}
+
+    def _fresh(self, sem_table: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(sem_table)
+        if entry is not None and time.monotonic() - entry["checked_at"] < self.check_interval:
+            self._stats["hits"] += 1
+            return entry["stats"]
+        return None
+
+    def get(
+        self,
+        sem_table: str,
+        fingerprint: Callable[[], Any],
+        compute: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        with self._lock:
+            stats = self._fresh(sem_table)
+            if stats is not None:
+                return stats
+            refresh_lock = self._refresh_locks.setdefault(sem_table, threading.Lock())
+
+        with refresh_lock:
+            with self._lock:
+                # Another request may have refreshed the table while this one waited.
+                stats = self._fresh(sem_table)
+                if stats is not None:
+                    return stats
+                entry = self._entries.get(sem_table)
+                generation = self._invalidations.get(sem_table, 0)
+
+            checked_at = time.monotonic()
+            current = fingerprint()
+            if entry is not None and entry["fingerprint"] == current:
+                with self._lock:
+                    entry["checked_at"] = checked_at
+                    self._stats["hits"] += 1
+                return entry["stats"]
+
+            stats = compute()
+            with self._lock:
+                # Not stored if invalidate() ran meanwhile; the next request recomputes.
+                if self._invalidations.get(sem_table, 0) == generation:
+                    self._entries[sem_table] = {
+                        "fingerprint": current,
+                        "checked_at": checked_at,
+                        "stats": stats,
+                    }
+                self._stats["recomputes"] += 1
+            return stats
+
+    def invalidate(self, sem_table: Optional[str] = None) -> None:
+        with self._lock:
+            # Every table ever refreshed has a lock entry, in flight or not.
+            tables = set(self._refresh_locks) if sem_table is None else {sem_table}
+            for table in tables:
+                self._invalidations[table] = self._invalidations.get(table, 0) + 1
+                self._entries.pop(table, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "check_interval_seconds": self.check_interval,
+                "tables": sorted(self._entries),
+                **self._stats,
+            }
@@ -0,0 +1,85 @@
+import gzip
+import threading
+from typing import Any, Dict, List, Optional
+
+from flask import Response
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional codec
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = frozenset(
+    {
+        "application/json",
+        "application/javascript",
+        "text/css",
+        "text/csv",
+        "text/html",
+        "text/javascript",
+        "text/plain",
+    }
+)
+
+
+class ResponseCompressor:
+    def __init__(self, min_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._lock = threading.Lock()
+        self._stats = {"compressed": 0, "skipped": 0, "bytes_in": 0, "bytes_out": 0}
+
+    def encodings(self) -> List[str]:
+        return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+    def negotiate(self, accept_encodings: Any) -> Optional[str]:
+        best, best_quality = None, 0.0
+        for encoding in self.encodings():
+            quality = accept_encodings.quality(encoding)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def compress(self, data: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+    def apply(self, response: Response, accept_encodings: Any) -> Response:
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        data = response.get_data()
+        encoding = self.negotiate(accept_encodings)
+        if encoding is None or len(data) < self.min_size:
+            with self._lock:
+                self._stats["skipped"] += 1
+            return response
+
+        body = self.compress(data, encoding)
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+        with self._lock:
+            self._stats["compressed"] += 1
+            self._stats["bytes_in"] += len(data)
+            self._stats["bytes_out"] += len(body)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            bytes_in = self._stats["bytes_in"]
+            return {
+                "encodings": self.encodings(),
+                "min_size": self.min_size,
+                "ratio": round(self._stats["bytes_out"] / bytes_in, 4) if bytes_in else None,
+                **self._stats,
+            }
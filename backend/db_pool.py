@@ -0,0 +1,201 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+import pymysql
+
+
+class PoolTimeoutError(Exception):
+    def __init__(self, timeout: float):
+        super().__init__(f"Timed out after {timeout}s waiting for a database connection")
+        self.timeout = timeout
+
+
+class PooledConnection:
+    def __init__(self, pool: "ConnectionPool", raw: pymysql.connections.Connection, created_at: float):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._released = False
+        self._discard = False
+
+    @property
+    def raw(self) -> pymysql.connections.Connection:
+        return self._raw
+
+    def invalidate(self) -> None:
+        self._discard = True
+
+    def close(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._pool._release(self._raw, self._created_at, self._discard)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is not None:
+            if isinstance(exc, (pymysql.err.OperationalError, pymysql.err.InterfaceError)):
+                self._discard = True
+            elif not self._discard:
+                try:
+                    self._raw.rollback()
+                except Exception:
+                    self._discard = True
+        self.close()
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        connect: Callable[[], pymysql.connections.Connection],
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 5.0,
+        idle_recycle: float = 300.0,
+        ping_on_checkout: bool = True,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._connect = connect
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_recycle = idle_recycle
+        self.ping_on_checkout = ping_on_checkout
+
+        # Idle entries are (connection, created_at, returned_at); used LIFO so
+        # the warmest connection is handed out first and cold ones age out.
+        self._idle: Deque[Tuple[pymysql.connections.Connection, float, float]] = deque()
+        self._size = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            "created": 0,
+            "closed": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "recycled": 0,
+            "ping_failures": 0,
+            "discarded": 0,
+        }
+
+    def prefill(self) -> None:
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                raw = self._open()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            now = time.monotonic()
+            with self._cond:
+                self._idle.append((raw, now, now))
+                self._cond.notify()
+
+    def connection(self) -> PooledConnection:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            entry = self._checkout(deadline)
+            if entry is None:
+                try:
+                    raw = self._open()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                return PooledConnection(self, raw, time.monotonic())
+
+            raw, created_at, returned_at = entry
+            now = time.monotonic()
+            if self.idle_recycle > 0 and now - returned_at > self.idle_recycle:
+                self._drop(raw, "recycled")
+                continue
+            if self.ping_on_checkout:
+                try:
+                    raw.ping(reconnect=False)
+                except Exception:
+                    self._drop(raw, "ping_failures")
+                    continue
+            return PooledConnection(self, raw, created_at)
+
+    def close(self) -> None:
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+        for raw, _, _ in idle:
+            self._drop(raw, "closed")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            idle = len(self._idle)
+            size = self._size
+            counters = dict(self._stats)
+        return {
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            **counters,
+        }
+
+    def _checkout(
+        self, deadline: float
+    ) -> Optional[Tuple[pymysql.connections.Connection, float, float]]:
+        with self._cond:
+            waited = False
+            while True:
+                if self._idle:
+                    self._stats["checkouts"] += 1
+                    return self._idle.pop()
+                if self._size < self.max_size:
+                    self._size += 1
+                    self._stats["checkouts"] += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeoutError(self.timeout)
+                if not waited:
+                    self._stats["waits"] += 1
+                    waited = True
+                self._cond.wait(remaining)
+
+    def _open(self) -> pymysql.connections.Connection:
+        raw = self._connect()
+        with self._cond:
+            self._stats["created"] += 1
+        return raw
+
+    def _drop(self, raw: pymysql.connections.Connection, reason: str) -> None:
+        try:
+            raw.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._stats[reason] += 1
+            self._cond.notify()
+
+    def _release(
+        self, raw: pymysql.connections.Connection, created_at: float, discard: bool
+    ) -> None:
+        if discard or not raw.open:
+            self._drop(raw, "discarded")
+            return
+        with self._cond:
+            self._idle.append((raw, created_at, time.monotonic()))
+            self._cond.notify()
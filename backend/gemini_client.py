@@ -0,0 +1,237 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - only the async server needs it
+    aiohttp = None
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, retry_in: float):
+        super().__init__(f"Gemini circuit breaker is open; retrying in {retry_in:.1f}s")
+        self.retry_in = retry_in
+
+
+class GeminiHTTPError(Exception):
+    def __init__(self, status_code: int, body: str):
+        super().__init__(f"Gemini returned HTTP {status_code}: {body[:200]}")
+        self.status_code = status_code
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self._stats = {"opened": 0, "rejected": 0}
+
+    def before_call(self) -> bool:
+        # Returns True when this call holds the half-open trial slot; only
+        # that caller may release it, so a call admitted while the breaker was
+        # closed cannot finish late and let a second trial through.
+        with self._lock:
+            if self._state == "closed":
+                return False
+            elapsed = time.monotonic() - self._opened_at
+            if self._state == "open" and elapsed >= self.reset_timeout:
+                self._state = "half_open"
+            if self._state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self._stats["rejected"] += 1
+            raise CircuitOpenError(max(0.0, self.reset_timeout - elapsed))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                if self._state != "open":
+                    self._stats["opened"] += 1
+                self._state = "open"
+                self._opened_at = time.monotonic()
+
+    def release(self, trial: bool) -> None:
+        if not trial:
+            return
+        with self._lock:
+            self._trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._state
+            if state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                state = "half_open"
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout_seconds": self.reset_timeout,
+                **self._stats,
+            }
+
+
+class GeminiClient:
+    def __init__(
+        self,
+        api_base: str = "https://generativelanguage.googleapis.com/v1beta",
+        connect_timeout: float = 5.0,
+        read_timeout: float = 25.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        pool_size: int = 10,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.api_base = api_base.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def generate_content(self, model: str, api_key: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        trial = self.breaker.before_call()
+        try:
+            return self._post_with_retries(
+                f"{self.api_base}/models/{model}:generateContent", api_key, body
+            )
+        finally:
+            self.breaker.release(trial)
+
+    def _post_with_retries(self, url: str, api_key: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        attempt = 0
+        while True:
+            retry_after: Optional[float] = None
+            try:
+                response = self.session.post(
+                    url, params={"key": api_key}, json=body, timeout=self.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                error: Exception = exc
+            else:
+                if response.status_code < 400:
+                    self.breaker.record_success()
+                    return response.json()
+                error = GeminiHTTPError(response.status_code, response.text)
+                if response.status_code not in RETRYABLE_STATUSES:
+                    # Request-level errors (bad key, bad prompt) say nothing
+                    # about Gemini's health, so they do not trip the breaker.
+                    raise error
+                retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+
+            if attempt >= self.max_retries:
+                self.breaker.record_failure()
+                raise error
+            time.sleep(self._backoff(attempt, retry_after))
+            attempt += 1
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2**attempt)))
+
+
+class AsyncGeminiClient:
+    # Same retry, backoff and breaker behaviour as GeminiClient, awaited on
+    # the event loop instead of blocking a thread.
+    def __init__(
+        self,
+        api_base: str = "https://generativelanguage.googleapis.com/v1beta",
+        connect_timeout: float = 5.0,
+        read_timeout: float = 25.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        pool_size: int = 100,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        if aiohttp is None:
+            raise RuntimeError("The async server needs aiohttp (pip install aiohttp)")
+        self.api_base = api_base.rstrip("/")
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self.breaker = breaker or CircuitBreaker()
+        # Created on first use: a session belongs to the loop it was made on.
+        self.session: Optional["aiohttp.ClientSession"] = None
+
+    async def generate_content(
+        self, model: str, api_key: str, body: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        trial = self.breaker.before_call()
+        try:
+            return await self._post_with_retries(
+                f"{self.api_base}/models/{model}:generateContent", api_key, body
+            )
+        finally:
+            self.breaker.release(trial)
+
+    async def _post_with_retries(
+        self, url: str, api_key: str, body: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size), timeout=self.timeout
+            )
+        attempt = 0
+        while True:
+            retry_after: Optional[float] = None
+            try:
+                async with self.session.post(url, params={"key": api_key}, json=body) as response:
+                    if response.status < 400:
+                        self.breaker.record_success()
+                        return await response.json(content_type=None)
+                    error: Exception = GeminiHTTPError(response.status, await response.text())
+                    if response.status not in RETRYABLE_STATUSES:
+                        raise error
+                    retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+                error = exc
+
+            if attempt >= self.max_retries:
+                self.breaker.record_failure()
+                raise error
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+            attempt += 1
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2**attempt)))
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
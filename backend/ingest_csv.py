@@ -0,0 +1,371 @@
+import argparse
+import csv
+import json
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from student_records import SEMESTER_SUBJECTS, TWELFTH_COLUMNS, normalize_prn, open_connection
+
+DEFAULT_CSV = Path(__file__).resolve().parent.parent / "datasets" / "student_academic_dataset.csv"
+
+TWELFTH_CSV_COLUMNS = {
+    "physics": "Physics",
+    "chemistry": "Chemistry",
+    "mathematics": "Mathematics",
+    "english": "English",
+    "computer_science": "Computer_Science",
+}
+
+SEMESTER_CSV_COLUMNS: Dict[str, List[str]] = {
+    "sem1": ["Sem1_SME", "Sem1_BEE", "Sem1_Maths1", "Sem1_Chemistry", "Sem1_PPS"],
+    "sem2": ["Sem2_Mechanics", "Sem2_Graphics", "Sem2_Electronics", "Sem2_Physics", "Sem2_Maths2"],
+    "sem3": ["Sem3_DiscreteMath", "Sem3_DataStructures", "Sem3_OOP", "Sem3_Graphics", "Sem3_OS"],
+    "sem4": ["Sem4_DSA", "Sem4_SoftwareEngineering", "Sem4_Statistics", "Sem4_IoT", "Sem4_MIS"],
+    "sem5": ["Sem5_AI", "Sem5_DBMS", "Sem5_WebTech", "Sem5_PatternRecognition", "Sem5_CN"],
+    "sem6": ["Sem6_CyberSecurity", "Sem6_DataScience", "Sem6_ANN", "Sem6_CloudComputing"],
+}
+
+MAX_SGPA = 9.99
+
+
+class RowError(Exception):
+    pass
+
+
+class StudentRecord:
+    def __init__(
+        self,
+        prn: str,
+        name: str,
+        twelfth: Optional[Tuple[Any, ...]],
+        semesters: Dict[str, Tuple[Any, ...]],
+        skills: List[str],
+        derived: Set[str],
+    ):
+        self.prn = prn
+        self.name = name
+        self.twelfth = twelfth
+        self.semesters = semesters
+        self.skills = skills
+        # Tables whose last column (percentage or SGPA) was computed from the
+        # marks because the file had none.
+        self.derived = derived
+
+
+def parse_mark(row: Dict[str, str], column: str) -> int:
+    raw = (row.get(column) or "").strip()
+    try:
+        value = float(raw)
+    except ValueError:
+        raise RowError(f"{column}: expected a number, got {raw!r}")
+    if not 0 <= value <= 100 or value != int(value):
+        raise RowError(f"{column}: {raw} is not a whole mark between 0 and 100")
+    return int(value)
+
+
+def parse_optional_float(
+    row: Dict[str, str], column: str, upper: float
+) -> Optional[float]:
+    raw = (row.get(column) or "").strip()
+    if not raw:
+        return None
+    try:
+        value = float(raw)
+    except ValueError:
+        raise RowError(f"{column}: expected a number, got {raw!r}")
+    if not 0 <= value <= upper:
+        raise RowError(f"{column}: {raw} is outside 0-{upper}")
+    return value
+
+
+def filled(row: Dict[str, str], columns: List[str]) -> int:
+    return sum(1 for column in columns if (row.get(column) or "").strip())
+
+
+def parse_skills(raw: str) -> List[str]:
+    skills: List[str] = []
+    for skill in (raw or "").split(","):
+        skill = skill.strip()
+        if not skill:
+            continue
+        if len(skill) > 100:
+            raise RowError(f"Skills: {skill[:20]!r}... is longer than 100 characters")
+        if skill not in skills:
+            skills.append(skill)
+    return skills
+
+
+def parse_row(row: Dict[str, str], semester_columns: Dict[str, List[str]]) -> StudentRecord:
+    prn = normalize_prn(row.get("PRN") or "")
+    name = (row.get("Name") or "").strip()
+    if not prn or len(prn) > 12:
+        raise RowError(f"PRN: {prn!r} must be 1-12 characters")
+    if not name or len(name) > 100:
+        raise RowError("Name: must be 1-100 characters")
+
+    derived: Set[str] = set()
+    twelfth = None
+    twelfth_columns = list(TWELFTH_CSV_COLUMNS.values())
+    present = filled(row, twelfth_columns)
+    if present:
+        if present < len(twelfth_columns):
+            raise RowError("12th marks: some subjects are missing")
+        marks = [parse_mark(row, column) for column in twelfth_columns]
+        percentage = parse_optional_float(row, "Percentage", 100)
+        if percentage is None:
+            percentage = round(sum(marks) / len(marks), 2)
+            derived.add("marks_12th")
+        twelfth = (prn, *marks, percentage)
+
+    semesters = {}
+    for sem_table, columns in semester_columns.items():
+        present = filled(row, columns)
+        if not present:
+            continue
+        if present < len(columns):
+            raise RowError(f"{sem_table}: some subjects are missing")
+        marks = [parse_mark(row, column) for column in columns]
+        sgpa = parse_optional_float(row, f"{sem_table.capitalize()}_SGPA", 10)
+        if sgpa is None:
+            sgpa = round(sum(marks) / len(marks) / 10, 2)
+            derived.add(sem_table)
+        semesters[sem_table] = (prn, *marks, min(sgpa, MAX_SGPA))
+
+    skills = parse_skills(row.get("Skills", ""))
+    return StudentRecord(prn, name, twelfth, semesters, skills, derived)
+
+
+def upsert_sql(table: str, columns: List[str], keep_stored: Sequence[str] = ()) -> str:
+    # keep_stored columns only fill a new row: a value derived from the marks
+    # never replaces one already in the table.
+    updates = ", ".join(
+        f"{column} = COALESCE({column}, VALUES({column}))"
+        if column in keep_stored
+        else f"{column} = VALUES({column})"
+        for column in columns[1:]
+    )
+    placeholders = ", ".join(["%s"] * len(columns))
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+        f"ON DUPLICATE KEY UPDATE {updates}"
+    )
+
+
+def iter_batches(
+    path: str, batch_size: int, summary: Dict[str, Any]
+) -> Iterator[List[StudentRecord]]:
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        reader = csv.DictReader(handle)
+        header = reader.fieldnames or []
+        missing = [column for column in ("PRN", "Name") if column not in header]
+        if missing:
+            raise SystemExit(f"{path}: missing required columns {missing}")
+        semester_columns = {
+            sem_table: columns
+            for sem_table, columns in SEMESTER_CSV_COLUMNS.items()
+            if all(column in header for column in columns)
+        }
+        summary["semesters"] = list(semester_columns)
+
+        batch: Dict[str, StudentRecord] = {}
+        for row in reader:
+            summary["rows_read"] += 1
+            try:
+                record = parse_row(row, semester_columns)
+            except RowError as exc:
+                summary["rows_rejected"] += 1
+                if len(summary["errors"]) < 20:
+                    summary["errors"].append({"line": reader.line_num, "error": str(exc)})
+                continue
+            # A PRN repeated inside one batch keeps its last row, matching
+            # what the upsert would do across batches.
+            batch[record.prn] = record
+            if len(batch) >= batch_size:
+                yield list(batch.values())
+                batch = {}
+        if batch:
+            yield list(batch.values())
+
+
+def comparable(values: Sequence[Any]) -> Tuple[Any, ...]:
+    # DECIMAL columns come back as Decimal; compare them at their two places.
+    return tuple(
+        round(float(value), 2) if isinstance(value, (float, Decimal)) else value
+        for value in values
+    )
+
+
+def fetch_stored(
+    cursor: Any, table: str, columns: List[str], prns: List[str]
+) -> Dict[str, Tuple[Any, ...]]:
+    placeholders = ", ".join(["%s"] * len(prns))
+    cursor.execute(
+        f"SELECT {', '.join(columns)} FROM {table} WHERE prn IN ({placeholders})", prns
+    )
+    return {row["prn"]: comparable([row[column] for column in columns]) for row in cursor}
+
+
+def changed_rows(
+    cursor: Any,
+    table: str,
+    columns: List[str],
+    rows: List[Tuple[Any, ...]],
+    derived_prns: Set[str],
+) -> Tuple[List[Tuple[Any, ...]], List[Tuple[Any, ...]]]:
+    # Split into (read from the file, derived last column) and drop rows that
+    # match what is stored, so a re-run does not fire the update triggers.
+    if not rows:
+        return [], []
+    stored = fetch_stored(cursor, table, columns, [row[0] for row in rows])
+    given: List[Tuple[Any, ...]] = []
+    computed: List[Tuple[Any, ...]] = []
+    for row in rows:
+        current = stored.get(row[0])
+        wanted = comparable(row)
+        if row[0] in derived_prns:
+            if current is not None and current[-1] is not None:
+                wanted = wanted[:-1] + current[-1:]
+            if wanted != current:
+                computed.append(row)
+        elif wanted != current:
+            given.append(row)
+    return given, computed
+
+
+def write_rows(
+    cursor: Any,
+    table: str,
+    columns: List[str],
+    rows: List[Tuple[Any, ...]],
+    derived_prns: Set[str],
+) -> Set[str]:
+    given, computed = changed_rows(cursor, table, columns, rows, derived_prns)
+    if given:
+        cursor.executemany(upsert_sql(table, columns), given)
+    if computed:
+        cursor.executemany(upsert_sql(table, columns, keep_stored=columns[-1:]), computed)
+    return {row[0] for row in given + computed}
+
+
+def replace_skills(cursor: Any, records: List[StudentRecord]) -> Set[str]:
+    prns = [record.prn for record in records]
+    placeholders = ", ".join(["%s"] * len(prns))
+    cursor.execute(
+        f"SELECT prn, skill_name FROM student_skills WHERE prn IN ({placeholders})", prns
+    )
+    stored: Dict[str, List[str]] = {}
+    for row in cursor:
+        stored.setdefault(row["prn"], []).append(row["skill_name"])
+    stale = [
+        record for record in records if sorted(stored.get(record.prn, [])) != sorted(record.skills)
+    ]
+    if not stale:
+        return set()
+    stale_prns = [record.prn for record in stale]
+    placeholders = ", ".join(["%s"] * len(stale_prns))
+    cursor.execute(f"DELETE FROM student_skills WHERE prn IN ({placeholders})", stale_prns)
+    skill_rows = [(record.prn, skill) for record in stale for skill in record.skills]
+    if skill_rows:
+        cursor.executemany(
+            "INSERT INTO student_skills (prn, skill_name) VALUES (%s, %s)", skill_rows
+        )
+    return set(stale_prns)
+
+
+def load_batch(connection: Any, records: List[StudentRecord]) -> int:
+    # Returns how many students had at least one row written.
+    changed: Set[str] = set()
+    with connection.cursor() as cursor:
+        changed |= write_rows(
+            cursor,
+            "students",
+            ["prn", "name"],
+            [(record.prn, record.name) for record in records],
+            set(),
+        )
+        changed |= write_rows(
+            cursor,
+            "marks_12th",
+            ["prn", *TWELFTH_COLUMNS, "percentage"],
+            [record.twelfth for record in records if record.twelfth],
+            {record.prn for record in records if "marks_12th" in record.derived},
+        )
+        for sem_table, subject_columns in SEMESTER_SUBJECTS.items():
+            changed |= write_rows(
+                cursor,
+                sem_table,
+                ["prn", *subject_columns, "sgpa"],
+                [
+                    record.semesters[sem_table]
+                    for record in records
+                    if sem_table in record.semesters
+                ],
+                {record.prn for record in records if sem_table in record.derived},
+            )
+        changed |= replace_skills(cursor, records)
+    return len(changed)
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {
+        "rows_read": 0,
+        "rows_rejected": 0,
+        "students_loaded": 0,
+        "students_changed": 0,
+        "batches": 0,
+        "errors": [],
+    }
+    started = time.monotonic()
+    connection = None if args.dry_run else open_connection()
+    try:
+        for records in iter_batches(args.csv, args.batch_size, summary):
+            if connection is not None:
+                connection.begin()
+                try:
+                    summary["students_changed"] += load_batch(connection, records)
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    raise
+            summary["students_loaded"] += len(records)
+            summary["batches"] += 1
+            if args.progress_every and summary["batches"] % args.progress_every == 0:
+                print(json.dumps({"progress": summary["students_loaded"]}), flush=True)
+    finally:
+        if connection is not None:
+            connection.close()
+
+    elapsed = time.monotonic() - started
+    summary["dry_run"] = args.dry_run
+    summary["elapsed_seconds"] = round(elapsed, 2)
+    summary["students_per_second"] = (
+        round(summary["students_loaded"] / elapsed, 1) if elapsed else None
+    )
+    return summary
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Load the student academic dataset CSV into MySQL (idempotent upserts)."
+    )
+    parser.add_argument(
+        "--csv",
+        default=str(DEFAULT_CSV),
+        help="path to the dataset CSV",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="students written per transaction"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="validate the file without writing to MySQL"
+    )
+    parser.add_argument(
+        "--progress-every", type=int, default=50, help="print progress every N batches (0 = off)"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(parse_args()), indent=2))
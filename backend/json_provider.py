@@ -0,0 +1,52 @@
+import time
+from typing import Any, Callable, Optional
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+COMPACT_SEPARATORS = (",", ":")
+# What json.dumps uses whenever indent is set.
+INDENT_SEPARATORS = (",", ": ")
+ORJSON_KWARGS = frozenset({"indent", "separators", "sort_keys"})
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    def __init__(self, app: Any, backend: str = "auto"):
+        super().__init__(app)
+        if backend == "orjson" and orjson is None:
+            raise RuntimeError("JSON_PROVIDER=orjson but orjson is not installed")
+        self.backend = "orjson" if orjson is not None and backend != "stdlib" else "stdlib"
+        # Called with the seconds spent encoding, when set.
+        self.timer: Optional[Callable[[float], None]] = None
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if self.timer is None:
+            return self.encode(obj, **kwargs)
+        started = time.perf_counter()
+        try:
+            return self.encode(obj, **kwargs)
+        finally:
+            self.timer(time.perf_counter() - started)
+
+    def encode(self, obj: Any, **kwargs: Any) -> str:
+        # Compact dumps (every API response outside debug mode) and the
+        # indent=2 ones Flask asks for in debug mode go through orjson; any
+        # other customisation keeps the stdlib path with the caller's kwargs
+        # untouched. Decimals and dates still go through Flask's default hook
+        # so both backends produce the same document.
+        if self.backend == "orjson" and not set(kwargs) - ORJSON_KWARGS:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            if kwargs.get("sort_keys", self.sort_keys):
+                option |= orjson.OPT_SORT_KEYS
+            indent = kwargs.get("indent")
+            separators = kwargs.get("separators")
+            if indent is None and separators in (None, COMPACT_SEPARATORS):
+                return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+            if indent == 2 and separators in (None, INDENT_SEPARATORS):
+                option |= orjson.OPT_INDENT_2
+                return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+        return super().dumps(obj, **kwargs)
@@ -0,0 +1,120 @@
+import queue
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+JobResult = Tuple[Dict[str, Any], int]
+
+
+class QueueFullError(Exception):
+    def __init__(self, max_queue: int):
+        super().__init__(f"Improvement plan queue is full ({max_queue} pending jobs)")
+        self.max_queue = max_queue
+
+
+class PlanJobQueue:
+    def __init__(self, workers: int = 2, max_queue: int = 100, retention: float = 600.0):
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self.retention = retention
+        self._queue: "queue.Queue[Tuple[str, Callable[[], JobResult]]]" = queue.Queue(
+            maxsize=self.max_queue
+        )
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._active_keys: Dict[str, str] = {}
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "deduplicated": 0, "rejected": 0, "done": 0, "failed": 0}
+
+    def submit(self, key: str, task: Callable[[], JobResult]) -> Dict[str, Any]:
+        self._start()
+        with self._lock:
+            self._prune()
+            job_id = self._active_keys.get(key)
+            if job_id is not None:
+                self._stats["deduplicated"] += 1
+                return dict(self._jobs[job_id])
+
+            job_id = uuid.uuid4().hex
+            job = {
+                "job_id": job_id,
+                "key": key,
+                "status": "queued",
+                "created_at": time.time(),
+                "finished_at": None,
+                "result": None,
+                "error": None,
+            }
+            try:
+                self._queue.put_nowait((job_id, task))
+            except queue.Full:
+                self._stats["rejected"] += 1
+                raise QueueFullError(self.max_queue)
+            self._jobs[job_id] = job
+            self._active_keys[key] = job_id
+            self._stats["submitted"] += 1
+            return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            statuses: Dict[str, int] = {}
+            for job in self._jobs.values():
+                statuses[job["status"]] = statuses.get(job["status"], 0) + 1
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queue.qsize(),
+                "retention_seconds": self.retention,
+                "jobs": statuses,
+                **self._stats,
+            }
+
+    def _start(self) -> None:
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._work, name=f"plan-job-{index}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self) -> None:
+        while True:
+            job_id, task = self._queue.get()
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    job["status"] = "running"
+            try:
+                payload, status_code = task()
+                outcome = ("done", payload, None) if status_code < 400 else ("failed", None, payload)
+            except Exception as exc:
+                outcome = ("failed", None, {"error": str(exc)})
+            with self._lock:
+                if job is not None:
+                    job["status"], job["result"], job["error"] = outcome
+                    job["finished_at"] = time.time()
+                    self._active_keys.pop(job["key"], None)
+                    self._stats[outcome[0]] += 1
+            self._queue.task_done()
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job["finished_at"] is not None and job["finished_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
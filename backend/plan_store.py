@@ -0,0 +1,127 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class PlanStore:
+    def __init__(self, path: str, max_entries: int = 5000, ttl: float = 30 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "evictions": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT payload, created_at FROM plans WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            payload, created_at = row
+            if self.ttl > 0 and created_at + self.ttl <= now:
+                conn.execute("DELETE FROM plans WHERE cache_key = ?", (key,))
+                conn.commit()
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            conn.execute("UPDATE plans SET accessed_at = ? WHERE cache_key = ?", (now, key))
+            conn.commit()
+            self._stats["hits"] += 1
+        return json.loads(payload)
+
+    def contains(self, key: str) -> bool:
+        if not self.enabled:
+            return False
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT created_at FROM plans WHERE cache_key = ?", (key,)
+            ).fetchone()
+        return row is not None and (self.ttl <= 0 or row[0] + self.ttl > time.time())
+
+    def put(self, key: str, payload: Dict[str, Any], model: str) -> None:
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO plans (cache_key, model, payload, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, model, json.dumps(payload), now, now),
+            )
+            if self.ttl > 0:
+                conn.execute("DELETE FROM plans WHERE created_at <= ?", (now - self.ttl,))
+            overflow = conn.execute("SELECT COUNT(*) FROM plans").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    """
+                    DELETE FROM plans WHERE cache_key IN (
+                        SELECT cache_key FROM plans ORDER BY accessed_at ASC LIMIT ?
+                    )
+                    """,
+                    (overflow,),
+                )
+                self._stats["evictions"] += overflow
+            conn.commit()
+            self._stats["writes"] += 1
+
+    def delete(self, key: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM plans WHERE cache_key = ?", (key,))
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        if not self.enabled:
+            return {"enabled": False}
+        with self._lock:
+            entries = self._connection().execute("SELECT COUNT(*) FROM plans").fetchone()[0]
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "enabled": True,
+                "path": self.path,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hit_ratio": round(self._stats["hits"] / lookups, 4) if lookups else None,
+                **self._stats,
+            }
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS plans (
+                    cache_key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_plans_accessed ON plans (accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
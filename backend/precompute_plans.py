@@ -0,0 +1,141 @@
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+import app as api
+
+
+class RateLimiter:
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def iter_student_prns(
+    batch_size: int, start_after: str = "", limit: Optional[int] = None
+) -> Iterator[str]:
+    last_prn = start_after
+    emitted = 0
+    while True:
+        with api.get_connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT prn FROM students WHERE prn > %s ORDER BY prn LIMIT %s",
+                    (last_prn, batch_size),
+                )
+                rows = cursor.fetchall()
+        if not rows:
+            return
+        for row in rows:
+            if limit is not None and emitted >= limit:
+                return
+            emitted += 1
+            yield row["prn"]
+        last_prn = rows[-1]["prn"]
+
+
+class Summary:
+    def __init__(self, progress_every: int = 0) -> None:
+        self.counts = {"students": 0, "generated": 0, "skipped": 0, "fallbacks": 0, "failures": 0}
+        self.errors: Dict[str, str] = {}
+        self.started = time.monotonic()
+        self.progress_every = progress_every
+        self._lock = threading.Lock()
+
+    def record(self, outcome: str, prn: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.counts["students"] += 1
+            self.counts[outcome] += 1
+            if error:
+                self.errors[prn] = error
+            # Checked under the lock, so each multiple is printed exactly once.
+            if self.progress_every and self.counts["students"] % self.progress_every == 0:
+                print(json.dumps({"progress": self.counts}), flush=True)
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        gemini_calls = self.counts["generated"] + self.counts["fallbacks"]
+        return {
+            **self.counts,
+            "elapsed_seconds": round(elapsed, 2),
+            "students_per_second": round(self.counts["students"] / elapsed, 2) if elapsed else None,
+            "gemini_calls_per_minute": round(gemini_calls / elapsed * 60, 1) if elapsed else None,
+            "errors": dict(list(self.errors.items())[:20]),
+        }
+
+
+def precompute_one(prn: str, limiter: RateLimiter, force: bool, summary: Summary) -> None:
+    try:
+        context = api.fetch_student_context(prn)
+        prompt, model_name, cache_key = api.plan_request(api.improvement_inputs(context))
+        if not force and api.get_plan_store().contains(cache_key):
+            summary.record("skipped", prn)
+            return
+
+        limiter.acquire()
+        payload, error = api.request_gemini_plan(prompt)
+        if payload is None:
+            summary.record("fallbacks", prn, error)
+            return
+        api.get_plan_store().put(cache_key, payload, model_name)
+        summary.record("generated", prn)
+    except Exception as exc:
+        summary.record("failures", prn, str(exc))
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    limiter = RateLimiter(args.rpm)
+    summary = Summary(args.progress_every)
+    # Bound in-flight work so contexts are not built far ahead of the limiter.
+    slots = threading.BoundedSemaphore(args.concurrency * 2)
+
+    def task(prn: str) -> None:
+        try:
+            precompute_one(prn, limiter, args.force, summary)
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for prn in iter_student_prns(args.batch_size, args.start_after, args.limit):
+            slots.acquire()
+            executor.submit(task, prn)
+
+    return summary.as_dict()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Generate and cache Gemini improvement plans for every student."
+    )
+    parser.add_argument("--concurrency", type=int, default=4, help="parallel Gemini calls")
+    parser.add_argument(
+        "--rpm", type=float, default=60, help="max Gemini requests per minute (0 = unlimited)"
+    )
+    parser.add_argument("--batch-size", type=int, default=500, help="PRNs read per students query")
+    parser.add_argument("--start-after", default="", help="resume after this PRN")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many students")
+    parser.add_argument(
+        "--force", action="store_true", help="regenerate plans even if inputs are unchanged"
+    )
+    parser.add_argument(
+        "--progress-every", type=int, default=100, help="print progress every N students (0 = off)"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(parse_args()), indent=2))
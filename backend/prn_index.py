@@ -0,0 +1,248 @@
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+NAME_SCAN_LIMIT = 500
+MATCH_TIERS = {"transposed": 0, "typo": 1, "prefix": 2, "nearby": 3}
+NameLoader = Callable[[], Iterable[Tuple[str, str]]]
+
+
+def transposes(word: str) -> List[str]:
+    return [word[:i] + word[i + 1] + word[i] + word[i + 2 :] for i in range(len(word) - 1)]
+
+
+def edits1(word: str, alphabets: Sequence[str]) -> Set[str]:
+    # alphabets[i] holds the characters seen at position i across all PRNs,
+    # so a digit slot is only tried with digits and the suffix with letters.
+    def chars(position: int) -> str:
+        return alphabets[position] if position < len(alphabets) else ""
+
+    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+    deletes = [left + right[1:] for left, right in splits if right]
+    replaces = [
+        left + c + right[1:] for left, right in splits if right for c in chars(len(left))
+    ]
+    inserts = [left + c + right for left, right in splits for c in chars(len(left))]
+    return set(deletes + transposes(word) + replaces + inserts)
+
+
+def common_prefix(a: str, b: str) -> int:
+    length = 0
+    for left, right in zip(a, b):
+        if left != right:
+            break
+        length += 1
+    return length
+
+
+def name_tokens(name: str) -> List[str]:
+    return [token for token in re.split(r"[^a-z0-9]+", name.lower()) if token]
+
+
+class StudentDirectory:
+    def __init__(self, rows: Iterable[Tuple[str, str]]):
+        self.names: Dict[str, str] = {prn: name or "" for prn, name in rows}
+        self.prns: List[str] = sorted(self.names)
+        self.name_tokens: Dict[str, List[str]] = {
+            prn: name_tokens(name) for prn, name in self.names.items()
+        }
+        self.tokens: List[Tuple[str, str]] = sorted(
+            (token, prn) for prn, tokens in self.name_tokens.items() for token in tokens
+        )
+        self.alphabets: List[str] = []
+        for prn in self.prns:
+            self._extend_alphabets(prn)
+        self.loaded_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.prns)
+
+    def with_prefix(self, prefix: str, limit: int) -> List[str]:
+        start = bisect_left(self.prns, prefix)
+        matches = []
+        for prn in self.prns[start : start + limit]:
+            if not prn.startswith(prefix):
+                break
+            matches.append(prn)
+        return matches
+
+    def neighbours(self, prn: str, count: int) -> List[str]:
+        position = bisect_left(self.prns, prn)
+        return self.prns[max(0, position - count) : position + count]
+
+    def suggest_prns(self, query: str, limit: int) -> List[Tuple[str, str]]:
+        candidates: Dict[str, str] = {}
+        for candidate in transposes(query):
+            if candidate in self.names:
+                candidates[candidate] = "transposed"
+        for candidate in edits1(query, self.alphabets):
+            if candidate in self.names:
+                candidates.setdefault(candidate, "typo")
+
+        for length in range(len(query) - 1, 2, -1):
+            matches = self.with_prefix(query[:length], limit * 2)
+            if matches:
+                for prn in matches:
+                    candidates.setdefault(prn, "prefix")
+                break
+
+        if len(candidates) < limit:
+            for prn in self.neighbours(query, limit):
+                candidates.setdefault(prn, "nearby")
+
+        candidates.pop(query, None)
+        ranked = sorted(
+            candidates,
+            key=lambda prn: (MATCH_TIERS[candidates[prn]], -common_prefix(query, prn), prn),
+        )
+        return [(prn, candidates[prn]) for prn in ranked[:limit]]
+
+    def token_range(self, prefix: str) -> Tuple[int, int]:
+        return (
+            bisect_left(self.tokens, (prefix, "")),
+            bisect_left(self.tokens, (prefix + "\uffff", "")),
+        )
+
+    def suggest_names(self, query: str, limit: int) -> List[Tuple[str, str]]:
+        terms = name_tokens(query)
+        if not terms:
+            return []
+        # Drive the search from the term with the fewest matching tokens and
+        # check the remaining terms against each candidate's own tokens.
+        start, end = min((self.token_range(term) for term in terms), key=lambda r: r[1] - r[0])
+        scored: Dict[str, int] = {}
+        for _, prn in self.tokens[start : min(end, start + NAME_SCAN_LIMIT)]:
+            tokens = self.name_tokens[prn]
+            if all(any(token.startswith(term) for token in tokens) for term in terms):
+                scored[prn] = sum(term in tokens for term in terms)
+        ranked = sorted(scored, key=lambda prn: (-scored[prn], self.names[prn], prn))
+        return [(prn, "name") for prn in ranked[:limit]]
+
+    def upsert(self, prn: str, name: str) -> bool:
+        current = self.names.get(prn)
+        if current == name:
+            return False
+        if current is None:
+            insort(self.prns, prn)
+            self._extend_alphabets(prn)
+        else:
+            self._drop_tokens(prn)
+        self.names[prn] = name
+        self.name_tokens[prn] = name_tokens(name)
+        for token in self.name_tokens[prn]:
+            insort(self.tokens, (token, prn))
+        return True
+
+    def remove(self, prn: str) -> bool:
+        current = self.names.pop(prn, None)
+        if current is None:
+            return False
+        del self.prns[bisect_left(self.prns, prn)]
+        self._drop_tokens(prn)
+        del self.name_tokens[prn]
+        return True
+
+    def _drop_tokens(self, prn: str) -> None:
+        for token in self.name_tokens.get(prn, []):
+            position = bisect_left(self.tokens, (token, prn))
+            if position < len(self.tokens) and self.tokens[position] == (token, prn):
+                del self.tokens[position]
+
+    def _extend_alphabets(self, prn: str) -> None:
+        for position, char in enumerate(prn):
+            if position == len(self.alphabets):
+                self.alphabets.append("")
+            if char not in self.alphabets[position]:
+                self.alphabets[position] = "".join(sorted(self.alphabets[position] + char))
+
+
+class PrnIndex:
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._directory: Optional[StudentDirectory] = None
+        self._lock = threading.Lock()
+        self._builds = 0
+        self._updates = 0
+        self._lookups = 0
+
+    def is_stale(self) -> bool:
+        return self._expired(self._directory)
+
+    def _expired(self, directory: Optional[StudentDirectory]) -> bool:
+        if directory is None:
+            return True
+        return self.ttl > 0 and time.monotonic() - directory.loaded_at > self.ttl
+
+    def ensure(self, loader: NameLoader) -> StudentDirectory:
+        # Returns the instance it found or built: a concurrent invalidate()
+        # may clear the directory as soon as the lock is released.
+        directory = self._directory
+        if self._expired(directory):
+            with self._lock:
+                directory = self._directory
+                if self._expired(directory):
+                    directory = self._directory = StudentDirectory(loader())
+                    self._builds += 1
+        return directory
+
+    def rebuild(self, loader: NameLoader) -> StudentDirectory:
+        directory = StudentDirectory(loader())
+        with self._lock:
+            self._directory = directory
+            self._builds += 1
+        return directory
+
+    def observe(self, prn: str, name: Optional[str]) -> None:
+        directory = self._directory
+        if directory is None:
+            return
+        with self._lock:
+            changed = directory.remove(prn) if name is None else directory.upsert(prn, name)
+            if changed:
+                self._updates += 1
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._directory = None
+
+    def suggest(self, query: str, loader: NameLoader, limit: int = 5) -> List[Dict[str, str]]:
+        return self._suggest(self.ensure(loader), query, limit)
+
+    def suggest_loaded(self, query: str, limit: int = 5) -> List[Dict[str, str]]:
+        # Uses whatever directory is loaded, even past its TTL; callers that
+        # fetch names themselves (the async server) rebuild() beforehand.
+        directory = self._directory
+        if directory is None:
+            return []
+        return self._suggest(directory, query, limit)
+
+    def _suggest(
+        self, directory: StudentDirectory, query: str, limit: int
+    ) -> List[Dict[str, str]]:
+        query = query.strip()
+        with self._lock:
+            self._lookups += 1
+            if any(char.isdigit() for char in query):
+                matches = directory.suggest_prns(query.upper(), limit)
+            else:
+                matches = directory.suggest_names(query, limit)
+            return [
+                {"prn": prn, "name": directory.names[prn], "match": match}
+                for prn, match in matches
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        directory = self._directory
+        return {
+            "ttl_seconds": self.ttl,
+            "students": len(directory) if directory else 0,
+            "name_tokens": len(directory.tokens) if directory else 0,
+            "age_seconds": (
+                round(time.monotonic() - directory.loaded_at, 1) if directory else None
+            ),
+            "builds": self._builds,
+            "incremental_updates": self._updates,
+            "lookups": self._lookups,
+        }
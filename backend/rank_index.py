@@ -0,0 +1,121 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+RankLoader = Callable[[], Iterable[Tuple[str, Optional[float]]]]
+
+
+class SemesterRanks:
+    def __init__(self, rows: Iterable[Tuple[str, Optional[float]]]):
+        self.by_prn: Dict[str, float] = {
+            prn: float(sgpa) for prn, sgpa in rows if sgpa is not None
+        }
+        self.values: List[float] = sorted(self.by_prn.values())
+        self.loaded_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def lookup(self, sgpa: float) -> Tuple[int, int, Optional[float]]:
+        size = len(self.values)
+        at_or_below = bisect_right(self.values, sgpa)
+        percentile = round(at_or_below / size * 100, 2) if size else None
+        return size - at_or_below + 1, size, percentile
+
+    def upsert(self, prn: str, sgpa: float) -> bool:
+        current = self.by_prn.get(prn)
+        if current == sgpa:
+            return False
+        if current is not None:
+            del self.values[bisect_left(self.values, current)]
+        insort(self.values, sgpa)
+        self.by_prn[prn] = sgpa
+        return True
+
+    def remove(self, prn: str) -> bool:
+        current = self.by_prn.pop(prn, None)
+        if current is None:
+            return False
+        del self.values[bisect_left(self.values, current)]
+        return True
+
+
+class RankIndex:
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._tables: Dict[str, SemesterRanks] = {}
+        self._lock = threading.Lock()
+        self._builds = 0
+        self._updates = 0
+
+    def is_stale(self, sem_table: str) -> bool:
+        return self._expired(self._tables.get(sem_table))
+
+    def _expired(self, ranks: Optional[SemesterRanks]) -> bool:
+        if ranks is None:
+            return True
+        return self.ttl > 0 and time.monotonic() - ranks.loaded_at > self.ttl
+
+    def ensure(self, sem_table: str, loader: RankLoader) -> SemesterRanks:
+        # Returns the instance it found or built: a concurrent invalidate()
+        # may drop the table as soon as the lock is released.
+        ranks = self._tables.get(sem_table)
+        if self._expired(ranks):
+            with self._lock:
+                ranks = self._tables.get(sem_table)
+                if self._expired(ranks):
+                    ranks = self._tables[sem_table] = SemesterRanks(loader())
+                    self._builds += 1
+        return ranks
+
+    def rebuild(self, sem_table: str, loader: RankLoader) -> SemesterRanks:
+        ranks = SemesterRanks(loader())
+        with self._lock:
+            self._tables[sem_table] = ranks
+            self._builds += 1
+        return ranks
+
+    def observe(self, sem_table: str, prn: str, sgpa: Optional[float]) -> None:
+        ranks = self._tables.get(sem_table)
+        if ranks is None:
+            return
+        with self._lock:
+            changed = ranks.remove(prn) if sgpa is None else ranks.upsert(prn, float(sgpa))
+            if changed:
+                self._updates += 1
+
+    def invalidate(self, sem_table: Optional[str] = None) -> None:
+        with self._lock:
+            if sem_table is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(sem_table, None)
+
+    def lookup(
+        self, sem_table: str, sgpa: float, loader: RankLoader
+    ) -> Tuple[int, int, Optional[float]]:
+        ranks = self.ensure(sem_table, loader)
+        with self._lock:
+            return ranks.lookup(float(sgpa))
+
+    def peek(self, sem_table: str, sgpa: float) -> Optional[Tuple[int, int, Optional[float]]]:
+        # Reads whatever is loaded, even past its TTL; for callers that fetch
+        # the rows themselves (the async server) and rebuild() beforehand.
+        ranks = self._tables.get(sem_table)
+        if ranks is None:
+            return None
+        with self._lock:
+            return ranks.lookup(float(sgpa))
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "ttl_seconds": self.ttl,
+            "builds": self._builds,
+            "incremental_updates": self._updates,
+            "tables": {
+                name: {"size": len(ranks), "age_seconds": round(now - ranks.loaded_at, 1)}
+                for name, ranks in list(self._tables.items())
+            },
+        }
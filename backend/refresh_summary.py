@@ -0,0 +1,144 @@
+import argparse
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from flask import g
+
+import app as api
+import student_summary
+
+
+def semester_tables(cursor: Any) -> List[str]:
+    catalog = api.schema_catalog(cursor)
+    if not catalog.has_table(student_summary.SUMMARY_TABLE):
+        raise SystemExit("student_summary table is missing; create it from db.sql first")
+    return [sem_table for sem_table in api.SEMESTER_SUBJECTS if catalog.has_table(sem_table)]
+
+
+def timed(fn: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+def measure_contexts(prns: List[str], use_summary: bool, cold_ranks: bool) -> Dict[str, Any]:
+    os.environ["SUMMARY_TABLE_ENABLED"] = "true" if use_summary else "false"
+    if cold_ranks:
+        api._rank_index.invalidate()
+    latencies: List[float] = []
+    queries = 0
+    payloads = {}
+    for prn in prns:
+        with api.app.test_request_context():
+            started = time.perf_counter()
+            context = api.fetch_student_context(prn)
+            latencies.append(time.perf_counter() - started)
+            queries += g.get("db_queries", 0)
+        payloads[prn] = (api.build_dashboard_payload(context), api.build_reports_payload(context))
+    return {
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "first_ms": round(latencies[0] * 1000, 3),
+        "queries_per_request": round(queries / len(prns), 2),
+        "payloads": payloads,
+    }
+
+
+def compare(connection: Any, sem_tables: List[str], sample: int) -> Dict[str, Any]:
+    with connection.cursor() as cursor:
+        full_seconds = timed(lambda: student_summary.refresh_all(cursor, sem_tables))
+        check_seconds = timed(lambda: student_summary.changed_prns(cursor, sem_tables))
+        cursor.execute("SELECT prn FROM students ORDER BY RAND() LIMIT %s", (sample,))
+        prns = [row["prn"] for row in cursor.fetchall()]
+        if not prns:
+            raise SystemExit("No students to compare")
+        # Unchanged PRNs only rewrite their own rows; forcing the latest
+        # semester shows the cost of re-ranking one whole semester.
+        own_rows_seconds = timed(
+            lambda: student_summary.refresh_prns(cursor, sem_tables, prns, semesters=[])
+        )
+        rerank_seconds = timed(
+            lambda: student_summary.refresh_prns(
+                cursor, sem_tables, prns[:1], semesters=sem_tables[-1:]
+            )
+        )
+
+    live_cold = measure_contexts(prns, use_summary=False, cold_ranks=True)
+    live_warm = measure_contexts(prns, use_summary=False, cold_ranks=False)
+    summary = measure_contexts(prns, use_summary=True, cold_ranks=True)
+    mismatches = [
+        prn for prn in prns if live_warm["payloads"][prn] != summary["payloads"][prn]
+    ]
+    for result in (live_cold, live_warm, summary):
+        result.pop("payloads")
+    return {
+        "students_sampled": len(prns),
+        "refresh_seconds": {
+            "full": round(full_seconds, 3),
+            "detect_changes": round(check_seconds, 3),
+            f"incremental_{len(prns)}_prns": round(own_rows_seconds, 3),
+            "incremental_rerank_one_semester": round(rerank_seconds, 3),
+        },
+        "request": {
+            "live_cold_rank_index": live_cold,
+            "live_warm_rank_index": live_warm,
+            "summary_table": summary,
+        },
+        "payload_mismatches": mismatches[:20],
+        "payload_mismatch_count": len(mismatches),
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    started = time.monotonic()
+    connection = api.open_connection()
+    try:
+        with connection.cursor() as cursor:
+            sem_tables = semester_tables(cursor)
+        if args.compare:
+            return compare(connection, sem_tables, args.compare)
+
+        with connection.cursor() as cursor:
+            if args.check:
+                changed = student_summary.changed_prns(cursor, sem_tables)
+                summary: Dict[str, Any] = {"changed_prns": len(changed), "sample": changed[:20]}
+            else:
+                prns = None
+                if args.prns:
+                    prns = [api.normalize_prn(prn) for prn in args.prns.split(",")]
+                summary = student_summary.refresh_summary(cursor, sem_tables, prns, full=args.full)
+    finally:
+        connection.close()
+    summary["elapsed_seconds"] = round(time.monotonic() - started, 3)
+    return summary
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Build or incrementally refresh the student_summary table."
+    )
+    parser.add_argument("--full", action="store_true", help="rebuild every summary row")
+    parser.add_argument("--prns", help="comma-separated PRNs to refresh (default: detect changes)")
+    parser.add_argument(
+        "--check", action="store_true", help="only report PRNs whose summary is out of date"
+    )
+    parser.add_argument(
+        "--compare",
+        type=int,
+        default=0,
+        metavar="N",
+        help="time refreshes and N context loads with and without the summary table",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(parse_args()), indent=2))
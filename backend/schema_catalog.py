@@ -0,0 +1,86 @@
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+
+import pymysql
+
+COLUMNS_SQL = """
+    SELECT table_name AS table_name, column_name AS column_name
+    FROM information_schema.columns
+    WHERE table_schema = %s
+    ORDER BY table_name, ordinal_position
+"""
+
+
+class SchemaCatalog:
+    def __init__(self, ttl: float = 0.0):
+        self.ttl = ttl
+        self._tables: Dict[str, List[str]] = {}
+        self._column_sets: Dict[str, FrozenSet[str]] = {}
+        self._loaded_at: Optional[float] = None
+        self._refreshes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def is_stale(self) -> bool:
+        if self._loaded_at is None:
+            return True
+        return self.ttl > 0 and time.monotonic() - self._loaded_at > self.ttl
+
+    def ensure(self, cursor: pymysql.cursors.Cursor, schema: str) -> "SchemaCatalog":
+        if self.is_stale():
+            with self._lock:
+                if self.is_stale():
+                    self._load(cursor, schema)
+        return self
+
+    def refresh(self, cursor: pymysql.cursors.Cursor, schema: str) -> "SchemaCatalog":
+        with self._lock:
+            self._load(cursor, schema)
+        return self
+
+    def load_rows(self, rows: Iterable[Dict[str, Any]]) -> "SchemaCatalog":
+        # For callers that run COLUMNS_SQL themselves (the async server).
+        with self._lock:
+            self._apply(rows)
+        return self
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def has_table(self, table_name: str) -> bool:
+        return table_name in self._tables
+
+    def has_column(self, table_name: str, column_name: str) -> bool:
+        return column_name in self._column_sets.get(table_name, frozenset())
+
+    def columns(self, table_name: str) -> List[str]:
+        return list(self._tables.get(table_name, []))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "tables": len(self._tables),
+            "age_seconds": (
+                round(time.monotonic() - self._loaded_at, 1) if self._loaded_at is not None else None
+            ),
+            "ttl_seconds": self.ttl,
+            "refreshes": self._refreshes,
+        }
+
+    def _load(self, cursor: pymysql.cursors.Cursor, schema: str) -> None:
+        cursor.execute(COLUMNS_SQL, (schema,))
+        self._apply(cursor.fetchall())
+
+    def _apply(self, rows: Iterable[Dict[str, Any]]) -> None:
+        tables: Dict[str, List[str]] = {}
+        for row in rows:
+            tables.setdefault(row["table_name"], []).append(row["column_name"])
+
+        self._tables = tables
+        self._column_sets = {name: frozenset(columns) for name, columns in tables.items()}
+        self._loaded_at = time.monotonic()
+        self._refreshes += 1
@@ -0,0 +1,274 @@
+import sys
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+TableRows = Mapping[str, Iterable[Sequence[Any]]]
+MISSING_MARK = -1
+
+
+class SemesterColumns:
+    def __init__(self, subject_columns: List[str], size: int):
+        self.subject_columns = subject_columns
+        self.present = np.zeros(size, dtype=bool)
+        self.marks = np.full((size, len(subject_columns)), MISSING_MARK, dtype=np.int16)
+        self.sgpa = np.full(size, np.nan)
+        self.sorted_sgpa = np.empty(0)
+
+    def fill(self, positions: np.ndarray, rows: List[Sequence[Any]]) -> None:
+        if not rows:
+            return
+        self.present[positions] = True
+        # dtype=float turns NULL (None) into NaN and accepts Decimal values.
+        marks = np.array([row[1:-1] for row in rows], dtype=float)
+        self.marks[positions] = np.where(np.isnan(marks), MISSING_MARK, marks).astype(np.int16)
+        self.sgpa[positions] = np.array([row[-1] for row in rows], dtype=float)
+        valid = self.sgpa[~np.isnan(self.sgpa)]
+        self.sorted_sgpa = np.sort(valid)
+
+    def rank(self, sgpa: float) -> Tuple[int, int, Optional[float]]:
+        # Same definition as rank_index.SemesterRanks.lookup.
+        size = int(self.sorted_sgpa.size)
+        at_or_below = int(np.searchsorted(self.sorted_sgpa, sgpa, side="right"))
+        percentile = round(at_or_below / size * 100, 2) if size else None
+        return size - at_or_below + 1, size, percentile
+
+    def nbytes(self) -> int:
+        return self.present.nbytes + self.marks.nbytes + self.sgpa.nbytes + self.sorted_sgpa.nbytes
+
+
+class StudentSnapshot:
+    def __init__(
+        self,
+        tables: TableRows,
+        semester_subjects: Mapping[str, Sequence[str]],
+        twelfth_columns: Sequence[str],
+        skill_separator: str = "\x1f",
+    ):
+        started = time.perf_counter()
+        students = sorted((str(prn), name) for prn, name in tables["students"])
+        self.prns: List[str] = [prn for prn, _ in students]
+        self.names: List[str] = [name for _, name in students]
+        self.index: Dict[str, int] = {prn: position for position, prn in enumerate(self.prns)}
+        self.twelfth_columns = list(twelfth_columns)
+        self.skill_separator = skill_separator
+        size = len(self.prns)
+
+        self.twelfth_marks = np.full((size, len(self.twelfth_columns)), MISSING_MARK, np.int16)
+        self.twelfth_percentage = np.full(size, np.nan)
+        rows, positions = self._known(tables.get("marks_12th", []))
+        if rows:
+            self.twelfth_marks[positions] = np.array([row[1:-1] for row in rows], dtype=np.int16)
+            self.twelfth_percentage[positions] = np.array([row[-1] for row in rows], dtype=float)
+
+        self.semesters: Dict[str, SemesterColumns] = {}
+        for sem_table, subject_columns in semester_subjects.items():
+            if sem_table not in tables:
+                continue
+            columns = SemesterColumns(list(subject_columns), size)
+            rows, positions = self._known(tables[sem_table])
+            columns.fill(positions, rows)
+            self.semesters[sem_table] = columns
+
+        # Skills as CSR: student i owns skill_ids[skill_offsets[i]:skill_offsets[i + 1]].
+        per_student: List[List[str]] = [[] for _ in range(size)]
+        for prn, skill in tables.get("student_skills", []):
+            position = self.index.get(prn)
+            if position is not None:
+                per_student[position].append(skill)
+        vocabulary: Dict[str, int] = {}
+        ids: List[int] = []
+        offsets = [0]
+        for skills in per_student:
+            # MySQL's default collation orders skill names case-insensitively.
+            for skill in sorted(skills, key=str.casefold):
+                ids.append(vocabulary.setdefault(skill, len(vocabulary)))
+            offsets.append(len(ids))
+        self.skill_names: List[str] = list(vocabulary)
+        self.skill_ids = np.array(ids, dtype=np.int32)
+        self.skill_offsets = np.array(offsets, dtype=np.int64)
+
+        self.loaded_at = time.time()
+        self.load_seconds = time.perf_counter() - started
+
+    def _known(self, rows: Iterable[Sequence[Any]]) -> Tuple[List[Sequence[Any]], np.ndarray]:
+        index = self.index
+        kept = [row for row in rows if row[0] in index]
+        return kept, np.fromiter((index[row[0]] for row in kept), dtype=np.int64, count=len(kept))
+
+    def __len__(self) -> int:
+        return len(self.prns)
+
+    def __contains__(self, prn: object) -> bool:
+        return prn in self.index
+
+    def bundle_row(self, prn: str) -> Optional[Dict[str, Any]]:
+        # Shaped like one row of the live bundle query so the same
+        # split_student_bundle() turns it into the student context.
+        position = self.index.get(prn)
+        if position is None:
+            return None
+        row: Dict[str, Any] = {"prn": prn, "name": self.names[position]}
+        has_twelfth = not np.isnan(self.twelfth_percentage[position])
+        for column, mark in zip(self.twelfth_columns, self.twelfth_marks[position]):
+            row[column] = int(mark) if has_twelfth else None
+        row["twelfth_percentage"] = (
+            decimal_2dp(self.twelfth_percentage[position]) if has_twelfth else None
+        )
+
+        for sem_table, columns in self.semesters.items():
+            if not columns.present[position]:
+                continue
+            row[f"{sem_table}__prn"] = prn
+            for column, mark in zip(columns.subject_columns, columns.marks[position]):
+                row[f"{sem_table}__{column}"] = None if mark == MISSING_MARK else int(mark)
+            sgpa = columns.sgpa[position]
+            row[f"{sem_table}__sgpa"] = None if np.isnan(sgpa) else decimal_2dp(sgpa)
+
+        start, end = self.skill_offsets[position], self.skill_offsets[position + 1]
+        skills = [self.skill_names[skill_id] for skill_id in self.skill_ids[start:end]]
+        row["skills"] = self.skill_separator.join(skills) if skills else None
+        return row
+
+    def rank(
+        self, sem_table: Optional[str], sgpa: Optional[float]
+    ) -> Tuple[Optional[int], Optional[int], Optional[float]]:
+        if sem_table not in self.semesters or sgpa is None:
+            return None, None, None
+        return self.semesters[sem_table].rank(float(sgpa))
+
+    def name_rows(self) -> List[Tuple[str, str]]:
+        return list(zip(self.prns, self.names))
+
+    def nbytes(self) -> int:
+        arrays = (
+            self.twelfth_marks.nbytes
+            + self.twelfth_percentage.nbytes
+            + self.skill_ids.nbytes
+            + self.skill_offsets.nbytes
+            + sum(columns.nbytes() for columns in self.semesters.values())
+        )
+        objects = (
+            sys.getsizeof(self.prns)
+            + sys.getsizeof(self.names)
+            + sys.getsizeof(self.index)
+            + sum(sys.getsizeof(prn) for prn in self.prns)
+            + sum(sys.getsizeof(name) for name in self.names)
+            + sum(sys.getsizeof(name) for name in self.skill_names)
+        )
+        return arrays + objects
+
+    def stats(self) -> Dict[str, Any]:
+        size = len(self)
+        total = self.nbytes()
+        return {
+            "students": size,
+            "semesters": list(self.semesters),
+            "skills": int(self.skill_ids.size),
+            "bytes": total,
+            "bytes_per_10k_students": int(total / size * 10_000) if size else None,
+            "load_seconds": round(self.load_seconds, 3),
+            "loaded_at": self.loaded_at,
+        }
+
+
+def decimal_2dp(value: float) -> Decimal:
+    # marks_12th.percentage and semN.sgpa are DECIMAL(_, 2) columns.
+    return Decimal(f"{value:.2f}")
+
+
+class SnapshotStore:
+    def __init__(
+        self,
+        loader: Callable[[], StudentSnapshot],
+        refresh_interval: float = 0.0,
+        on_swap: Optional[Callable[[StudentSnapshot], None]] = None,
+        min_reload_interval: float = 10.0,
+    ):
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self.on_swap = on_swap
+        self.min_reload_interval = min_reload_interval
+        self._snapshot: Optional[StudentSnapshot] = None
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._timer: Optional[threading.Thread] = None
+        self._reload_requested = threading.Event()
+        self._reloaded_at = float("-inf")
+        self._generation = 0
+        self._stats: Dict[str, Any] = {"reloads": 0, "failed_reloads": 0, "last_error": None}
+
+    def current(self) -> StudentSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.reload()
+        return snapshot
+
+    def reload(self) -> StudentSnapshot:
+        # Build the replacement while requests keep reading the old snapshot,
+        # then publish it with a single reference assignment.
+        with self._reload_lock:
+            try:
+                snapshot = self.loader()
+            except Exception as exc:
+                with self._lock:
+                    self._stats["failed_reloads"] += 1
+                    self._stats["last_error"] = str(exc)
+                raise
+            with self._lock:
+                self._snapshot = snapshot
+                self._reloaded_at = time.monotonic()
+                self._generation += 1
+                self._stats["reloads"] += 1
+                self._stats["last_error"] = None
+        if self.on_swap is not None:
+            self.on_swap(snapshot)
+        return snapshot
+
+    def request_reload(self) -> None:
+        # For callers that see many small changes (the change feed): a burst
+        # becomes at most one reload per min_reload_interval instead of a
+        # full rebuild for each batch.
+        self._reload_requested.set()
+        self.start_timer()
+
+    def start_timer(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Thread(
+                target=self._refresh_loop, name="snapshot-refresh", daemon=True
+            )
+        self._timer.start()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            timeout = self.refresh_interval if self.refresh_interval > 0 else None
+            if self._reload_requested.wait(timeout):
+                delay = self._reloaded_at + self.min_reload_interval - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            # Cleared before loading: a request that arrives during the load
+            # gets a reload of its own.
+            self._reload_requested.clear()
+            try:
+                self.reload()
+            except Exception:
+                pass  # counted in stats; keep serving the previous snapshot
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        with self._lock:
+            return {
+                "enabled": True,
+                "generation": self._generation,
+                "refresh_interval_seconds": self.refresh_interval,
+                "timer_running": self._timer is not None,
+                "min_reload_interval_seconds": self.min_reload_interval,
+                "reload_pending": self._reload_requested.is_set(),
+                **self._stats,
+                **(snapshot.stats() if snapshot else {"students": 0}),
+            }
@@ -0,0 +1,226 @@
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pymysql
+from dotenv import load_dotenv
+
+from schema_catalog import SchemaCatalog
+from student_summary import SUMMARY_TABLE
+
+# The offline tools (CSV ingest, training) import this module instead of the
+# Flask app, so it loads .env itself.
+load_dotenv()
+
+SEMESTER_SUBJECTS: "OrderedDict[str, List[str]]" = OrderedDict(
+    [
+        (
+            "sem1",
+            [
+                "systems_mechanical_engineering",
+                "basic_electrical_engineering",
+                "engineering_mathematics_1",
+                "engineering_chemistry",
+                "programming_problem_solving",
+            ],
+        ),
+        (
+            "sem2",
+            [
+                "engineering_mechanics",
+                "engineering_graphics",
+                "basic_electronics_engineering",
+                "engineering_physics",
+                "engineering_mathematics_2",
+            ],
+        ),
+        (
+            "sem3",
+            [
+                "discrete_mathematics",
+                "data_structures",
+                "object_oriented_programming",
+                "computer_graphics",
+                "operating_systems",
+            ],
+        ),
+        (
+            "sem4",
+            [
+                "data_structures_algorithms",
+                "software_engineering",
+                "statistics",
+                "internet_of_things",
+                "management_information_system",
+            ],
+        ),
+        (
+            "sem5",
+            [
+                "artificial_intelligence",
+                "database_management_systems",
+                "web_technology",
+                "pattern_recognition",
+                "computer_networks",
+            ],
+        ),
+        (
+            "sem6",
+            [
+                "cyber_security",
+                "data_science",
+                "artificial_neural_networks",
+                "cloud_computing",
+            ],
+        ),
+    ]
+)
+
+
+TWELFTH_COLUMNS = ["physics", "chemistry", "mathematics", "english", "computer_science"]
+SKILL_SEPARATOR = "\x1f"
+
+
+def db_name() -> str:
+    return os.getenv("DB_NAME", "eduvision_ai")
+
+
+def db_config(cursorclass: type = pymysql.cursors.DictCursor) -> Dict[str, Any]:
+    return {
+        "host": os.getenv("DB_HOST", "127.0.0.1"),
+        "port": int(os.getenv("DB_PORT", "3306")),
+        "user": os.getenv("DB_USER", "root"),
+        "password": os.getenv("DB_PASSWORD", ""),
+        "database": db_name(),
+        "charset": "utf8mb4",
+        "connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", "10")),
+        "read_timeout": int(os.getenv("DB_READ_TIMEOUT", "20")),
+        "write_timeout": int(os.getenv("DB_WRITE_TIMEOUT", "20")),
+        "cursorclass": cursorclass,
+        "autocommit": True,
+        "init_command": "SET SESSION group_concat_max_len = 65535",
+    }
+
+
+def open_connection(
+    cursorclass: type = pymysql.cursors.DictCursor,
+) -> pymysql.connections.Connection:
+    cfg = db_config(cursorclass)
+    ssl_ca = os.getenv("DB_SSL_CA")
+    if ssl_ca:
+        cfg["ssl"] = {"ca": ssl_ca}
+    return pymysql.connect(**cfg)
+
+
+def normalize_prn(prn: str) -> str:
+    return prn.strip().upper()
+
+
+def format_subject_name(raw: str) -> str:
+    return raw.replace("_", " ").title()
+
+
+GRADE_BANDS: List[Tuple[float, str]] = [
+    (90, "A+"),
+    (85, "A"),
+    (80, "B+"),
+    (75, "B"),
+    (70, "C+"),
+    (60, "C"),
+]
+FLOOR_GRADE = "D"
+
+
+def score_to_grade(score: Optional[float]) -> str:
+    if score is None:
+        return "-"
+    for threshold, grade in GRADE_BANDS:
+        if score >= threshold:
+            return grade
+    return FLOOR_GRADE
+
+
+def safe_float(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    return float(value)
+
+
+def build_semester_entry(
+    sem_table: str, subject_columns: List[str], row: Dict[str, Any]
+) -> Dict[str, Any]:
+    subjects = []
+    for column in subject_columns:
+        if column in row and row[column] is not None:
+            score = int(row[column])
+            subjects.append(
+                {
+                    "key": column,
+                    "subject": format_subject_name(column),
+                    "score": score,
+                    "grade": score_to_grade(score),
+                }
+            )
+
+    return {
+        "table": sem_table,
+        "semester": sem_table.replace("sem", "Semester "),
+        "sgpa": safe_float(row.get("sgpa")),
+        "subjects": subjects,
+    }
+
+
+def bundle_select_sql(catalog: SchemaCatalog, summary_fields: Sequence[str] = ()) -> str:
+    select_parts = [
+        "s.prn",
+        "s.name",
+        *[f"m.{column}" for column in TWELFTH_COLUMNS],
+        "m.percentage AS twelfth_percentage",
+    ]
+    joins = ["FROM students s", "LEFT JOIN marks_12th m ON s.prn = m.prn"]
+
+    for sem_table, subject_columns in SEMESTER_SUBJECTS.items():
+        if not catalog.has_table(sem_table):
+            continue
+        select_parts.append(f"{sem_table}.prn AS {sem_table}__prn")
+        for column in [*subject_columns, "sgpa"]:
+            if catalog.has_column(sem_table, column):
+                select_parts.append(f"{sem_table}.{column} AS {sem_table}__{column}")
+        joins.append(f"LEFT JOIN {sem_table} ON {sem_table}.prn = s.prn")
+
+    if summary_fields and catalog.has_table(SUMMARY_TABLE):
+        select_parts.extend(f"ss.{column} AS summary__{column}" for column in summary_fields)
+        joins.append(f"LEFT JOIN {SUMMARY_TABLE} ss ON ss.prn = s.prn")
+
+    if catalog.has_table("student_skills"):
+        select_parts.append(
+            "(SELECT GROUP_CONCAT(k.skill_name ORDER BY k.skill_name ASC "
+            f"SEPARATOR '{SKILL_SEPARATOR}') FROM student_skills k WHERE k.prn = s.prn) AS skills"
+        )
+    else:
+        select_parts.append("NULL AS skills")
+
+    return "SELECT\n    " + ",\n    ".join(select_parts) + "\n" + "\n".join(joins)
+
+
+def split_student_bundle(
+    row: Dict[str, Any]
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[str]]:
+    student = {
+        "prn": row["prn"],
+        "name": row["name"],
+        **{column: row.get(column) for column in TWELFTH_COLUMNS},
+        "twelfth_percentage": row.get("twelfth_percentage"),
+    }
+
+    semesters = []
+    for sem_table, subject_columns in SEMESTER_SUBJECTS.items():
+        if row.get(f"{sem_table}__prn") is None:
+            continue
+        sem_row = {
+            column: row.get(f"{sem_table}__{column}") for column in [*subject_columns, "sgpa"]
+        }
+        semesters.append(build_semester_entry(sem_table, subject_columns, sem_row))
+
+    skills = row["skills"].split(SKILL_SEPARATOR) if row.get("skills") else []
+    return student, semesters, skills
@@ -0,0 +1,176 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pymysql
+
+SUMMARY_TABLE = "student_summary"
+SUMMARY_COLUMNS = [
+    "prn",
+    "latest_table",
+    "latest_sgpa",
+    "previous_table",
+    "previous_sgpa",
+    "sgpa_change",
+    "overall_cgpa",
+    "semesters_completed",
+    "class_rank",
+    "class_size",
+    "class_percentile",
+    "sgpa_history",
+]
+# Above this many changed PRNs a full rebuild is cheaper than an IN (...) list.
+INCREMENTAL_LIMIT = 2000
+
+
+def semester_sgpa_cte(sem_tables: Sequence[str]) -> str:
+    # One row per (student, semester) with that semester's class rank:
+    # RANK() over SGPA descending matches rank_index (1 + number of higher
+    # SGPAs) and CUME_DIST() is the share of the class at or below.
+    parts = [
+        f"SELECT prn, {position} AS position, '{sem_table}' AS sem_table, sgpa, "
+        "RANK() OVER (ORDER BY sgpa DESC) AS class_rank, "
+        "COUNT(*) OVER () AS class_size, "
+        "ROUND(100 * CUME_DIST() OVER (ORDER BY sgpa), 2) AS class_percentile "
+        f"FROM {sem_table}"
+        for position, sem_table in enumerate(sem_tables, start=1)
+    ]
+    return (
+        "WITH semester_sgpa AS (\n    "
+        + "\n    UNION ALL ".join(parts)
+        + "\n), ordered AS (\n"
+        "    SELECT semester_sgpa.*, "
+        "ROW_NUMBER() OVER (PARTITION BY prn ORDER BY position DESC) AS recency\n"
+        "    FROM semester_sgpa\n"
+        "), totals AS (\n"
+        "    SELECT prn, ROUND(AVG(sgpa), 2) AS overall_cgpa, COUNT(*) AS semesters_completed, "
+        "GROUP_CONCAT(sem_table, '=', sgpa ORDER BY position SEPARATOR ',') AS sgpa_history\n"
+        "    FROM semester_sgpa GROUP BY prn\n"
+        ")\n"
+    )
+
+
+def summary_select_sql(sem_tables: Sequence[str], where: str = "") -> str:
+    return (
+        semester_sgpa_cte(sem_tables)
+        + "SELECT s.prn, latest.sem_table, latest.sgpa, previous.sem_table, previous.sgpa, "
+        "latest.sgpa - previous.sgpa, totals.overall_cgpa, "
+        "COALESCE(totals.semesters_completed, 0), "
+        "latest.class_rank, latest.class_size, latest.class_percentile, totals.sgpa_history\n"
+        "FROM students s\n"
+        "LEFT JOIN ordered latest ON latest.prn = s.prn AND latest.recency = 1\n"
+        "LEFT JOIN ordered previous ON previous.prn = s.prn AND previous.recency = 2\n"
+        "LEFT JOIN totals ON totals.prn = s.prn\n"
+        + where
+    )
+
+
+def upsert_summary_sql(sem_tables: Sequence[str], where: str = "") -> str:
+    columns = ", ".join(SUMMARY_COLUMNS)
+    updates = ", ".join(f"{column} = VALUES({column})" for column in SUMMARY_COLUMNS[1:])
+    return (
+        f"INSERT INTO {SUMMARY_TABLE} ({columns})\n"
+        + summary_select_sql(sem_tables, where)
+        + f"\nON DUPLICATE KEY UPDATE {updates}"
+    )
+
+
+def placeholders(values: Sequence[Any]) -> str:
+    return ", ".join(["%s"] * len(values))
+
+
+def refresh_all(cursor: pymysql.cursors.Cursor, sem_tables: Sequence[str]) -> int:
+    cursor.execute(upsert_summary_sql(sem_tables))
+    return cursor.rowcount
+
+
+def changed_prns(cursor: pymysql.cursors.Cursor, sem_tables: Sequence[str]) -> List[str]:
+    # Students whose SGPA history no longer matches the one stored with their
+    # summary row, plus students that have no summary row yet.
+    cursor.execute(
+        semester_sgpa_cte(sem_tables)
+        + "SELECT s.prn FROM students s\n"
+        "LEFT JOIN totals ON totals.prn = s.prn\n"
+        f"LEFT JOIN {SUMMARY_TABLE} ss ON ss.prn = s.prn\n"
+        "WHERE ss.prn IS NULL OR NOT (ss.sgpa_history <=> totals.sgpa_history)"
+    )
+    return [row["prn"] for row in cursor.fetchall()]
+
+
+def sgpa_history(entries: Iterable[Tuple[str, Any]]) -> Optional[str]:
+    # Same text as the GROUP_CONCAT above: "sem1=7.20,sem2=7.85" from the
+    # DECIMAL values as MySQL returns them.
+    history = ",".join(f"{sem_table}={sgpa}" for sem_table, sgpa in entries if sgpa is not None)
+    return history or None
+
+
+def parse_history(history: Optional[str]) -> Dict[str, str]:
+    return dict(entry.split("=", 1) for entry in history.split(",")) if history else {}
+
+
+def affected_semesters(
+    cursor: pymysql.cursors.Cursor, sem_tables: Sequence[str], prns: Sequence[str]
+) -> List[str]:
+    # A changed SGPA moves the rank of every student whose latest semester is
+    # the one that changed, so exactly those semesters are re-ranked.
+    current: Dict[str, List[Tuple[str, Any]]] = {prn: [] for prn in prns}
+    for sem_table in sem_tables:
+        cursor.execute(
+            f"SELECT prn, sgpa FROM {sem_table} WHERE prn IN ({placeholders(prns)})", prns
+        )
+        for row in cursor.fetchall():
+            current[row["prn"]].append((sem_table, row["sgpa"]))
+    cursor.execute(
+        f"SELECT prn, sgpa_history FROM {SUMMARY_TABLE} WHERE prn IN ({placeholders(prns)})",
+        prns,
+    )
+    stored = {row["prn"]: parse_history(row["sgpa_history"]) for row in cursor.fetchall()}
+
+    affected = set()
+    for prn, entries in current.items():
+        before = stored.get(prn, {})
+        after = parse_history(sgpa_history(entries))
+        for sem_table in {*before, *after}:
+            if before.get(sem_table) != after.get(sem_table):
+                affected.add(sem_table)
+    return [sem_table for sem_table in sem_tables if sem_table in affected]
+
+
+def refresh_prns(
+    cursor: pymysql.cursors.Cursor,
+    sem_tables: Sequence[str],
+    prns: Iterable[str],
+    semesters: Optional[Sequence[str]] = None,
+) -> int:
+    prns = sorted(set(prns))
+    if not prns:
+        return 0
+    if semesters is None:
+        semesters = affected_semesters(cursor, sem_tables, prns)
+    where = f"WHERE s.prn IN ({placeholders(prns)})"
+    args: List[Any] = list(prns)
+    if semesters:
+        where += f" OR latest.sem_table IN ({placeholders(semesters)})"
+        args.extend(semesters)
+    # Rows whose values did not change are matched but not rewritten.
+    cursor.execute(upsert_summary_sql(sem_tables, where), args)
+    return cursor.rowcount
+
+
+def refresh_summary(
+    cursor: pymysql.cursors.Cursor,
+    sem_tables: Sequence[str],
+    prns: Optional[Iterable[str]] = None,
+    full: bool = False,
+) -> Dict[str, Any]:
+    if not full and prns is None:
+        prns = changed_prns(cursor, sem_tables)
+    prns = sorted(set(prns or []))
+    if full or len(prns) > INCREMENTAL_LIMIT:
+        rows = refresh_all(cursor, sem_tables)
+        return {"mode": "full", "prns": len(prns), "rows_affected": rows}
+    semesters = affected_semesters(cursor, sem_tables, prns) if prns else []
+    return {
+        "mode": "incremental",
+        "prns": len(prns),
+        "semesters": semesters,
+        "rows_affected": refresh_prns(cursor, sem_tables, prns, semesters),
+    }
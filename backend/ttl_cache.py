@@ -0,0 +1,181 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.stale = False
+        self.task: "Optional[asyncio.Future[Any]]" = None
+
+
+class TTLCache:
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self._stats["misses"] += 1
+                return default
+            self._stats["hits"] += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return loader()
+
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                self._stats["hits"] += 1
+                return value
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                self._stats["misses"] += 1
+                flight = self._flights[key] = _Flight()
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+                if flight.error is None and not flight.stale:
+                    self._store(key, flight.value)
+            flight.done.set()
+        return flight.value
+
+    async def get_or_load_async(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        if not self.enabled:
+            return await loader()
+
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                self._stats["hits"] += 1
+                return value
+            flight = self._flights.get(key)
+            if flight is not None and flight.task is not None:
+                self._stats["coalesced"] += 1
+            elif flight is not None:
+                # A thread is already loading this key; its result gets stored.
+                self._stats["misses"] += 1
+                return await loader()
+            else:
+                self._stats["misses"] += 1
+                flight = self._flights[key] = _Flight()
+                flight.task = asyncio.ensure_future(self._load_flight(key, flight, loader))
+        # Shielded so a cancelled waiter does not cancel the others' load.
+        return await asyncio.shield(flight.task)
+
+    async def _load_flight(
+        self, key: Hashable, flight: _Flight, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        try:
+            flight.value = await loader()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+                if flight.error is None and not flight.stale:
+                    self._store(key, flight.value)
+            flight.done.set()
+        return flight.value
+
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.stale = True
+            removed = self._entries.pop(key, None) is not None
+            if removed:
+                self._stats["invalidations"] += 1
+            return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            for flight in self._flights.values():
+                flight.stale = True
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"] + self._stats["coalesced"]
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hit_ratio": (
+                    round((self._stats["hits"] + self._stats["coalesced"]) / lookups, 4)
+                    if lookups
+                    else None
+                ),
+                **self._stats,
+            }
+
+    def _lookup(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if self.ttl > 0 and expires_at <= time.monotonic():
+            del self._entries[key]
+            self._stats["expirations"] += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
@@ -0,0 +1,78 @@
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from synthetic import synthetic_cohort
+
+from cohort_stats import compute_semester_stats  # noqa: E402
+from student_records import (  # noqa: E402
+    FLOOR_GRADE,
+    GRADE_BANDS,
+    SEMESTER_SUBJECTS,
+    score_to_grade,
+)
+
+
+def row_by_row(rows: List[tuple], subject_columns: List[str]) -> Dict[str, Any]:
+    subjects = {}
+    for index, column in enumerate(subject_columns, start=1):
+        values = [row[index] for row in rows]
+        grades: Dict[str, int] = {}
+        for value in values:
+            grade = score_to_grade(value)
+            grades[grade] = grades.get(grade, 0) + 1
+        subjects[column] = {
+            "mean": statistics.mean(values),
+            "median": statistics.median(values),
+            "std": statistics.pstdev(values),
+            "quantiles": statistics.quantiles(values, n=20),
+            "grades": grades,
+        }
+    sgpa = [row[-1] for row in rows]
+    return {"subjects": subjects, "sgpa_mean": statistics.mean(sgpa)}
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 2)
+
+
+def bench(size: int, sem_table: str, repeat: int) -> Dict[str, Any]:
+    rows = synthetic_cohort(size, semesters=list(SEMESTER_SUBJECTS).index(sem_table) + 1)[sem_table]
+    subject_columns = SEMESTER_SUBJECTS[sem_table]
+    without_prn = [row[1:] for row in rows]
+
+    def vectorized() -> None:
+        matrix = np.array(without_prn, dtype=float)
+        columns = {column: matrix[:, i] for i, column in enumerate(subject_columns)}
+        compute_semester_stats(columns, matrix[:, -1], GRADE_BANDS, FLOOR_GRADE)
+
+    matrix = np.array(without_prn, dtype=float)
+    columns = {column: matrix[:, i] for i, column in enumerate(subject_columns)}
+    return {
+        "students": size,
+        "table": sem_table,
+        "row_by_row_ms": timed(lambda: row_by_row(rows, subject_columns), repeat),
+        "vectorized_ms": timed(vectorized, repeat),
+        "vectorized_compute_only_ms": timed(
+            lambda: compute_semester_stats(columns, matrix[:, -1], GRADE_BANDS, FLOOR_GRADE), repeat
+        ),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark cohort statistics computation.")
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--table", default="sem3")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    results = [bench(int(size), args.table, args.repeat) for size in args.sizes.split(",")]
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,56 @@
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from synthetic import synthetic_contexts
+
+import app as api  # noqa: E402
+
+
+def histories(size: int, seed: int = 7) -> List[Dict[str, Any]]:
+    # Cut each synthetic student off after 1-5 semesters so every history has
+    # a next semester to predict.
+    rng = np.random.default_rng(seed)
+    cut = rng.integers(1, len(api.SEMESTER_SUBJECTS), size)
+    return [
+        api.prediction_history(context["student"], context["semesters"][: cut[index]])
+        for index, context in enumerate(synthetic_contexts(size, seed=seed))
+    ]
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(size: int, repeat: int) -> Dict[str, Any]:
+    predictor = api.get_predictor()
+    rows = histories(size)
+    predictor.predict(rows[0])  # load the artifact outside the timings
+
+    one_by_one = timed(lambda: [predictor.predict(row) for row in rows], repeat)
+    batch = timed(lambda: predictor.predict_many(rows), repeat)
+    return {
+        "students": size,
+        "model": predictor.model_info()["kind"],
+        "single_calls_ms": round(one_by_one * 1000, 2),
+        "batch_call_ms": round(batch * 1000, 2),
+        "single_us_per_student": round(one_by_one / size * 1e6, 1),
+        "batch_us_per_student": round(batch / size * 1e6, 1),
+        "speedup": round(one_by_one / batch, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare single and batch prediction latency.")
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps([bench(int(size), args.repeat) for size in args.sizes.split(",")], indent=2))
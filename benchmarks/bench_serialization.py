@@ -0,0 +1,66 @@
+import argparse
+import gzip
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from synthetic import synthetic_contexts
+
+import app as api  # noqa: E402
+from compression import brotli  # noqa: E402
+from json_provider import orjson  # noqa: E402
+
+ENDPOINTS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "dashboard": api.build_dashboard_payload,
+    "progress": api.build_progress_payload,
+    "reports": api.build_reports_payload,
+}
+
+
+def per_call_us(fn: Callable[[], Any], count: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return round(best / count * 1e6, 1)
+
+
+def bench(contexts: List[Dict[str, Any]], repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    for endpoint, build in ENDPOINTS.items():
+        payloads = [build(context) for context in contexts]
+        count = len(payloads)
+
+        def encode_with(backend: str) -> Callable[[], None]:
+            def run() -> None:
+                api.app.json.backend = backend
+                for payload in payloads:
+                    api.app.json.dumps(payload, separators=(",", ":"))
+
+            return run
+
+        body = api.app.json.dumps(payloads[0], separators=(",", ":")).encode("utf-8")
+        result: Dict[str, Any] = {
+            "endpoint": endpoint,
+            "payloads": count,
+            "stdlib_us": per_call_us(encode_with("stdlib"), count, repeat),
+            "orjson_us": per_call_us(encode_with("orjson"), count, repeat) if orjson else None,
+            "bytes": len(body),
+            "gzip_bytes": len(gzip.compress(body, compresslevel=6)),
+            "gzip_us": per_call_us(lambda: gzip.compress(body, compresslevel=6), 1, repeat * 50),
+            "brotli_bytes": len(brotli.compress(body, quality=4)) if brotli else None,
+        }
+        results.append(result)
+    api.app.json.backend = "orjson" if orjson else "stdlib"
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare JSON encoders and compressed sizes for student payloads."
+    )
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(bench(synthetic_contexts(args.students), args.repeat), indent=2))
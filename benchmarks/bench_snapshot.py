@@ -0,0 +1,59 @@
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any, Dict
+
+from synthetic import synthetic_cohort, synthetic_prn
+
+import app as api  # noqa: E402
+from snapshot import StudentSnapshot  # noqa: E402
+
+
+def bench(size: int, lookups: int) -> Dict[str, Any]:
+    tables = synthetic_cohort(size)
+
+    def load() -> StudentSnapshot:
+        return StudentSnapshot(
+            tables, api.SEMESTER_SUBJECTS, api.TWELFTH_COLUMNS, api.SKILL_SEPARATOR
+        )
+
+    started = time.perf_counter()
+    snapshot = load()
+    load_seconds = time.perf_counter() - started
+
+    # Memory is measured on a second build; tracing would distort the timing.
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    traced = load()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained -= baseline
+
+    prns = [synthetic_prn(index * 7919 % size) for index in range(lookups)]
+    started = time.perf_counter()
+    for prn in prns:
+        api.assemble_context(api.split_student_bundle(snapshot.bundle_row(prn)), snapshot.rank)
+    lookup_seconds = time.perf_counter() - started
+
+    return {
+        "students": size,
+        "load_seconds": round(load_seconds, 3),
+        "retained_mb": round(retained / 2**20, 2),
+        "peak_load_mb": round((peak - baseline) / 2**20, 2),
+        "retained_mb_per_10k_students": round(retained / 2**20 / size * 10_000, 2),
+        "estimated_mb_per_10k_students": round(traced.nbytes() / 2**20 / size * 10_000, 2),
+        "context_us": round(lookup_seconds / lookups * 1e6, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure snapshot load time, memory and per-student context latency."
+    )
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--lookups", type=int, default=5000)
+    args = parser.parse_args()
+    print(json.dumps([bench(int(size), args.lookups) for size in args.sizes.split(",")], indent=2))
@@ -0,0 +1,525 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import re
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DB_SQL = REPO_ROOT / "db.sql"
+INSERT_CHUNK = 5000
+COMPARED_METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "db_queries_per_request")
+
+# (rng, cohort) -> (method, path, JSON body)
+RequestBuilder = Callable[[random.Random, "Cohort"], Tuple[str, str, Optional[Dict[str, Any]]]]
+
+
+class Cohort:
+    def __init__(self, size: int):
+        from synthetic import FIRST_NAMES, LAST_NAMES, synthetic_prn
+
+        self.size = size
+        self.prn = synthetic_prn
+        self.name_queries = [*FIRST_NAMES, *LAST_NAMES]
+
+    def existing(self, rng: random.Random) -> str:
+        return self.prn(rng.randrange(self.size))
+
+    def missing(self, rng: random.Random) -> str:
+        # Same digits as a real student with the wrong check letter, so the
+        # 404 carries "did you mean" suggestions.
+        index = rng.randrange(self.size)
+        return self.prn(index)[:-1] + chr(65 + (index + 1) % 26)
+
+
+class Scenario:
+    def __init__(
+        self,
+        name: str,
+        weight: int,
+        build: RequestBuilder,
+        needs_mysql: bool = False,
+        flask_only: bool = False,
+    ):
+        self.name = name
+        self.weight = weight
+        self.build = build
+        self.needs_mysql = needs_mysql
+        # Routes the async server (backend/async_app.py) does not serve.
+        self.flask_only = flask_only
+
+
+def student_get(suffix: str) -> RequestBuilder:
+    return lambda rng, cohort: ("GET", f"/api/student/{cohort.existing(rng)}/{suffix}", None)
+
+
+def export_slice(rng: random.Random, cohort: Cohort) -> Tuple[str, str, None]:
+    start = rng.randrange(max(1, cohort.size - 200))
+    prn_from, prn_to = cohort.prn(start), cohort.prn(min(cohort.size - 1, start + 199))
+    return "GET", f"/api/export/students?prn_from={prn_from}&prn_to={prn_to}", None
+
+
+SCENARIOS = [
+    Scenario("dashboard", 20, student_get("dashboard")),
+    Scenario("progress", 10, student_get("progress")),
+    Scenario("reports", 10, student_get("reports")),
+    Scenario("overview", 8, student_get("overview")),
+    Scenario("prediction", 5, student_get("prediction")),
+    # Cached after the first request per student, like production.
+    Scenario("improvement", 5, student_get("improvement")),
+    # Always goes to the stub Gemini server.
+    Scenario("improvement_refresh", 2, student_get("improvement?refresh=true")),
+    Scenario(
+        "student_not_found",
+        5,
+        lambda rng, cohort: ("GET", f"/api/student/{cohort.missing(rng)}/dashboard", None),
+    ),
+    Scenario(
+        "students_suggest",
+        8,
+        lambda rng, cohort: (
+            "GET",
+            f"/api/students/suggest?q={rng.choice(cohort.name_queries)[:rng.randint(3, 5)]}",
+            None,
+        ),
+    ),
+    Scenario(
+        "students_list",
+        8,
+        lambda rng, cohort: (
+            "GET",
+            rng.choice(
+                [
+                    "/api/students?limit=50",
+                    f"/api/students?limit=50&q={rng.choice(cohort.name_queries)}",
+                ]
+            ),
+            None,
+        ),
+        needs_mysql=True,
+        flask_only=True,
+    ),
+    Scenario(
+        "cohort_stats",
+        3,
+        lambda rng, cohort: ("GET", f"/api/cohort/sem{rng.randint(1, 6)}/stats", None),
+        needs_mysql=True,
+        flask_only=True,
+    ),
+    Scenario(
+        "batch_predictions",
+        2,
+        lambda rng, cohort: (
+            "POST",
+            "/api/predictions",
+            {"prns": [cohort.existing(rng) for _ in range(50)]},
+        ),
+        needs_mysql=True,
+        flask_only=True,
+    ),
+    Scenario("export_slice", 1, export_slice, needs_mysql=True, flask_only=True),
+    Scenario("health", 1, lambda rng, cohort: ("GET", "/api/health", None), needs_mysql=True),
+]
+
+
+def stub_plan(prompt: str) -> Dict[str, Any]:
+    return {
+        "summary": f"Stub plan for a {len(prompt)}-character prompt.",
+        "focus_areas": [],
+        "recommendations": [
+            {
+                "title": "Targeted Practice",
+                "action": "Solve 20 questions from the weakest subject every week.",
+                "duration": "2 hours/week",
+                "difficulty": "medium",
+                "priority": "high",
+            }
+        ],
+        "six_week_plan": [
+            {"week_range": "Week 1-2", "goal": "Rebuild fundamentals", "tasks": ["Revise"]}
+        ],
+    }
+
+
+def start_gemini_stub(latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            prompt = body["contents"][0]["parts"][0]["text"]
+            time.sleep(latency)
+            text = json.dumps(stub_plan(prompt))
+            payload = json.dumps(
+                {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+            ).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="gemini-stub", daemon=True).start()
+    return server
+
+
+def configure_environment(args: argparse.Namespace, gemini_port: int, workdir: str) -> None:
+    # Set before app is imported: it reads several settings at import time,
+    # and load_dotenv() does not override variables that are already set.
+    os.environ["GEMINI_API_BASE"] = f"http://127.0.0.1:{gemini_port}"
+    os.environ["GEMINI_API_KEY"] = "loadtest"
+    os.environ["PLAN_CACHE_PATH"] = str(Path(workdir) / "plans.sqlite3")
+    if args.database == "mysql":
+        os.environ["DB_NAME"] = args.db_name
+    else:
+        os.environ["SERVING_MODE"] = "snapshot"
+        os.environ["SNAPSHOT_REFRESH_INTERVAL"] = "0"
+
+
+def schema_statements() -> List[Tuple[str, str]]:
+    text = re.sub(r"--[^\n]*", "", DB_SQL.read_text(encoding="utf-8"))
+    statements = []
+    for statement in text.split(";"):
+        match = re.match(r"\s*CREATE TABLE (\w+)", statement)
+        if match:
+            statements.append((match.group(1), statement.strip()))
+    return statements
+
+
+def seed_mysql(args: argparse.Namespace) -> Dict[str, Any]:
+    from synthetic import synthetic_cohort
+
+    import app as api
+    import student_summary
+
+    started = time.perf_counter()
+    config = api.db_config()
+    config.pop("database")
+    with api.pymysql.connect(**config) as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{args.db_name}`")
+
+    tables = synthetic_cohort(args.students, seed=args.seed)
+    schema = schema_statements()
+    connection = api.open_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+            for table, _ in reversed(schema):
+                cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+            for _, statement in schema:
+                cursor.execute(statement)
+
+            columns = {
+                "students": ["prn", "name"],
+                "marks_12th": ["prn", *api.TWELFTH_COLUMNS, "percentage"],
+                "student_skills": ["prn", "skill_name"],
+                **{
+                    sem_table: ["prn", *subject_columns, "sgpa"]
+                    for sem_table, subject_columns in api.SEMESTER_SUBJECTS.items()
+                },
+            }
+            for table, rows in tables.items():
+                placeholders = ", ".join(["%s"] * len(columns[table]))
+                sql = f"INSERT INTO {table} ({', '.join(columns[table])}) VALUES ({placeholders})"
+                for offset in range(0, len(rows), INSERT_CHUNK):
+                    cursor.executemany(sql, rows[offset : offset + INSERT_CHUNK])
+            connection.commit()
+
+            sem_tables = list(api.SEMESTER_SUBJECTS)
+            if any(table == student_summary.SUMMARY_TABLE for table, _ in schema):
+                student_summary.refresh_all(cursor, sem_tables)
+                connection.commit()
+    finally:
+        connection.close()
+    return {
+        "rows": {table: len(rows) for table, rows in tables.items()},
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def serve(args: argparse.Namespace, ready: Any) -> None:
+    # Runs in its own process so the load generator does not share its GIL.
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    from synthetic import synthetic_cohort
+    from werkzeug.serving import make_server
+
+    import app as api
+
+    if args.server == "async":
+        # Imported before the snapshot patch below so both servers share app's state.
+        import async_app
+    if args.database == "stand-in":
+        from snapshot import StudentSnapshot
+
+        snapshot = StudentSnapshot(
+            synthetic_cohort(args.students, seed=args.seed),
+            api.SEMESTER_SUBJECTS,
+            api.TWELFTH_COLUMNS,
+            api.SKILL_SEPARATOR,
+        )
+        api._snapshots.loader = lambda: snapshot
+        api._snapshots.reload()
+    if args.server == "async":
+        serve_async(async_app.async_app, ready)
+        return
+    if args.database == "mysql":
+        api.start_background_work()
+        api.wait_for_warm_up(60)
+    server = make_server("127.0.0.1", 0, api.app, threaded=True)
+    ready.put(server.server_port)
+    server.serve_forever()
+
+
+def serve_async(application: Any, ready: Any) -> None:
+    import asyncio
+
+    from hypercorn.asyncio import serve as hypercorn_serve
+    from hypercorn.config import Config
+
+    # Hypercorn binds by address, so pick a free port up front; the parent
+    # waits for it to accept connections (warm-up runs before it listens).
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.accesslog = None
+    config.loglevel = "ERROR"
+    ready.put(port)
+    asyncio.run(hypercorn_serve(application, config))
+
+
+def wait_for_port(port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def run_worker(
+    base_url: str,
+    scenarios: List[Scenario],
+    cohort: Cohort,
+    seed: int,
+    record_from: float,
+    stop_at: float,
+    samples: Dict[str, List[Tuple[float, int, int]]],
+) -> None:
+    rng = random.Random(seed)
+    weights = [scenario.weight for scenario in scenarios]
+    session = requests.Session()
+    while time.perf_counter() < stop_at:
+        scenario = rng.choices(scenarios, weights)[0]
+        method, path, body = scenario.build(rng, cohort)
+        started = time.perf_counter()
+        try:
+            response = session.request(method, base_url + path, json=body, timeout=60)
+            status = response.status_code
+            queries = int(response.headers.get("X-DB-Queries", "0"))
+        except requests.RequestException:
+            status, queries = 0, 0
+        elapsed = time.perf_counter() - started
+        if started >= record_from:
+            samples.setdefault(scenario.name, []).append((elapsed, status, queries))
+
+
+def percentile(ordered: List[float], share: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+def summarize(samples: List[Tuple[float, int, int]], seconds: float) -> Dict[str, Any]:
+    latencies = sorted(elapsed for elapsed, _, _ in samples)
+    statuses: Dict[str, int] = {}
+    for _, status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for _, status, _ in samples if status == 0 or status >= 500),
+        "statuses": statuses,
+        "throughput_rps": round(len(samples) / seconds, 1),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "db_queries_per_request": round(sum(q for _, _, q in samples) / len(samples), 2),
+    }
+
+
+def compare_with(baseline: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    # Relative change per scenario; negative latency / positive throughput is better.
+    changes: Dict[str, Any] = {}
+    for name, current in {"overall": result["overall"], **result["scenarios"]}.items():
+        before = baseline["overall"] if name == "overall" else baseline["scenarios"].get(name)
+        if not before:
+            continue
+        changes[name] = {
+            metric: round((current[metric] - before[metric]) / before[metric] * 100, 1)
+            for metric in COMPARED_METRICS
+            if before.get(metric)
+        }
+    return changes
+
+
+def git_revision() -> Optional[str]:
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return revision + ("-dirty" if dirty else "")
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    gemini = start_gemini_stub(args.gemini_latency)
+    workdir = tempfile.mkdtemp(prefix="eduvision-loadtest-")
+    configure_environment(args, gemini.server_port, workdir)
+
+    seeded = seed_mysql(args) if args.database == "mysql" and not args.no_seed else None
+    selected = set(args.scenarios.split(",")) if args.scenarios else None
+    scenarios = [
+        scenario
+        for scenario in SCENARIOS
+        if (selected is None or scenario.name in selected)
+        and not (scenario.needs_mysql and args.database == "stand-in")
+        and not (scenario.flask_only and args.server == "async")
+    ]
+    skipped = [scenario.name for scenario in SCENARIOS if scenario not in scenarios]
+    if not scenarios:
+        raise SystemExit("No scenarios left to run")
+
+    context = multiprocessing.get_context("spawn")
+    ready = context.Queue()
+    server = context.Process(target=serve, args=(args, ready), daemon=True)
+    server.start()
+    try:
+        port = ready.get(timeout=300)
+        wait_for_port(port, timeout=300)
+        base_url = f"http://127.0.0.1:{port}"
+        cohort = Cohort(args.students)
+        record_from = time.perf_counter() + args.warmup
+        stop_at = record_from + args.duration
+        per_worker: List[Dict[str, List[Tuple[float, int, int]]]] = [
+            {} for _ in range(args.concurrency)
+        ]
+        workers = [
+            threading.Thread(
+                target=run_worker,
+                args=(
+                    base_url, scenarios, cohort, args.seed + index, record_from, stop_at, samples
+                ),
+                daemon=True,
+            )
+            for index, samples in enumerate(per_worker)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    finally:
+        server.terminate()
+        server.join()
+        gemini.shutdown()
+
+    merged: Dict[str, List[Tuple[float, int, int]]] = {}
+    for samples in per_worker:
+        for name, entries in samples.items():
+            merged.setdefault(name, []).extend(entries)
+    everything = [entry for entries in merged.values() for entry in entries]
+    if not everything:
+        raise SystemExit("No requests completed after the warm-up period")
+
+    result: Dict[str, Any] = {
+        "meta": {
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "server": args.server,
+            "database": args.database,
+            "students": args.students,
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "gemini_latency_seconds": args.gemini_latency,
+            "seed": args.seed,
+            "seeded": seeded,
+            "skipped_scenarios": skipped,
+        },
+        "overall": summarize(everything, args.duration),
+        "scenarios": {name: summarize(merged[name], args.duration) for name in sorted(merged)},
+    }
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            result["change_vs_baseline_percent"] = compare_with(json.load(handle), result)
+    return result
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Drive every API endpoint with a concurrent mixed workload and report "
+        "throughput, latency percentiles and queries per request as JSON."
+    )
+    parser.add_argument(
+        "--database",
+        choices=["mysql", "stand-in"],
+        default="mysql",
+        help="seed a MySQL database, or serve an in-memory snapshot without MySQL "
+        "(endpoints that need MySQL are skipped)",
+    )
+    parser.add_argument(
+        "--server",
+        choices=["flask", "async"],
+        default="flask",
+        help="threaded Flask app (app.py) or the Quart app (async_app.py) under Hypercorn; "
+        "the async server skips list, cohort, batch and export scenarios",
+    )
+    parser.add_argument("--db-name", default="eduvision_loadtest", help="database to (re)create")
+    parser.add_argument("--no-seed", action="store_true", help="reuse the already seeded data")
+    parser.add_argument("--students", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds first")
+    parser.add_argument("--gemini-latency", type=float, default=0.3, help="stub delay in seconds")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--scenarios", help="comma-separated subset of scenario names")
+    parser.add_argument("--baseline", help="earlier result file to compare against")
+    parser.add_argument("--output", help="write the JSON result here instead of stdout")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    output = json.dumps(run(arguments), indent=2, sort_keys=True)
+    if arguments.output:
+        Path(arguments.output).write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
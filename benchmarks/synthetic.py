@@ -0,0 +1,102 @@
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app import (  # noqa: E402
+    SEMESTER_SUBJECTS,
+    SKILL_SEPARATOR,
+    TWELFTH_COLUMNS,
+    context_version,
+    split_student_bundle,
+)
+
+FIRST_NAMES = ["Ayaan", "Ishika", "Rudra", "Zoya", "Vivaan", "Anvi", "Kabir", "Meher", "Dev", "Tanya"]
+LAST_NAMES = ["Mehta", "Rao", "Sharma", "Khan", "Patil", "Nair", "Singh", "Joshi", "Das", "Iyer"]
+SKILLS = ["C++", "Python", "Java", "SQL", "Git", "HTML", "OOP", "Data Structures", "React", "Docker"]
+
+
+def synthetic_prn(index: int) -> str:
+    return f"7{index:08d}{chr(65 + index % 26)}"
+
+
+def synthetic_cohort(size: int, seed: int = 7, semesters: int = 6) -> Dict[str, List[Tuple[Any, ...]]]:
+    rng = np.random.default_rng(seed)
+    prns = [synthetic_prn(index) for index in range(size)]
+    ability = rng.normal(76, 9, size)
+
+    def scores(count: int) -> np.ndarray:
+        noise = rng.normal(0, 5, (size, count))
+        return np.clip(np.rint(ability[:, None] + noise), 35, 100).astype(int)
+
+    tables: Dict[str, List[Tuple[Any, ...]]] = {
+        "students": [
+            (prn, f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[(i // 10) % len(LAST_NAMES)]}")
+            for i, prn in enumerate(prns)
+        ]
+    }
+
+    twelfth = scores(len(TWELFTH_COLUMNS))
+    percentages = np.round(twelfth.mean(axis=1), 2)
+    tables["marks_12th"] = [
+        (prn, *map(int, twelfth[i]), float(percentages[i])) for i, prn in enumerate(prns)
+    ]
+
+    for sem_table, subject_columns in list(SEMESTER_SUBJECTS.items())[:semesters]:
+        marks = scores(len(subject_columns))
+        sgpa = np.clip(np.round(marks.mean(axis=1) / 10, 2), 0, 9.99)
+        tables[sem_table] = [
+            (prn, *map(int, marks[i]), float(sgpa[i])) for i, prn in enumerate(prns)
+        ]
+
+    skill_counts = rng.integers(2, 7, size)
+    tables["student_skills"] = [
+        (prn, skill)
+        for i, prn in enumerate(prns)
+        for skill in rng.choice(SKILLS, skill_counts[i], replace=False)
+    ]
+    return tables
+
+
+def synthetic_contexts(size: int, seed: int = 7) -> List[Dict[str, Any]]:
+    tables = synthetic_cohort(size, seed=seed)
+    skills: Dict[str, List[str]] = {}
+    for prn, skill in tables["student_skills"]:
+        skills.setdefault(prn, []).append(str(skill))
+
+    contexts = []
+    for index, (prn, name) in enumerate(tables["students"]):
+        row: Dict[str, Any] = {
+            "prn": prn,
+            "name": name,
+            "skills": SKILL_SEPARATOR.join(skills.get(prn, [])),
+        }
+        *marks, percentage = tables["marks_12th"][index][1:]
+        row.update(zip(TWELFTH_COLUMNS, marks))
+        row["twelfth_percentage"] = percentage
+        for sem_table, subject_columns in SEMESTER_SUBJECTS.items():
+            sem_row = tables[sem_table][index]
+            row[f"{sem_table}__prn"] = prn
+            row.update(
+                (f"{sem_table}__{column}", value)
+                for column, value in zip([*subject_columns, "sgpa"], sem_row[1:])
+            )
+        student, semesters, student_skills = split_student_bundle(row)
+        context = {
+            "student": student,
+            "semesters": semesters,
+            "skills": student_skills,
+            "latest": semesters[-1] if semesters else None,
+            "previous": semesters[-2] if len(semesters) > 1 else None,
+            "rank": index + 1,
+            "class_size": size,
+            "percentile": round(100.0 * (size - index) / size, 2),
+        }
+        context["version"] = context_version(context)
+        contexts.append(context)
+    return contexts
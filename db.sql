@@ -8,7 +8,8 @@
 -- ============================================================
 CREATE TABLE students (
     prn VARCHAR(12) PRIMARY KEY,
-    name VARCHAR(100) NOT NULL
+    name VARCHAR(100) NOT NULL,
+    INDEX idx_students_name (name)
 );
 
 -- ============================================================
@@ -102,6 +103,37 @@ CREATE TABLE student_skills (
     FOREIGN KEY (prn) REFERENCES students(prn)
 );
 
+-- ============================================================
+-- 5. STUDENT SUMMARY (derived; filled by backend/refresh_summary.py)
+-- ============================================================
+CREATE TABLE student_summary (
+    prn VARCHAR(12) PRIMARY KEY,
+    latest_table VARCHAR(8) NULL,
+    latest_sgpa DECIMAL(3,2) NULL,
+    previous_table VARCHAR(8) NULL,
+    previous_sgpa DECIMAL(3,2) NULL,
+    sgpa_change DECIMAL(4,2) NULL,
+    overall_cgpa DECIMAL(4,2) NULL,
+    semesters_completed TINYINT NOT NULL DEFAULT 0,
+    class_rank INT NULL,
+    class_size INT NULL,
+    class_percentile DECIMAL(5,2) NULL,
+    sgpa_history VARCHAR(128) NULL,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (prn) REFERENCES students(prn) ON DELETE CASCADE
+);
+
+-- ============================================================
+-- 6. CHANGE LOG (appended by the triggers at the end of this file)
+-- ============================================================
+CREATE TABLE change_log (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    table_name VARCHAR(32) NOT NULL,
+    prn VARCHAR(12) NOT NULL,
+    changed_at TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    INDEX idx_change_log_changed_at (changed_at)
+);
+
 -- ============================================================
 -- DATA INSERTION
 -- ============================================================
@@ -300,6 +332,75 @@ INSERT INTO student_skills (prn, skill_name) VALUES
 ('72309119U', 'C'),
 ('72309120V', 'Java');
 
+-- ============================================================
+-- CHANGE CAPTURE TRIGGERS
+-- Created after the seed data so the initial load is not logged.
+-- Updates log both the old and new PRN in case the key itself changed.
+-- ============================================================
+
+CREATE TRIGGER students_after_insert AFTER INSERT ON students FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('students', NEW.prn);
+CREATE TRIGGER students_after_update AFTER UPDATE ON students FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) SELECT 'students', NEW.prn UNION SELECT 'students', OLD.prn;
+CREATE TRIGGER students_after_delete AFTER DELETE ON students FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('students', OLD.prn);
+
+CREATE TRIGGER marks_12th_after_insert AFTER INSERT ON marks_12th FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('marks_12th', NEW.prn);
+CREATE TRIGGER marks_12th_after_update AFTER UPDATE ON marks_12th FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) SELECT 'marks_12th', NEW.prn UNION SELECT 'marks_12th', OLD.prn;
+CREATE TRIGGER marks_12th_after_delete AFTER DELETE ON marks_12th FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('marks_12th', OLD.prn);
+
+CREATE TRIGGER sem1_after_insert AFTER INSERT ON sem1 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('sem1', NEW.prn);
+CREATE TRIGGER sem1_after_update AFTER UPDATE ON sem1 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) SELECT 'sem1', NEW.prn UNION SELECT 'sem1', OLD.prn;
+CREATE TRIGGER sem1_after_delete AFTER DELETE ON sem1 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('sem1', OLD.prn);
+
+CREATE TRIGGER sem2_after_insert AFTER INSERT ON sem2 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('sem2', NEW.prn);
+CREATE TRIGGER sem2_after_update AFTER UPDATE ON sem2 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) SELECT 'sem2', NEW.prn UNION SELECT 'sem2', OLD.prn;
+CREATE TRIGGER sem2_after_delete AFTER DELETE ON sem2 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('sem2', OLD.prn);
+
+CREATE TRIGGER sem3_after_insert AFTER INSERT ON sem3 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('sem3', NEW.prn);
+CREATE TRIGGER sem3_after_update AFTER UPDATE ON sem3 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) SELECT 'sem3', NEW.prn UNION SELECT 'sem3', OLD.prn;
+CREATE TRIGGER sem3_after_delete AFTER DELETE ON sem3 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('sem3', OLD.prn);
+
+CREATE TRIGGER sem4_after_insert AFTER INSERT ON sem4 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('sem4', NEW.prn);
+CREATE TRIGGER sem4_after_update AFTER UPDATE ON sem4 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) SELECT 'sem4', NEW.prn UNION SELECT 'sem4', OLD.prn;
+CREATE TRIGGER sem4_after_delete AFTER DELETE ON sem4 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('sem4', OLD.prn);
+
+CREATE TRIGGER sem5_after_insert AFTER INSERT ON sem5 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('sem5', NEW.prn);
+CREATE TRIGGER sem5_after_update AFTER UPDATE ON sem5 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) SELECT 'sem5', NEW.prn UNION SELECT 'sem5', OLD.prn;
+CREATE TRIGGER sem5_after_delete AFTER DELETE ON sem5 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('sem5', OLD.prn);
+
+CREATE TRIGGER sem6_after_insert AFTER INSERT ON sem6 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('sem6', NEW.prn);
+CREATE TRIGGER sem6_after_update AFTER UPDATE ON sem6 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) SELECT 'sem6', NEW.prn UNION SELECT 'sem6', OLD.prn;
+CREATE TRIGGER sem6_after_delete AFTER DELETE ON sem6 FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('sem6', OLD.prn);
+
+CREATE TRIGGER student_skills_after_insert AFTER INSERT ON student_skills FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('student_skills', NEW.prn);
+CREATE TRIGGER student_skills_after_update AFTER UPDATE ON student_skills FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) SELECT 'student_skills', NEW.prn UNION SELECT 'student_skills', OLD.prn;
+CREATE TRIGGER student_skills_after_delete AFTER DELETE ON student_skills FOR EACH ROW
+    INSERT INTO change_log (table_name, prn) VALUES ('student_skills', OLD.prn);
+
 -- ============================================================
 -- SAMPLE QUERY - Student Academic Overview
 -- ============================================================
@@ -68,8 +68,30 @@
     });
   }
 
+  function readValidated(url) {
+    try {
+      return JSON.parse(sessionStorage.getItem(`eduvision_etag:${url}`) || "null");
+    } catch (error) {
+      return null;
+    }
+  }
+
+  function storeValidated(url, etag, payload) {
+    try {
+      sessionStorage.setItem(`eduvision_etag:${url}`, JSON.stringify({ etag, payload }));
+    } catch (error) {
+      // Storage full or disabled: fall back to unconditional requests.
+    }
+  }
+
   async function apiGet(path) {
-    const response = await fetch(`${apiBase}${path}`);
+    const url = `${apiBase}${path}`;
+    const cached = readValidated(url);
+    const headers = cached?.etag ? { "If-None-Match": cached.etag } : {};
+    const response = await fetch(url, { headers, cache: "no-store" });
+    if (response.status === 304 && cached) {
+      return cached.payload;
+    }
     const payload = await response.json();
     if (!response.ok) {
       let message = payload.error || "Request failed";
@@ -83,6 +105,10 @@
       }
       throw new Error(message);
     }
+    const etag = response.headers.get("ETag");
+    if (etag) {
+      storeValidated(url, etag, payload);
+    }
     return payload;
   }
 
@@ -19,126 +19,183 @@
   const planStages = document.getElementById("planStages");
   const refreshAiBtn = document.getElementById("refreshAiBtn");
 
-  async function loadImprovement() {
-    try {
-      clearError();
-      const payload = await apiGet(`/student/${encodeURIComponent(state.prn)}/improvement`);
-      setStudentHeader(payload.student);
+  const JOB_POLL_INTERVAL_MS = 2000;
+  const JOB_POLL_ATTEMPTS = 30;
+  let activeJobId = null;
 
-      improvementSummary.textContent =
-        payload.summary || "No recommendation summary available for this student.";
-      aiSourceTag.textContent =
-        payload.source === "gemini"
-          ? "Source: Gemini API"
-          : "Source: Rule-based fallback";
-      aiSourceTag.className =
-        payload.source === "gemini"
-          ? "inline-flex rounded-full bg-emerald-100 px-3 py-1 text-xs font-semibold text-emerald-700"
-          : "inline-flex rounded-full bg-amber-100 px-3 py-1 text-xs font-semibold text-amber-700";
+  function wait(ms) {
+    return new Promise((resolve) => setTimeout(resolve, ms));
+  }
 
-      if (payload.ai_status === "gemini_success") {
-        aiNotice.innerHTML = `
-          <div class="rounded-xl border border-emerald-200 bg-emerald-50 px-4 py-3 text-sm text-emerald-700">
-            Gemini response loaded successfully from your configured API key.
-          </div>
-        `;
-      } else {
-        const message = payload.ai_error
-          ? `Gemini fallback used: ${payload.ai_error}`
-          : "Gemini fallback used. Configure GEMINI_API_KEY for AI-generated recommendations.";
+  async function pollImprovementJob(jobId) {
+    activeJobId = jobId;
+    for (let attempt = 0; attempt < JOB_POLL_ATTEMPTS; attempt += 1) {
+      await wait(JOB_POLL_INTERVAL_MS);
+      if (activeJobId !== jobId) return;
+      let job;
+      try {
+        job = await apiGet(`/improvement/jobs/${encodeURIComponent(jobId)}`);
+      } catch (error) {
+        return;
+      }
+      if (activeJobId !== jobId) return;
+      if (job.status === "done" && job.plan) {
+        renderImprovement(job.plan);
+        return;
+      }
+      if (job.status === "failed") {
+        const details = (job.error && (job.error.details || job.error.error)) || "Unknown Gemini error";
         aiNotice.innerHTML = `
           <div class="rounded-xl border border-amber-200 bg-amber-50 px-4 py-3 text-sm text-amber-700">
-            ${message}
+            Gemini fallback used: ${details}
           </div>
         `;
+        return;
       }
+    }
+  }
 
-      const focusAreas = payload.focus_areas || [];
-      if (!focusAreas.length) {
-        focusAreaGrid.innerHTML = `
-          <article class="rounded-2xl border border-slate-200 bg-white p-5 text-sm text-slate-500">
-            No focus areas detected from latest semester records.
-          </article>
-        `;
-      } else {
-        focusAreaGrid.innerHTML = focusAreas
-          .map(
-            (focus) => `
-            <article class="rounded-2xl border border-slate-200 bg-white p-5">
-              <div class="mb-3 flex items-center justify-between gap-3">
-                <h3 class="text-2xl font-semibold">${focus.subject}</h3>
-                <span class="rounded-full px-3 py-1 text-xs font-semibold ${priorityPill(focus.priority)}">${focus.priority} priority</span>
-              </div>
-              <p class="text-slate-500">${focus.reason}</p>
-              <div class="mt-4 flex items-center justify-between text-sm">
-                <span>Current: ${focus.current_score}%</span>
-                <span>Target: ${focus.target_score}%</span>
-              </div>
-              <div class="mt-2 h-2 overflow-hidden rounded-full bg-slate-200">
-                <div class="h-full rounded-full bg-slate-900" style="width:${focus.current_score}%"></div>
-              </div>
-              <p class="mt-2 text-sm text-slate-500">${focus.gap} points to goal</p>
-            </article>
-          `
-          )
-          .join("");
+  async function loadImprovement(forceRefresh = false) {
+    try {
+      clearError();
+      activeJobId = null;
+      const query = forceRefresh ? "?refresh=true" : "";
+      const payload = await apiGet(`/student/${encodeURIComponent(state.prn)}/improvement${query}`);
+      renderImprovement(payload);
+      if (payload.ai_status === "gemini_pending" && payload.job_id) {
+        pollImprovementJob(payload.job_id);
       }
+    } catch (error) {
+      renderError(error.message || "Failed to load improvement data.");
+      aiNotice.innerHTML = "";
+    }
+  }
+
+  function renderImprovement(payload) {
+    setStudentHeader(payload.student);
 
-      const recommendations = payload.recommendations || [];
-      if (!recommendations.length) {
-        recommendationGrid.innerHTML = `
-          <article class="rounded-xl border border-slate-200 p-4 text-sm text-slate-500">
-            No recommendation actions available.
+    improvementSummary.textContent =
+      payload.summary || "No recommendation summary available for this student.";
+    aiSourceTag.textContent =
+      payload.source === "gemini"
+        ? "Source: Gemini API"
+        : "Source: Rule-based fallback";
+    aiSourceTag.className =
+      payload.source === "gemini"
+        ? "inline-flex rounded-full bg-emerald-100 px-3 py-1 text-xs font-semibold text-emerald-700"
+        : "inline-flex rounded-full bg-amber-100 px-3 py-1 text-xs font-semibold text-amber-700";
+
+    if (payload.ai_status === "gemini_success") {
+      aiNotice.innerHTML = `
+        <div class="rounded-xl border border-emerald-200 bg-emerald-50 px-4 py-3 text-sm text-emerald-700">
+          Gemini response loaded successfully from your configured API key.
+        </div>
+      `;
+    } else if (payload.ai_status === "gemini_pending") {
+      aiNotice.innerHTML = `
+        <div class="rounded-xl border border-blue-200 bg-blue-50 px-4 py-3 text-sm text-blue-700">
+          Showing rule-based recommendations while the Gemini plan is generated in the background.
+        </div>
+      `;
+    } else if (payload.ai_status === "gemini_cached") {
+      aiNotice.innerHTML = `
+        <div class="rounded-xl border border-emerald-200 bg-emerald-50 px-4 py-3 text-sm text-emerald-700">
+          Saved Gemini plan loaded. Use refresh to generate a new one.
+        </div>
+      `;
+    } else {
+      const message = payload.ai_error
+        ? `Gemini fallback used: ${payload.ai_error}`
+        : "Gemini fallback used. Configure GEMINI_API_KEY for AI-generated recommendations.";
+      aiNotice.innerHTML = `
+        <div class="rounded-xl border border-amber-200 bg-amber-50 px-4 py-3 text-sm text-amber-700">
+          ${message}
+        </div>
+      `;
+    }
+
+    const focusAreas = payload.focus_areas || [];
+    if (!focusAreas.length) {
+      focusAreaGrid.innerHTML = `
+        <article class="rounded-2xl border border-slate-200 bg-white p-5 text-sm text-slate-500">
+          No focus areas detected from latest semester records.
+        </article>
+      `;
+    } else {
+      focusAreaGrid.innerHTML = focusAreas
+        .map(
+          (focus) => `
+          <article class="rounded-2xl border border-slate-200 bg-white p-5">
+            <div class="mb-3 flex items-center justify-between gap-3">
+              <h3 class="text-2xl font-semibold">${focus.subject}</h3>
+              <span class="rounded-full px-3 py-1 text-xs font-semibold ${priorityPill(focus.priority)}">${focus.priority} priority</span>
+            </div>
+            <p class="text-slate-500">${focus.reason}</p>
+            <div class="mt-4 flex items-center justify-between text-sm">
+              <span>Current: ${focus.current_score}%</span>
+              <span>Target: ${focus.target_score}%</span>
+            </div>
+            <div class="mt-2 h-2 overflow-hidden rounded-full bg-slate-200">
+              <div class="h-full rounded-full bg-slate-900" style="width:${focus.current_score}%"></div>
+            </div>
+            <p class="mt-2 text-sm text-slate-500">${focus.gap} points to goal</p>
           </article>
-        `;
-      } else {
-        recommendationGrid.innerHTML = recommendations
-          .map(
-            (item) => `
-            <article class="rounded-xl border border-slate-200 p-4">
-              <div class="mb-3 flex items-start justify-between gap-3">
-                <h4 class="text-xl font-semibold">${item.title}</h4>
-                <span class="rounded-full px-3 py-1 text-xs font-semibold ${priorityPill(item.priority)}">${item.priority}</span>
-              </div>
-              <p class="text-slate-600">${item.action}</p>
-              <p class="mt-3 text-sm text-slate-500">Duration: ${item.duration} | Difficulty: ${item.difficulty}</p>
-            </article>
-          `
-          )
-          .join("");
-      }
+        `
+        )
+        .join("");
+    }
 
-      const plan = payload.six_week_plan || [];
-      if (!plan.length) {
-        planTimeline.innerHTML = `<p class="text-sm text-slate-500">No 6-week plan generated.</p>`;
-      } else {
-        planTimeline.innerHTML = plan
-          .map(
-            (stage, index) => `
-            <article class="rounded-xl border border-slate-200 p-4">
-              <div class="mb-2 flex items-center justify-between gap-3">
-                <div class="inline-flex h-8 w-8 items-center justify-center rounded-full bg-blue-600 text-sm font-bold text-white">${index + 1}</div>
-                <span class="rounded-full bg-slate-100 px-3 py-1 text-xs font-semibold text-slate-700">${stage.week_range}</span>
-              </div>
-              <h4 class="text-xl font-semibold">${stage.goal}</h4>
-              <ul class="mt-3 space-y-1 text-slate-600">
-                ${(stage.tasks || []).map((task) => `<li>- ${task}</li>`).join("")}
-              </ul>
-            </article>
-          `
-          )
-          .join("");
-      }
+    const recommendations = payload.recommendations || [];
+    if (!recommendations.length) {
+      recommendationGrid.innerHTML = `
+        <article class="rounded-xl border border-slate-200 p-4 text-sm text-slate-500">
+          No recommendation actions available.
+        </article>
+      `;
+    } else {
+      recommendationGrid.innerHTML = recommendations
+        .map(
+          (item) => `
+          <article class="rounded-xl border border-slate-200 p-4">
+            <div class="mb-3 flex items-start justify-between gap-3">
+              <h4 class="text-xl font-semibold">${item.title}</h4>
+              <span class="rounded-full px-3 py-1 text-xs font-semibold ${priorityPill(item.priority)}">${item.priority}</span>
+            </div>
+            <p class="text-slate-600">${item.action}</p>
+            <p class="mt-3 text-sm text-slate-500">Duration: ${item.duration} | Difficulty: ${item.difficulty}</p>
+          </article>
+        `
+        )
+        .join("");
+    }
 
-      recommendationsStarted.textContent = payload.recommendations_started ?? recommendations.length;
-      skillsCount.textContent = payload.skills_count ?? 0;
-      planStages.textContent = plan.length;
-    } catch (error) {
-      renderError(error.message || "Failed to load improvement data.");
-      aiNotice.innerHTML = "";
+    const plan = payload.six_week_plan || [];
+    if (!plan.length) {
+      planTimeline.innerHTML = `<p class="text-sm text-slate-500">No 6-week plan generated.</p>`;
+    } else {
+      planTimeline.innerHTML = plan
+        .map(
+          (stage, index) => `
+          <article class="rounded-xl border border-slate-200 p-4">
+            <div class="mb-2 flex items-center justify-between gap-3">
+              <div class="inline-flex h-8 w-8 items-center justify-center rounded-full bg-blue-600 text-sm font-bold text-white">${index + 1}</div>
+              <span class="rounded-full bg-slate-100 px-3 py-1 text-xs font-semibold text-slate-700">${stage.week_range}</span>
+            </div>
+            <h4 class="text-xl font-semibold">${stage.goal}</h4>
+            <ul class="mt-3 space-y-1 text-slate-600">
+              ${(stage.tasks || []).map((task) => `<li>- ${task}</li>`).join("")}
+            </ul>
+          </article>
+        `
+        )
+        .join("");
     }
+
+    recommendationsStarted.textContent = payload.recommendations_started ?? recommendations.length;
+    skillsCount.textContent = payload.skills_count ?? 0;
+    planStages.textContent = plan.length;
   }
 
-  refreshAiBtn.addEventListener("click", loadImprovement);
+  refreshAiBtn.addEventListener("click", () => loadImprovement(true));
   loadImprovement();
 })();
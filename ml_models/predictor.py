@@ -0,0 +1,262 @@
+import logging
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import joblib
+except ImportError:  # pragma: no cover - joblib ships with scikit-learn
+    joblib = None
+
+ARTIFACT_FORMAT = 1
+FEATURE_NAMES = [
+    "twelfth_score",
+    "last_sgpa",
+    "mean_sgpa",
+    "sgpa_slope",
+    "latest_min_score",
+    "latest_mean_score",
+    "completed_semesters",
+]
+MAX_SGPA = 9.99
+
+logger = logging.getLogger(__name__)
+
+
+def load_error_summary(exc: Exception) -> str:
+    # Served by /prediction and the reload endpoint, so it names the failure
+    # without the exception text (which carries filesystem paths); the full
+    # error goes to the log.
+    logger.warning("Unable to load the model artifact: %s", exc)
+    return f"{type(exc).__name__}: the model artifact could not be loaded"
+
+
+class BaselineModel:
+    # Used until a trained artifact exists: the latest SGPA pulled towards the
+    # student's average and extended by half the observed per-semester trend.
+    kind = "baseline"
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        last = features[:, FEATURE_NAMES.index("last_sgpa")]
+        average = features[:, FEATURE_NAMES.index("mean_sgpa")]
+        slope = features[:, FEATURE_NAMES.index("sgpa_slope")]
+        return 0.6 * last + 0.4 * average + 0.5 * slope
+
+
+class LinearModel:
+    # Least-squares fit over the feature vector; small enough to train on the
+    # bundled dataset without scikit-learn.
+    kind = "linear"
+
+    def __init__(self, coefficients: np.ndarray, intercept: float):
+        self.coefficients = np.asarray(coefficients, dtype=float)
+        self.intercept = float(intercept)
+
+    @classmethod
+    def fit(cls, features: np.ndarray, targets: np.ndarray, ridge: float = 1e-3) -> "LinearModel":
+        mean = features.mean(axis=0)
+        centred = features - mean
+        gram = centred.T @ centred + ridge * np.eye(features.shape[1])
+        coefficients = np.linalg.solve(gram, centred.T @ (targets - targets.mean()))
+        return cls(coefficients, float(targets.mean() - mean @ coefficients))
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return features @ self.coefficients + self.intercept
+
+
+def semester_features(
+    twelfth_percentage: Optional[float], semesters: Sequence[Mapping[str, Any]]
+) -> Optional[List[float]]:
+    sgpas = [float(entry["sgpa"]) for entry in semesters if entry.get("sgpa") is not None]
+    if not sgpas:
+        return None
+    latest_scores = [
+        float(subject["score"]) for subject in semesters[-1].get("subjects", [])
+    ] or [sgpas[-1] * 10]
+    slope = (sgpas[-1] - sgpas[0]) / (len(sgpas) - 1) if len(sgpas) > 1 else 0.0
+    mean_sgpa = sum(sgpas) / len(sgpas)
+    twelfth = float(twelfth_percentage) / 10 if twelfth_percentage is not None else mean_sgpa
+    return [
+        twelfth,
+        sgpas[-1],
+        mean_sgpa,
+        slope,
+        min(latest_scores) / 10,
+        sum(latest_scores) / len(latest_scores) / 10,
+        float(len(sgpas)),
+    ]
+
+
+def load_artifact(path: Path) -> Dict[str, Any]:
+    if joblib is not None:
+        artifact = joblib.load(path, mmap_mode="r")
+    else:
+        with path.open("rb") as handle:
+            artifact = pickle.load(handle)
+    if not isinstance(artifact, dict) or artifact.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"{path.name} is not a format {ARTIFACT_FORMAT} predictor artifact")
+    if list(artifact.get("feature_names", [])) != FEATURE_NAMES:
+        raise ValueError(f"{path.name} was trained on different features")
+    return artifact
+
+
+class Predictor:
+    def __init__(
+        self,
+        path: str,
+        semester_subjects: Mapping[str, Sequence[str]],
+        risk_threshold: float = 60.0,
+        reload_interval: float = 30.0,
+    ):
+        self.path = Path(path)
+        self.semester_order = list(semester_subjects)
+        self.semester_subjects = {table: list(cols) for table, cols in semester_subjects.items()}
+        self.risk_threshold = risk_threshold
+        self.reload_interval = reload_interval
+        self._artifact: Optional[Dict[str, Any]] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._stats = {
+            "loads": 0,
+            "reloads": 0,
+            "failed_reloads": 0,
+            "predictions": 0,
+            "batches": 0,
+        }
+
+    def artifact(self) -> Dict[str, Any]:
+        if self._artifact is None:
+            with self._lock:
+                if self._artifact is None:
+                    self._install(*self._read())
+        elif self.reload_interval > 0:
+            if time.monotonic() - self._checked_at >= self.reload_interval:
+                self.reload(force=False)
+        return self._artifact
+
+    def reload(self, force: bool = True) -> bool:
+        # Loads happen outside the lock so requests keep using the current
+        # model until the new one is ready; a broken file keeps the old one.
+        self._checked_at = time.monotonic()
+        signature = self._file_signature()
+        if not force and signature == self._signature:
+            return False
+        try:
+            artifact, signature = self._read()
+        except Exception as exc:
+            with self._lock:
+                self._stats["failed_reloads"] += 1
+                if self._artifact is not None:
+                    self._artifact = {**self._artifact, "load_error": load_error_summary(exc)}
+                    self._signature = signature
+            return False
+        with self._lock:
+            self._install(artifact, signature)
+            self._stats["reloads"] += 1
+        return True
+
+    def model_info(self) -> Dict[str, Any]:
+        artifact = self.artifact()
+        return {
+            "kind": artifact["kind"],
+            "version": artifact["version"],
+            "trained_at": artifact.get("trained_at"),
+            "metrics": artifact.get("metrics", {}),
+            "load_error": artifact.get("load_error"),
+        }
+
+    def next_semester(self, semesters: Sequence[Mapping[str, Any]]) -> Optional[str]:
+        if not semesters:
+            return self.semester_order[0] if self.semester_order else None
+        position = self.semester_order.index(semesters[-1]["table"]) + 1
+        return self.semester_order[position] if position < len(self.semester_order) else None
+
+    def predict(self, history: Mapping[str, Any]) -> Dict[str, Any]:
+        return self.predict_many([history])[0]
+
+    def predict_many(self, histories: Sequence[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        artifact = self.artifact()
+        results: List[Dict[str, Any]] = []
+        rows: List[List[float]] = []
+        pending: List[int] = []
+        for history in histories:
+            semesters = history.get("semesters") or []
+            target = self.next_semester(semesters)
+            features = semester_features(history.get("twelfth_percentage"), semesters)
+            results.append(
+                {
+                    "completed_semesters": len(semesters),
+                    "next_semester": target,
+                    "predicted_sgpa": None,
+                    "at_risk_subjects": [],
+                }
+            )
+            if target is not None and features is not None:
+                pending.append(len(results) - 1)
+                rows.append(features)
+
+        if rows:
+            # One predict() call for the whole batch; per-student Python work
+            # is limited to assembling features and formatting results.
+            predicted = np.clip(artifact["model"].predict(np.asarray(rows)), 0.0, MAX_SGPA)
+            offsets = artifact.get("subject_offsets", {})
+            for index, sgpa in zip(pending, predicted):
+                result = results[index]
+                target = result["next_semester"]
+                result["predicted_sgpa"] = round(float(sgpa), 2)
+                for subject in self.semester_subjects[target]:
+                    score = float(sgpa) * 10 + offsets.get(target, {}).get(subject, 0.0)
+                    if score < self.risk_threshold:
+                        result["at_risk_subjects"].append(
+                            {"key": subject, "predicted_score": round(min(score, 100.0), 1)}
+                        )
+
+        with self._lock:
+            self._stats["predictions"] += len(histories)
+            self._stats["batches"] += 1
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        artifact = self._artifact
+        return {
+            "path": str(self.path),
+            "loaded": artifact is not None,
+            "kind": artifact["kind"] if artifact else None,
+            "version": artifact["version"] if artifact else None,
+            "risk_threshold": self.risk_threshold,
+            "reload_interval_seconds": self.reload_interval,
+            **self._stats,
+        }
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read(self) -> Tuple[Dict[str, Any], Optional[Tuple[int, int]]]:
+        signature = self._file_signature()
+        baseline = {"kind": BaselineModel.kind, "version": "baseline", "model": BaselineModel()}
+        if signature is None or signature[1] == 0:
+            return baseline, signature
+        try:
+            artifact = dict(load_artifact(self.path))
+        except Exception as exc:
+            if self._artifact is not None:
+                raise
+            return {**baseline, "load_error": load_error_summary(exc)}, signature
+        artifact.setdefault("kind", type(artifact["model"]).__name__)
+        artifact.setdefault("version", "unversioned")
+        return artifact, signature
+
+    def _install(self, artifact: Dict[str, Any], signature: Optional[Tuple[int, int]]) -> None:
+        self._artifact = artifact
+        self._signature = signature
+        self._checked_at = time.monotonic()
+        self._stats["loads"] += 1
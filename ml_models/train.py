@@ -0,0 +1,299 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pymysql
+
+ML_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = ML_DIR.parent
+for path in (PROJECT_ROOT, PROJECT_ROOT / "backend"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import ingest_csv  # noqa: E402
+import student_records  # noqa: E402
+from ml_models.predictor import (  # noqa: E402
+    ARTIFACT_FORMAT,
+    FEATURE_NAMES,
+    BaselineModel,
+    LinearModel,
+    joblib,
+    semester_features,
+)
+from schema_catalog import SchemaCatalog  # noqa: E402
+
+MODELS_DIR = ML_DIR / "models"
+DEFAULT_ARTIFACT = MODELS_DIR / "performance_predictor.pkl"
+DEFAULT_CSV = PROJECT_ROOT / "datasets" / "student_academic_dataset.csv"
+
+History = Dict[str, Any]
+
+
+def semester_entry(sem_table: str, values: Tuple[Any, ...]) -> Dict[str, Any]:
+    subject_columns = student_records.SEMESTER_SUBJECTS[sem_table]
+    return {
+        "table": sem_table,
+        "sgpa": float(values[-1]),
+        "subjects": [
+            {"key": column, "score": int(score)}
+            for column, score in zip(subject_columns, values[1:-1])
+        ],
+    }
+
+
+def histories_from_csv(path: str, batch_size: int) -> Iterator[History]:
+    summary: Dict[str, Any] = {"rows_read": 0, "rows_rejected": 0, "errors": []}
+    for records in ingest_csv.iter_batches(path, batch_size, summary):
+        for record in records:
+            yield {
+                "prn": record.prn,
+                "twelfth_percentage": record.twelfth[-1] if record.twelfth else None,
+                "semesters": [
+                    semester_entry(sem_table, record.semesters[sem_table])
+                    for sem_table in student_records.SEMESTER_SUBJECTS
+                    if sem_table in record.semesters
+                ],
+            }
+    if summary["rows_rejected"]:
+        print(json.dumps({"rejected_rows": summary["rows_rejected"]}), file=sys.stderr)
+
+
+def histories_from_mysql(batch_size: int) -> Iterator[History]:
+    connection = student_records.open_connection()
+    try:
+        with connection.cursor() as cursor:
+            catalog = SchemaCatalog().ensure(cursor, student_records.db_name())
+        sql = student_records.bundle_select_sql(catalog) + "\nORDER BY s.prn"
+        cursor = connection.cursor(pymysql.cursors.SSDictCursor)
+        cursor.execute(sql)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                student, semesters, _ = student_records.split_student_bundle(row)
+                yield {
+                    "prn": student["prn"],
+                    "twelfth_percentage": student["twelfth_percentage"],
+                    "semesters": semesters,
+                }
+        cursor.close()
+    finally:
+        connection.close()
+
+
+def build_dataset(
+    histories: Iterator[History],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Dict[str, float]]]:
+    # Sliding window: a student with n consecutive semesters contributes n - 1
+    # samples (history up to semester k -> SGPA of semester k + 1).
+    order = list(student_records.SEMESTER_SUBJECTS)
+    features: List[List[float]] = []
+    targets: List[float] = []
+    groups: List[int] = []
+    offset_sums: Dict[str, Dict[str, List[float]]] = {}
+    for student_index, history in enumerate(histories):
+        semesters = [entry for entry in history["semesters"] if entry["sgpa"] is not None]
+        for entry in semesters:
+            table_sums = offset_sums.setdefault(entry["table"], {})
+            for subject in entry["subjects"]:
+                total = table_sums.setdefault(subject["key"], [0.0, 0.0])
+                total[0] += subject["score"] - entry["sgpa"] * 10
+                total[1] += 1
+        for k in range(1, len(semesters)):
+            if order.index(semesters[k]["table"]) != order.index(semesters[k - 1]["table"]) + 1:
+                break
+            row = semester_features(history["twelfth_percentage"], semesters[:k])
+            if row is None:
+                continue
+            features.append(row)
+            targets.append(semesters[k]["sgpa"])
+            groups.append(student_index)
+
+    offsets = {
+        table: {key: round(total / count, 3) for key, (total, count) in subjects.items()}
+        for table, subjects in offset_sums.items()
+    }
+    return (
+        np.asarray(features, dtype=float).reshape(-1, len(FEATURE_NAMES)),
+        np.asarray(targets, dtype=float),
+        np.asarray(groups, dtype=int),
+        offsets,
+    )
+
+
+def model_factory(kind: str, seed: int) -> Tuple[str, Callable[[np.ndarray, np.ndarray], Any]]:
+    if kind == "auto":
+        for candidate, module in (("xgboost", "xgboost"), ("random_forest", "sklearn")):
+            try:
+                __import__(module)
+            except ImportError:
+                continue
+            kind = candidate
+            break
+        else:
+            kind = "linear"
+
+    if kind == "xgboost":
+        from xgboost import XGBRegressor
+
+        def fit_xgboost(features: np.ndarray, targets: np.ndarray) -> Any:
+            model = XGBRegressor(
+                n_estimators=300,
+                max_depth=4,
+                learning_rate=0.05,
+                subsample=0.9,
+                n_jobs=-1,
+                random_state=seed,
+            )
+            return model.fit(features, targets)
+
+        return kind, fit_xgboost
+    if kind == "random_forest":
+        from sklearn.ensemble import RandomForestRegressor
+
+        def fit_forest(features: np.ndarray, targets: np.ndarray) -> Any:
+            model = RandomForestRegressor(
+                n_estimators=300, min_samples_leaf=2, n_jobs=-1, random_state=seed
+            )
+            return model.fit(features, targets)
+
+        return kind, fit_forest
+    if kind == "linear":
+        return kind, LinearModel.fit
+    raise SystemExit(f"Unknown model kind {kind!r}")
+
+
+def regression_metrics(targets: np.ndarray, predicted: np.ndarray) -> Dict[str, Optional[float]]:
+    if targets.size == 0:
+        return {"mae": None, "rmse": None, "r2": None}
+    errors = predicted - targets
+    variance = float(((targets - targets.mean()) ** 2).sum())
+    return {
+        "mae": round(float(np.abs(errors).mean()), 4),
+        "rmse": round(float(np.sqrt((errors**2).mean())), 4),
+        "r2": round(1 - float((errors**2).sum()) / variance, 4) if variance else None,
+    }
+
+
+def holdout_mask(groups: np.ndarray, test_size: float, seed: int) -> np.ndarray:
+    # Split by student so a student's windows never straddle train and test.
+    students = np.unique(groups)
+    rng = np.random.default_rng(seed)
+    test_count = int(round(len(students) * test_size))
+    test_students = rng.choice(students, size=test_count, replace=False)
+    return np.isin(groups, test_students)
+
+
+def save_artifact(artifact: Dict[str, Any], output: Path, keep: int) -> Path:
+    output.parent.mkdir(parents=True, exist_ok=True)
+    versioned = output.with_name(f"{output.stem}-{artifact['version']}{output.suffix}")
+    if joblib is not None:
+        # Uncompressed so numpy arrays can be memory-mapped on load.
+        joblib.dump(artifact, versioned, compress=0)
+    else:
+        with versioned.open("wb") as handle:
+            pickle.dump(artifact, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+    # Publish with an atomic rename so the API never reads a half-written file.
+    staging = output.with_name(f".{output.name}.tmp")
+    shutil.copyfile(versioned, staging)
+    os.replace(staging, output)
+
+    previous = sorted(output.parent.glob(f"{output.stem}-*{output.suffix}"))
+    for stale in previous[: max(0, len(previous) - keep)]:
+        stale.unlink()
+    return versioned
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    started = time.monotonic()
+    if args.source == "mysql":
+        histories = histories_from_mysql(args.batch_size)
+    else:
+        histories = histories_from_csv(args.csv, args.batch_size)
+    features, targets, groups, offsets = build_dataset(histories)
+    if targets.size < 2:
+        raise SystemExit("Not enough consecutive semesters to train on")
+    feature_seconds = time.monotonic() - started
+
+    kind, fit = model_factory(args.model, args.seed)
+    test = holdout_mask(groups, args.test_size, args.seed)
+    train = ~test
+    fit_started = time.monotonic()
+    evaluation_model = fit(features[train], targets[train])
+    evaluation_seconds = time.monotonic() - fit_started
+
+    metrics = {
+        "samples": int(targets.size),
+        "students": int(np.unique(groups).size),
+        "train_samples": int(train.sum()),
+        "test_samples": int(test.sum()),
+        "test": regression_metrics(targets[test], evaluation_model.predict(features[test])),
+        "baseline_test": regression_metrics(
+            targets[test], BaselineModel().predict(features[test])
+        ),
+    }
+
+    fit_started = time.monotonic()
+    model = fit(features, targets)
+    metrics["train_seconds"] = round(time.monotonic() - fit_started, 3)
+    metrics["evaluation_train_seconds"] = round(evaluation_seconds, 3)
+    metrics["feature_seconds"] = round(feature_seconds, 3)
+
+    digest = hashlib.sha1(features.tobytes() + targets.tobytes()).hexdigest()[:8]
+    artifact = {
+        "format": ARTIFACT_FORMAT,
+        "version": f"{time.strftime('%Y%m%d%H%M%S', time.gmtime())}-{digest}",
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "kind": kind,
+        "source": args.source,
+        "feature_names": FEATURE_NAMES,
+        "model": model,
+        "subject_offsets": offsets,
+        "metrics": metrics,
+    }
+    if args.dry_run:
+        path = None
+    else:
+        path = save_artifact(artifact, Path(args.output), args.keep)
+    return {
+        "version": artifact["version"],
+        "kind": kind,
+        "artifact": str(path) if path else None,
+        "metrics": metrics,
+        "elapsed_seconds": round(time.monotonic() - started, 3),
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Train the next-semester SGPA predictor and publish a versioned artifact."
+    )
+    parser.add_argument("--source", choices=["csv", "mysql"], default="csv")
+    parser.add_argument("--csv", default=str(DEFAULT_CSV), help="dataset CSV for --source csv")
+    parser.add_argument(
+        "--model",
+        choices=["auto", "xgboost", "random_forest", "linear"],
+        default="auto",
+        help="auto picks xgboost, then random_forest, then linear by what is installed",
+    )
+    parser.add_argument("--test-size", type=float, default=0.2, help="share of students held out")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows read per batch")
+    parser.add_argument("--output", default=str(DEFAULT_ARTIFACT), help="artifact the API loads")
+    parser.add_argument("--keep", type=int, default=5, help="versioned artifacts to keep")
+    parser.add_argument("--dry-run", action="store_true", help="train and report without saving")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(parse_args()), indent=2))